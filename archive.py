@@ -0,0 +1,144 @@
+"""
+Append-only archive of fetched HTML.
+
+Pages are written as WARC-style response records to segment files. Each
+record is a separate zstd frame, or a gzip member when zstandard is not
+installed, so it can be read alone by offset. The archived_pages table
+indexes records by URL and fetch time, which lets --reextract run the
+current parsers over everything we have fetched without touching the
+network.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from datetime import datetime
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+from config import Config
+
+def _compress(data, suffix):
+    if suffix == '.zst':
+        return zstandard.ZstdCompressor(level=Config.ARCHIVE_COMPRESSION_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=min(Config.ARCHIVE_COMPRESSION_LEVEL, 9))
+
+def _decompress(data, suffix):
+    if suffix == '.zst':
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def build_record(url, html, fetched_at):
+    """Serialize one page as a WARC/1.0 response record"""
+    body = html.encode('utf-8')
+    header = (
+        'WARC/1.0\r\n'
+        'WARC-Type: response\r\n'
+        f'WARC-Target-URI: {url}\r\n'
+        f'WARC-Date: {fetched_at.strftime("%Y-%m-%dT%H:%M:%SZ")}\r\n'
+        'Content-Type: text/html; charset=utf-8\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        '\r\n'
+    )
+    return header.encode('utf-8') + body + b'\r\n\r\n'
+
+def parse_record(record):
+    """(headers dict, html) from a serialized record"""
+    header, _, rest = record.partition(b'\r\n\r\n')
+    headers = dict(
+        line.split(': ', 1) for line in header.decode('utf-8').split('\r\n')[1:] if ': ' in line
+    )
+    length = int(headers.get('Content-Length', len(rest)))
+    return headers, rest[:length].decode('utf-8')
+
+class PageArchive:
+    """Writes fetched pages to rotating compressed segments and reads them back"""
+
+    def __init__(self, db, directory=None, segment_bytes=None):
+        self.db = db
+        self.directory = directory or Config.ARCHIVE_DIR
+        self.segment_bytes = segment_bytes or Config.ARCHIVE_SEGMENT_MB * 1024 * 1024
+        self.suffix = '.zst' if ZSTD_AVAILABLE else '.gz'
+        self.segment = None
+        self.lock = threading.Lock()
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, segment)
+
+    def _current_segment(self):
+        """Name of the segment to append to, starting a new one when full"""
+        if self.segment:
+            path = self._segment_path(self.segment)
+            if os.path.exists(path) and os.path.getsize(path) < self.segment_bytes:
+                return self.segment
+
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.utcnow().strftime('%Y%m%d%H%M%S')
+        self.segment = f'segment-{stamp}-{os.getpid()}.warc{self.suffix}'
+        return self.segment
+
+    def store(self, url, html, kind='listing', fetched_at=None):
+        """Append a page unless it is identical to the latest archived copy of url"""
+        content_hash = hashlib.sha256(html.encode('utf-8')).hexdigest()
+        if self.db.get_archived_hash(url) == content_hash:
+            return False
+
+        fetched_at = fetched_at or datetime.utcnow()
+        data = _compress(build_record(url, html, fetched_at), self.suffix)
+
+        with self.lock:
+            segment = self._current_segment()
+            with open(self._segment_path(segment), 'ab') as f:
+                offset = f.tell()
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+        self.db.add_archived_page({
+            'url': url,
+            'kind': kind,
+            'fetched_at': fetched_at,
+            'segment': segment,
+            'offset': offset,
+            'length': len(data),
+            'content_hash': content_hash
+        })
+        return True
+
+    def read(self, segment, offset, length):
+        """HTML of the record at offset in segment"""
+        with open(self._segment_path(segment), 'rb') as f:
+            f.seek(offset)
+            data = f.read(length)
+        return parse_record(_decompress(data, os.path.splitext(segment)[1]))[1]
+
+    def iter_latest(self, kind=None):
+        """Yield (kind, url, html) for the newest copy of every archived URL, in file order"""
+        handle = None
+        handle_segment = None
+        missing = set()
+        try:
+            for page in self.db.iter_latest_archived_pages(kind):
+                if page.segment in missing:
+                    continue
+                if page.segment != handle_segment:
+                    if handle:
+                        handle.close()
+                        handle, handle_segment = None, None
+                    path = self._segment_path(page.segment)
+                    if not os.path.exists(path):
+                        print(f"⚠️  Missing archive segment {page.segment}")
+                        missing.add(page.segment)
+                        continue
+                    handle, handle_segment = open(path, 'rb'), page.segment
+                handle.seek(page.offset)
+                record = _decompress(handle.read(page.length), os.path.splitext(page.segment)[1])
+                yield page.kind, page.url, parse_record(record)[1]
+        finally:
+            if handle:
+                handle.close()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+End-to-end crawl benchmark for ScholarSift
+Serves a deterministic synthetic corpus from a local HTTP server and runs
+ScholarshipScraper.scrape_and_save against it, reporting pages/sec,
+fetch latency p50/p95, peak RSS and DB rows/sec (time spent in the writer thread). Results can be saved as a
+baseline and later checked against it with a regression threshold.
+
+Each source is served under its own loopback address (127.0.0.N) so the
+per-host politeness limiter behaves as it would across real sites; pass
+--single-host on systems without the full 127/8 loopback range.
+
+Usage:
+  python benchmarks/bench_crawl.py [--sources 4] [--pages 3] [--cards 10] [--latency-ms 20]
+  python benchmarks/bench_crawl.py --save-baseline benchmarks/crawl_baseline.json
+  python benchmarks/bench_crawl.py --check benchmarks/crawl_baseline.json [--threshold 0.15]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+# Metric name -> True when higher is better
+METRICS = {
+    'pages_per_sec': True,
+    'db_rows_per_sec': True,
+    'latency_p50_ms': False,
+    'latency_p95_ms': False,
+    'peak_rss_mb': False,
+}
+
+COUNTRIES = ['Germany', 'UK', 'Canada', 'Australia', 'Netherlands', 'Sweden']
+DEGREES = ['undergraduate', 'masters', 'phd']
+FUNDING = ['Fully funded', 'Partial tuition', 'Monthly stipend']
+
+class FixtureCorpus:
+    """Deterministic scholarship site: paginated listings linking to detail pages"""
+
+    def __init__(self, sources=4, pages=3, cards=10, page_kb=20, structured=0.5, js=False, seed=42):
+        self.sources = sources
+        self.pages = pages
+        self.cards = cards
+        self.page_kb = page_kb
+        self.structured = structured
+        self.js = js
+        self.seed = seed
+
+    @property
+    def expected_scholarships(self):
+        return self.sources * self.pages * self.cards
+
+    def _rng(self, *key):
+        return random.Random(f'{self.seed}:' + ':'.join(map(str, key)))
+
+    def _padding(self, rng):
+        """Filler paragraphs bringing a page up to roughly page_kb"""
+        words = ['eligibility', 'application', 'students', 'research', 'university', 'funding', 'criteria']
+        paragraph = ' '.join(rng.choice(words) for _ in range(120))
+        return f'<p class="filler">{paragraph}</p>' * max(1, self.page_kb * 1024 // (len(paragraph) + 25))
+
+    def _wrap(self, title, body, head=''):
+        if self.js:
+            # Content only exists after a script runs, as on client-rendered sites
+            body = ('<div id="app"></div><script>document.getElementById("app").innerHTML = '
+                    f'{json.dumps(body)};</script>')
+        return f'<!DOCTYPE html><html><head><title>{title}</title>{head}</head><body>{body}</body></html>'
+
+    def listing(self, source, page):
+        rng = self._rng('listing', source, page)
+        cards = ''.join(
+            f'<div class="scholarship-card"><h3><a href="/source/{source}/s/{page}-{i}">'
+            f'{self.name(source, page, i)}</a></h3><p>{rng.choice(FUNDING)} award.</p>'
+            f'<a href="/source/{source}/s/{page}-{i}">Read more</a></div>'
+            for i in range(self.cards)
+        )
+        pagination = f'<a rel="next" href="/source/{source}/page/{page + 1}">Next</a>' if page + 1 < self.pages else ''
+        return self._wrap(f'Scholarships page {page + 1}', f'<main>{cards}{pagination}</main>{self._padding(rng)}')
+
+    def name(self, source, page, card):
+        return f'Benchmark Scholarship {source}-{page}-{card} for International Students'
+
+    def detail(self, source, page, card):
+        rng = self._rng('detail', source, page, card)
+        name = self.name(source, page, card)
+        country, degree, funding = rng.choice(COUNTRIES), rng.choice(DEGREES), rng.choice(FUNDING)
+        deadline = f'2027-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'
+        gpa = rng.choice([2.8, 3.0, 3.2, 3.5])
+
+        head = ''
+        if rng.random() < self.structured:
+            head = '<script type="application/ld+json">' + json.dumps({
+                '@context': 'https://schema.org',
+                '@type': 'EducationalOccupationalProgram',
+                'name': name,
+                'description': f'{funding} {degree} scholarship in {country}. Minimum GPA {gpa}.',
+                'applicationDeadline': deadline,
+                'provider': {'@type': 'Organization', 'name': f'Benchmark University {source}'},
+                'location': {'address': {'addressCountry': country}},
+            }) + '</script>'
+
+        body = (f'<main><h1>{name}</h1><p>{funding} {degree} scholarship in {country}. '
+                f'Deadline: {deadline}. GPA {gpa} required.</p>'
+                f'<a href="/apply/{source}-{page}-{card}">Apply now</a></main>{self._padding(rng)}')
+        return self._wrap(name, body, head)
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves the corpus with simulated network latency"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        delay = server.latency + server.jitter * (int(hashlib.md5(self.path.encode()).hexdigest(), 16) % 1000) / 1000
+        time.sleep(delay)
+
+        parts = self.path.split('?')[0].strip('/').split('/')
+        try:
+            if parts == ['robots.txt']:
+                body, content_type = 'User-agent: *\nAllow: /\n', 'text/plain'
+            elif len(parts) == 2 and parts[0] == 'source':
+                body, content_type = server.corpus.listing(int(parts[1]), 0), 'text/html'
+            elif len(parts) == 4 and parts[2] == 'page':
+                body, content_type = server.corpus.listing(int(parts[1]), int(parts[3])), 'text/html'
+            elif len(parts) == 4 and parts[2] == 's':
+                page, card = map(int, parts[3].split('-'))
+                body, content_type = server.corpus.detail(int(parts[1]), page, card), 'text/html'
+            else:
+                self.send_error(404)
+                return
+        except ValueError:
+            self.send_error(404)
+            return
+
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+        with server.stats_lock:
+            server.pages_served += content_type == 'text/html'
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(corpus, latency_ms, jitter_ms):
+    """Run the fixture server on a background thread; returns the server"""
+    server = ThreadingHTTPServer(('', 0), FixtureHandler)
+    server.daemon_threads = True
+    server.corpus = corpus
+    server.latency = latency_ms / 1000
+    server.jitter = jitter_ms / 1000
+    server.pages_served = 0
+    server.stats_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[int(round(q * (len(ordered) - 1)))]
+
+def run_once(server, corpus, single_host):
+    """One crawl into a fresh database; returns raw measurements"""
+    from scraper import ScholarshipScraper
+
+    port = server.server_address[1]
+    urls = [
+        f"http://{'127.0.0.1' if single_host else f'127.0.0.{source + 1}'}:{port}/source/{source}/"
+        for source in range(corpus.sources)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.DATABASE_URL = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        Config.ARCHIVE_DIR = os.path.join(tmp, 'archive')
+        scraper = ScholarshipScraper()
+        latencies = []
+        scraper.session.hooks['response'].append(
+            lambda response, *args, **kwargs: latencies.append(response.elapsed.total_seconds() * 1000)
+        )
+
+        served_before = server.pages_served
+        start = time.perf_counter()
+        found, saved = asyncio.run(scraper.scrape_and_save(urls))
+        crawl_seconds = time.perf_counter() - start
+        pages = server.pages_served - served_before
+        save_seconds = scraper.run_stats.save_seconds
+        scraper.db.engine.dispose()
+
+    return {
+        'pages': pages,
+        'scholarships': found,
+        'saved': saved,
+        'crawl_seconds': crawl_seconds,
+        'pages_per_sec': pages / crawl_seconds if crawl_seconds else 0.0,
+        'db_rows_per_sec': saved / save_seconds if save_seconds else 0.0,
+        'latencies': latencies,
+    }
+
+def run_benchmark(args):
+    corpus = FixtureCorpus(args.sources, args.pages, args.cards, args.page_kb, args.structured, args.js, args.seed)
+    Config.REQUEST_DELAY = args.request_delay
+    Config.HOST_CONCURRENCY = args.host_concurrency
+
+    server = start_server(corpus, args.latency_ms, args.jitter_ms)
+    try:
+        runs = [run_once(server, corpus, args.single_host) for _ in range(args.repeat)]
+    finally:
+        server.shutdown()
+
+    latencies = [latency for run in runs for latency in run['latencies']]
+    return {
+        'params': {key: getattr(args, key) for key in (
+            'sources', 'pages', 'cards', 'page_kb', 'structured', 'js', 'latency_ms', 'jitter_ms',
+            'request_delay', 'host_concurrency', 'seed'
+        )},
+        'expected_scholarships': corpus.expected_scholarships,
+        'scholarships': runs[-1]['scholarships'],
+        'pages': runs[-1]['pages'],
+        'crawl_seconds': statistics.median(run['crawl_seconds'] for run in runs),
+        'pages_per_sec': statistics.median(run['pages_per_sec'] for run in runs),
+        'db_rows_per_sec': statistics.median(run['db_rows_per_sec'] for run in runs),
+        'latency_p50_ms': percentile(latencies, 0.50),
+        'latency_p95_ms': percentile(latencies, 0.95),
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+    }
+
+def check_regressions(result, baseline, threshold):
+    """List of human-readable regressions beyond threshold (a fraction, e.g. 0.15)"""
+    regressions = []
+    for metric, higher_is_better in METRICS.items():
+        before, after = baseline.get(metric), result[metric]
+        if not before:
+            continue
+        change = (after - before) / before
+        if (higher_is_better and change < -threshold) or (not higher_is_better and change > threshold):
+            regressions.append(f'{metric}: {before:,.1f} -> {after:,.1f} ({change:+.0%})')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark end-to-end crawl throughput against a local fixture server')
+    parser.add_argument('--sources', type=int, default=4)
+    parser.add_argument('--pages', type=int, default=3, help='Listing pages per source')
+    parser.add_argument('--cards', type=int, default=10, help='Scholarships per listing page')
+    parser.add_argument('--page-kb', type=int, default=20, help='Approximate HTML size per page')
+    parser.add_argument('--structured', type=float, default=0.5, help='Fraction of detail pages with JSON-LD')
+    parser.add_argument('--js', action='store_true', help='Serve client-rendered pages (needs Playwright to extract)')
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--jitter-ms', type=float, default=10)
+    parser.add_argument('--request-delay', type=float, default=0, help='Override Config.REQUEST_DELAY')
+    parser.add_argument('--host-concurrency', type=int, default=Config.HOST_CONCURRENCY)
+    parser.add_argument('--single-host', action='store_true', help='Serve every source from 127.0.0.1')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save-baseline', metavar='PATH', help='Write results as the new baseline')
+    parser.add_argument('--check', metavar='PATH', help='Compare against a baseline; exit 1 on regression')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Allowed regression as a fraction')
+    args = parser.parse_args()
+
+    print(f"📊 Crawling {args.sources} sources x {args.pages} pages x {args.cards} scholarships "
+          f"({args.latency_ms:.0f}±{args.jitter_ms:.0f} ms latency, {args.page_kb} KB pages, median of {args.repeat})")
+    result = run_benchmark(args)
+
+    print(f"   {'pages fetched':<18} {result['pages']:>10}")
+    print(f"   {'scholarships':<18} {result['scholarships']:>10} / {result['expected_scholarships']} expected")
+    print(f"   {'pages/sec':<18} {result['pages_per_sec']:>10,.1f}")
+    print(f"   {'latency p50':<18} {result['latency_p50_ms']:>10,.1f} ms")
+    print(f"   {'latency p95':<18} {result['latency_p95_ms']:>10,.1f} ms")
+    print(f"   {'peak RSS':<18} {result['peak_rss_mb']:>10,.1f} MB")
+    print(f"   {'DB rows/sec':<18} {result['db_rows_per_sec']:>10,.0f}")
+
+    if result['scholarships'] < result['expected_scholarships'] and not args.js:
+        print("⚠️  Extraction found fewer scholarships than the corpus contains")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Baseline written to {args.save_baseline}")
+
+    if args.check:
+        with open(args.check, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('params') != result['params']:
+            print("⚠️  Baseline was recorded with different parameters; comparison may not be meaningful")
+        regressions = check_regressions(result, baseline, args.threshold)
+        if regressions:
+            print(f"❌ Regressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"✅ No regressions beyond {args.threshold:.0%} against {args.check}")
+
+if __name__ == '__main__':
+    main()
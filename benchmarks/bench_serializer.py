@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Serializer microbenchmark for ScholarSift
+Compares hand-built dicts over hydrated ORM objects with the shared
+column-tuple serializer, reporting rows/sec for each path.
+
+Usage: python benchmarks/bench_serializer.py [--rows 20000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager, Scholarship
+from serializers import scholarship_serializer, ScholarshipSerializer
+
+def populate(db, rows):
+    """Insert synthetic scholarships in one transaction"""
+    session = db.Session()
+    now = datetime.now()
+    session.add_all([
+        Scholarship(
+            name=f'Benchmark Scholarship {i}',
+            description='Fully funded masters scholarship. ' * 20,
+            eligibility='Bachelor degree with GPA 3.0 and English proficiency. ' * 10,
+            deadline=now + timedelta(days=i % 365),
+            funding_type='fully_funded',
+            country='Germany',
+            university='Benchmark University',
+            degree_level='masters',
+            gpa_requirement=3.0,
+            application_link=f'https://example.com/apply/{i}',
+            source_url='https://example.com/',
+            source_name='example.com',
+            scraped_at=now,
+            summary='Synthetic summary'
+        )
+        for i in range(rows)
+    ])
+    session.commit()
+    session.close()
+
+def orm_dicts(db):
+    """Baseline: the hand-written dict the API used to build per ORM object"""
+    return [
+        {
+            'id': s.id,
+            'name': s.name,
+            'description': s.description,
+            'eligibility': s.eligibility,
+            'deadline': s.deadline.isoformat() if s.deadline else None,
+            'funding_type': s.funding_type,
+            'country': s.country,
+            'university': s.university,
+            'degree_level': s.degree_level,
+            'gpa_requirement': s.gpa_requirement,
+            'application_link': s.application_link,
+            'source_url': s.source_url,
+            'source_name': s.source_name,
+            'scraped_at': s.scraped_at.isoformat(),
+            'summary': s.summary
+        }
+        for s in db.get_scholarships()
+    ]
+
+def serializer_dicts(db, serializer=scholarship_serializer):
+    """Shared serializer over column tuples"""
+    return list(serializer.serialize(db.iter_scholarship_rows(serializer.columns)))
+
+def measure(label, func, rows, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(func())
+        best = min(best, time.perf_counter() - start)
+    assert count == rows, f"{label}: expected {rows} rows, got {count}"
+    print(f"   {label:<32} {rows / best:>12,.0f} rows/sec  ({best * 1000:.1f} ms)")
+    return rows / best
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scholarship serialization')
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        populate(db, args.rows)
+
+        print(f"📊 Serializing {args.rows} scholarships (best of {args.repeat})")
+        baseline = measure('ORM objects + manual dict', lambda: orm_dicts(db), args.rows, args.repeat)
+        shared = measure('column tuples + serializer', lambda: serializer_dicts(db), args.rows, args.repeat)
+        projected = ScholarshipSerializer(['id', 'name', 'deadline', 'country', 'funding_type'])
+        measure('projection (5 fields)', lambda: serializer_dicts(db, projected), args.rows, args.repeat)
+        print(f"   Speedup (full width): {shared / baseline:.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+CLI startup benchmark for ScholarSift
+Runs main.py commands in fresh interpreters under `python -X importtime`, reporting
+wall time, total import time and the slowest top-level imports for each command.
+It also flags any of the scraping stack (Playwright, BeautifulSoup, lxml, requests,
+fake_useragent) or other heavy optional modules that a command loaded without
+needing them.
+
+Each run uses its own empty SQLite database in a temp directory.
+
+Usage: python benchmarks/bench_startup.py [--repeat 5] [--top 8] [--command export]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, 'main.py')
+
+# name -> main.py arguments, or Python source to run; {tmp} is the run's temp directory
+COMMANDS = {
+    'help': ['--help'],
+    'migrate': ['--migrate'],
+    'export': ['--export', 'json', '--output', '{tmp}/export.json'],
+    'notifications': 'from notifications import NotificationManager\nNotificationManager()',
+}
+
+# Reports what was actually imported; -X importtime also lists failed optional imports
+BOOTSTRAP = """
+import atexit, runpy, sys
+atexit.register(lambda: print('loaded:', *sorted(sys.modules), file=sys.stderr))
+sys.path.insert(0, {root!r})
+{body}
+"""
+
+# Modules only the scraping commands should pay for
+HEAVY_MODULES = ('playwright', 'bs4', 'lxml', 'requests', 'fake_useragent', 'pyarrow', 'telegram',
+                 'numpy', 'transformers', 'torch', 'openai')
+
+def command_source(spec, tmp):
+    """Bootstrap source running a main.py command line or a code snippet"""
+    if isinstance(spec, str):
+        body = spec
+    else:
+        argv = [MAIN] + [arg.format(tmp=tmp) for arg in spec]
+        body = f"sys.argv = {argv!r}\nrunpy.run_path({MAIN!r}, run_name='__main__')"
+    return BOOTSTRAP.format(root=ROOT, body=body)
+
+def parse_importtime(stderr):
+    """([(module, self_us, cumulative_us, depth)] from -X importtime output, set of loaded modules)"""
+    imports, loaded = [], set()
+    for line in stderr.splitlines():
+        if line.startswith('loaded: '):
+            loaded = {module.split('.')[0] for module in line.split()[1:]}
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports, loaded
+
+def run_command(spec):
+    """Run one command in a fresh interpreter; returns (wall seconds, imports, loaded modules)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                   METRICS_TEXTFILE=os.path.join(tmp, 'metrics.prom'))
+        args = [sys.executable, '-X', 'importtime', '-c', command_source(spec, tmp)]
+        start = time.perf_counter()
+        result = subprocess.run(args, cwd=tmp, env=env, capture_output=True, text=True)
+        wall = time.perf_counter() - start
+
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith(('import time:', 'loaded:'))]
+        raise RuntimeError('\n'.join(errors[-5:]) or f'exit code {result.returncode}')
+    imports, loaded = parse_importtime(result.stderr)
+    return wall, imports, loaded
+
+def measure(name, spec, repeat, top):
+    walls, totals = [], []
+    for _ in range(repeat):
+        wall, imports, loaded = run_command(spec)
+        walls.append(wall)
+        totals.append(sum(self_us for _, self_us, _, _ in imports) / 1000)
+
+    heavy = [module for module in HEAVY_MODULES if module in loaded]
+
+    print(f"\n⏱️  {name}: {statistics.median(walls) * 1000:.0f} ms wall, "
+          f"{statistics.median(totals):.0f} ms importing (median of {repeat})")
+    top_level = sorted((item for item in imports if item[3] == 0), key=lambda item: -item[2])[:top]
+    for module, _, cumulative_us, _ in top_level:
+        print(f"   {cumulative_us / 1000:>8.1f} ms  {module}")
+    if heavy:
+        print(f"   ⚠️  loaded: {', '.join(heavy)}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ScholarSift CLI startup')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=8, help='Slowest top-level imports to list')
+    parser.add_argument('--command', choices=COMMANDS, action='append', help='Command to measure (default: all)')
+    args = parser.parse_args()
+
+    print(f"📊 CLI startup with {sys.executable} -X importtime")
+    for name in args.command or COMMANDS:
+        try:
+            measure(name, COMMANDS[name], args.repeat, args.top)
+        except RuntimeError as e:
+            print(f"\n❌ {name} failed:\n{e}")
+
+if __name__ == '__main__':
+    main()
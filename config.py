@@ -3,6 +3,14 @@ import os
 class Config:
     # Database
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///scholarships.db')
+    AUTO_MIGRATE = os.getenv('AUTO_MIGRATE', 'True').lower() == 'true'  # False: run `main.py --migrate` at deploy
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # seconds; server databases only
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))  # wait for a writer instead of 'database is locked'
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')  # NORMAL is safe with WAL; FULL fsyncs every commit
+    SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', '65536'))
+    SQLITE_MMAP_SIZE_MB = int(os.getenv('SQLITE_MMAP_SIZE_MB', '256'))
 
     # Scraping
     DEFAULT_USER_AGENT = 'ScholarSift/1.0 (Educational Research Bot)'
@@ -10,6 +18,47 @@ class Config:
     REQUEST_DELAY = 2  # seconds between requests
     MAX_RETRIES = 3
 
+    # Listing expansion: pagination and per-scholarship detail pages
+    MAX_LISTING_PAGES = int(os.getenv('MAX_LISTING_PAGES', '10'))  # pagination pages followed per source
+    MAX_DETAIL_PAGES = int(os.getenv('MAX_DETAIL_PAGES', '200'))  # detail pages fetched per source
+    MAX_CONTAINERS_PER_PAGE = int(os.getenv('MAX_CONTAINERS_PER_PAGE', '100'))
+    HOST_CONCURRENCY = int(os.getenv('HOST_CONCURRENCY', '4'))  # parallel requests per host, spaced by REQUEST_DELAY
+
+    # Scraped records are saved by a writer thread while the crawl continues
+    WRITE_BATCH_SIZE = int(os.getenv('WRITE_BATCH_SIZE', '200'))  # rows per transaction
+    WRITE_QUEUE_SIZE = int(os.getenv('WRITE_QUEUE_SIZE', '2000'))  # rows buffered before the crawl waits
+    WRITE_FLUSH_MS = int(os.getenv('WRITE_FLUSH_MS', '500'))  # max time a partial batch waits
+
+    # Raw HTML archive for offline re-extraction
+    ARCHIVE_ENABLED = os.getenv('ARCHIVE_ENABLED', 'True').lower() == 'true'
+    ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'data/archive')
+    ARCHIVE_SEGMENT_MB = int(os.getenv('ARCHIVE_SEGMENT_MB', '256'))  # rotate segments past this size
+    ARCHIVE_COMPRESSION_LEVEL = int(os.getenv('ARCHIVE_COMPRESSION_LEVEL', '6'))
+    REEXTRACT_WORKERS = int(os.getenv('REEXTRACT_WORKERS', '0'))  # 0 = one per CPU
+    REEXTRACT_CHUNK_SIZE = int(os.getenv('REEXTRACT_CHUNK_SIZE', '256'))  # pages in flight per round
+
+    # Metrics exposition written by batch runs (scrape CLI, daemon)
+    METRICS_TEXTFILE = os.getenv('METRICS_TEXTFILE', 'data/metrics.prom')
+
+    # Profiling (main.py --profile and dashboard request sampling)
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'data/profiles')
+    PROFILE_SAMPLE_INTERVAL_MS = int(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', '10'))
+    PROFILE_TOP_N = int(os.getenv('PROFILE_TOP_N', '15'))  # functions listed in summaries
+    PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', '200'))  # older profiles are pruned
+    PROFILE_REQUEST_SAMPLE_RATE = float(os.getenv('PROFILE_REQUEST_SAMPLE_RATE', '0'))  # fraction of dashboard requests, 0 = off
+    PROFILE_REQUEST_MODE = os.getenv('PROFILE_REQUEST_MODE', 'sample')
+    PROFILE_SLOW_REQUEST_MS = int(os.getenv('PROFILE_SLOW_REQUEST_MS', '500'))  # keep profiles of requests at least this slow
+
+    # Adaptive recrawl: per-source revisit interval bounds
+    RECRAWL_DEFAULT_INTERVAL_HOURS = int(os.getenv('RECRAWL_DEFAULT_INTERVAL_HOURS', '24'))
+    RECRAWL_MIN_INTERVAL_HOURS = int(os.getenv('RECRAWL_MIN_INTERVAL_HOURS', '6'))
+    RECRAWL_MAX_INTERVAL_HOURS = int(os.getenv('RECRAWL_MAX_INTERVAL_HOURS', '720'))
+
+    # Export settings
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '1000'))  # rows per cursor fetch
+    EXPORT_COMPACT_EVERY = int(os.getenv('EXPORT_COMPACT_EVERY', '500'))  # change-log rows before a full snapshot
+    EXPORT_COMPACT_INTERVAL_HOURS = int(os.getenv('EXPORT_COMPACT_INTERVAL_HOURS', '24'))  # max snapshot age
+
     # Playwright settings
     PLAYWRIGHT_HEADLESS = True
     PLAYWRIGHT_TIMEOUT = 30000
@@ -18,6 +67,13 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
 
+    # Dashboard response cache
+    DASHBOARD_CACHE_SIZE = int(os.getenv('DASHBOARD_CACHE_SIZE', '256'))  # max cached responses
+    DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', '300'))  # seconds
+    DASHBOARD_COMPRESS_MIN_BYTES = int(os.getenv('DASHBOARD_COMPRESS_MIN_BYTES', '1024'))
+    DASHBOARD_STREAM_BATCH_SIZE = int(os.getenv('DASHBOARD_STREAM_BATCH_SIZE', '200'))  # rows per cursor fetch / chunk
+    DASHBOARD_READ_MODEL = os.getenv('DASHBOARD_READ_MODEL', 'True').lower() == 'true'  # NumPy snapshot for filters/facets
+
     # AI/API Keys
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
@@ -27,6 +83,37 @@ class Config:
     SMTP_PORT = int(os.getenv('SMTP_PORT', '587'))
     SMTP_USERNAME = os.getenv('SMTP_USERNAME')
     SMTP_PASSWORD = os.getenv('SMTP_PASSWORD')
+    SMTP_USE_TLS = os.getenv('SMTP_USE_TLS', 'True').lower() == 'true'
+    SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', '4'))  # parallel connections
+    SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv('SMTP_MAX_MESSAGES_PER_CONNECTION', '100'))
+
+    # Notification delivery
+    TELEGRAM_CONCURRENCY = int(os.getenv('TELEGRAM_CONCURRENCY', '30'))  # in-flight Telegram requests
+    TELEGRAM_RATE_LIMIT = float(os.getenv('TELEGRAM_RATE_LIMIT', '30'))  # messages/s across all chats
+    TELEGRAM_CHAT_RATE_LIMIT = float(os.getenv('TELEGRAM_CHAT_RATE_LIMIT', '1'))  # messages/s per chat
+    DELIVERY_MAX_RETRIES = int(os.getenv('DELIVERY_MAX_RETRIES', '3'))
+    DELIVERY_RETRY_BACKOFF = float(os.getenv('DELIVERY_RETRY_BACKOFF', '1'))  # seconds, doubled per attempt
+    OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '100'))  # deliveries claimed per batch
+    OUTBOX_LEASE_SECONDS = int(os.getenv('OUTBOX_LEASE_SECONDS', '600'))  # reclaim rows whose worker stopped renewing after this
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '5'))
+    OUTBOX_RETRY_BACKOFF = float(os.getenv('OUTBOX_RETRY_BACKOFF', '60'))  # seconds before a failed row is retried, doubled per attempt
+    OUTBOX_POLL_INTERVAL = int(os.getenv('OUTBOX_POLL_INTERVAL', '10'))  # seconds between polls when idle
+    OUTBOX_INLINE_DRAIN = os.getenv('OUTBOX_INLINE_DRAIN', 'True').lower() == 'true'  # False when a separate worker runs
+    PREFERENCE_CACHE_SIZE = int(os.getenv('PREFERENCE_CACHE_SIZE', '65536'))  # distinct parsed preference strings
+    DIGEST_FRAGMENT_CACHE_SIZE = int(os.getenv('DIGEST_FRAGMENT_CACHE_SIZE', '10000'))  # rendered scholarship cards
+    DIGEST_CACHE_SIZE = int(os.getenv('DIGEST_CACHE_SIZE', '1000'))  # fully rendered digests
+
+    # Daemon mode (python main.py --daemon), intervals in minutes
+    SCRAPE_INTERVAL_MINUTES = int(os.getenv('SCRAPE_INTERVAL_MINUTES', '1440'))
+    SUMMARIZE_INTERVAL_MINUTES = int(os.getenv('SUMMARIZE_INTERVAL_MINUTES', '60'))
+    SUMMARIZE_BATCH_SIZE = int(os.getenv('SUMMARIZE_BATCH_SIZE', '50'))  # scholarships summarized per run
+    EXPIRE_INTERVAL_MINUTES = int(os.getenv('EXPIRE_INTERVAL_MINUTES', '360'))
+    URGENT_NOTIFY_INTERVAL_MINUTES = int(os.getenv('URGENT_NOTIFY_INTERVAL_MINUTES', '1440'))
+    WEEKLY_DIGEST_INTERVAL_MINUTES = int(os.getenv('WEEKLY_DIGEST_INTERVAL_MINUTES', '10080'))
+
+    # Expiry: scholarships leave the active set once their deadline has passed or they stop being seen
+    EXPIRE_GRACE_DAYS = int(os.getenv('EXPIRE_GRACE_DAYS', '1'))  # days past the deadline before deactivating
+    EXPIRE_UNSEEN_DAYS = int(os.getenv('EXPIRE_UNSEEN_DAYS', '180'))  # deactivate if not scraped for this long, 0 = never
 
     # Seed URLs for discovery
     SEED_SOURCES = [
@@ -38,6 +125,14 @@ class Config:
         'https://www.commonwealthscholarships.org/'
     ]
 
+    # Discovery crawler bounds
+    DISCOVERY_MAX_DEPTH = int(os.getenv('DISCOVERY_MAX_DEPTH', '2'))  # link hops from a seed
+    DISCOVERY_MAX_PAGES = int(os.getenv('DISCOVERY_MAX_PAGES', '500'))
+    DISCOVERY_MAX_PAGES_PER_DOMAIN = int(os.getenv('DISCOVERY_MAX_PAGES_PER_DOMAIN', '50'))
+    DISCOVERY_MIN_SCORE = int(os.getenv('DISCOVERY_MIN_SCORE', '1'))  # keyword relevance needed to follow a link
+    DISCOVERY_CONCURRENCY = int(os.getenv('DISCOVERY_CONCURRENCY', '4'))  # parallel fetches, one per domain
+    DISCOVERY_BLOOM_CAPACITY = int(os.getenv('DISCOVERY_BLOOM_CAPACITY', '5000000'))  # URLs before the error rate degrades
+
     # Scholarship keywords for discovery
     SCHOLARSHIP_KEYWORDS = [
         'scholarship', 'grant', 'fellowship', 'bursary', 'financial aid',
@@ -1,6 +1,12 @@
 import sys
 import os
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+import hashlib
+import random
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, flash
 from flask_cors import CORS
 import json
 from datetime import datetime, timedelta
@@ -8,7 +14,11 @@ from datetime import datetime, timedelta
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database import DatabaseManager
+from database import DatabaseManager, Scholarship
+from serializers import scholarship_serializer
+from read_model import ScholarshipReadModel, CATEGORICAL_FIELDS, NUMPY_AVAILABLE
+from metrics import registry
+from profiling import Profile
 
 # Try to import summarizer, fallback if not available
 try:
@@ -19,6 +29,19 @@ except ImportError as e:
     SUMMARIZER_AVAILABLE = False
     ScholarshipSummarizer = None
 
+# Optional faster JSON encoder and brotli compression
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 app = Flask(__name__)
 app.config.from_object('config.Config')
 CORS(app)
@@ -27,6 +50,211 @@ CORS(app)
 db = DatabaseManager()
 summarizer = ScholarshipSummarizer() if SUMMARIZER_AVAILABLE else None
 
+# Columnar snapshot for filtering and facets; without NumPy every query goes to SQL
+read_model = (ScholarshipReadModel(db, scholarship_serializer.columns)
+              if NUMPY_AVAILABLE and app.config['DASHBOARD_READ_MODEL'] else None)
+
+class ResponseCache:
+    """In-process LRU cache with TTL for rendered API response bodies"""
+
+    def __init__(self, max_entries=256, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+response_cache = ResponseCache(app.config['DASHBOARD_CACHE_SIZE'], app.config['DASHBOARD_CACHE_TTL'])
+
+http_requests = registry.counter('scholarsift_http_requests_total', 'Dashboard requests by endpoint and status')
+http_request_seconds = registry.histogram('scholarsift_http_request_seconds', 'Dashboard request latency')
+
+# Stats of the latest persisted crawl run, refreshed from the database on each scrape of /metrics
+LAST_CRAWL_FIELDS = ('duration_seconds', 'save_seconds', 'pages', 'bytes', 'items_extracted', 'items_saved', 'errors')
+LAST_CRAWL_SOURCE_FIELDS = ('fetch_seconds', 'robots_seconds', 'parse_seconds', 'pages', 'bytes',
+                            'items_extracted', 'items_saved', 'errors')
+last_crawl = registry.gauge('scholarsift_last_crawl', 'Latest crawl run totals by field')
+last_crawl_source = registry.gauge('scholarsift_last_crawl_source', 'Latest crawl run per-source stats by field')
+
+@app.before_request
+def start_request_timer():
+    request.started_at = time.perf_counter()
+
+    # Profile a random fraction of requests; only slow ones are kept
+    rate = app.config['PROFILE_REQUEST_SAMPLE_RATE']
+    if rate and random.random() < rate:
+        try:
+            request.profile = Profile(app.config['PROFILE_REQUEST_MODE'], thread_id=threading.get_ident()).start()
+        except ValueError:
+            pass  # another profiler is already active on this interpreter
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.endpoint or 'unknown'
+    http_requests.inc(endpoint=endpoint, status=response.status_code)
+    if hasattr(request, 'started_at'):
+        # Streamed bodies are timed to the first byte, not to completion
+        http_request_seconds.observe(time.perf_counter() - request.started_at, endpoint=endpoint)
+
+    profile = getattr(request, 'profile', None)
+    if profile is not None:
+        elapsed = profile.stop()
+        if elapsed * 1000 >= app.config['PROFILE_SLOW_REQUEST_MS']:
+            path, _ = profile.save(f'request-{endpoint}')
+            print(f"🔬 Slow request {request.path} ({elapsed * 1000:.0f} ms) profiled to {path}")
+    return response
+
+@app.teardown_request
+def stop_request_profile(error=None):
+    """Stop a profile that after_request never reached (unhandled exception)"""
+    profile = getattr(request, 'profile', None)
+    if profile is not None and profile.elapsed is None:
+        profile.stop()
+
+# Query parameters accepted by /api/scholarships, with their types
+SCHOLARSHIP_FILTER_ARGS = [
+    ('country', str),
+    ('degree_level', str),
+    ('funding_type', str),
+    ('gpa_min', float),
+    ('gpa_max', float),
+    ('deadline_days', int),
+]
+
+def normalize_filter_args(args, allowed):
+    """Reduce request args to a canonical, hashable form (unknown and empty args dropped)"""
+    normalized = []
+    for name, arg_type in allowed:
+        value = args.get(name, type=arg_type)
+        if isinstance(value, str):
+            value = value.strip().lower()
+        if value:
+            normalized.append((name, value))
+    return tuple(normalized)
+
+def dumps_json(payload):
+    """Encode a payload as compact UTF-8 JSON bytes, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def negotiate_encoding():
+    """Pick the best content encoding the client accepts ('br', 'gzip' or None)"""
+    offered = ['br', 'gzip'] if BROTLI_AVAILABLE else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+class StreamCompressor:
+    """Incremental gzip/brotli compressor that flushes after every chunk"""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor()
+        else:
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, chunk):
+        if self.encoding == 'br':
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+def compress_body(body, encoding):
+    """Compress a complete response body in one shot"""
+    if encoding == 'br':
+        return brotli.compress(body)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+def cached_json_response(build_payload, cache_args=()):
+    """Serve a JSON payload from the response cache with a strong ETag.
+
+    Entries are keyed by the data version, so any database write invalidates them.
+    Compressed variants are produced lazily and cached alongside the plain body.
+    """
+    key = (request.path, db.get_data_version(), cache_args)
+    cached = response_cache.get(key)
+    if cached is None:
+        body = dumps_json(build_payload())
+        cached = {None: (body, hashlib.sha256(body).hexdigest())}
+        response_cache.set(key, cached)
+
+    body, etag = cached[None]
+    encoding = negotiate_encoding() if len(body) >= app.config['DASHBOARD_COMPRESS_MIN_BYTES'] else None
+    if encoding:
+        if encoding not in cached:
+            cached[encoding] = (compress_body(body, encoding), f'{etag}-{encoding}')
+        body, etag = cached[encoding]
+
+    response = app.response_class(body, mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def wants_ndjson():
+    """True when the client asked for newline-delimited JSON"""
+    if request.args.get('format') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+
+def stream_ndjson(rows):
+    """Stream rows as NDJSON, compressing on the fly when the client supports it"""
+    encoding = negotiate_encoding()
+    batch_size = app.config['DASHBOARD_STREAM_BATCH_SIZE']
+
+    def generate():
+        compressor = StreamCompressor(encoding) if encoding else None
+        buffer = []
+        for row in rows:
+            buffer.append(dumps_json(row))
+            if len(buffer) >= batch_size:
+                chunk = b'\n'.join(buffer) + b'\n'
+                buffer = []
+                yield compressor.compress(chunk) if compressor else chunk
+
+        tail = b'\n'.join(buffer) + b'\n' if buffer else b''
+        if compressor:
+            yield compressor.compress(tail) + compressor.finish()
+        elif tail:
+            yield tail
+
+    response = Response(generate(), mimetype='application/x-ndjson')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
 @app.route('/')
 def index():
     """Main dashboard page"""
@@ -34,16 +262,28 @@ def index():
 
 @app.route('/api/scholarships')
 def get_scholarships():
-    """API endpoint to get scholarships with filters"""
-    # Get filter parameters
+    """API endpoint to get scholarships with filters.
+
+    Returns a cached JSON array by default, or a streamed NDJSON body read from a
+    server-side cursor when requested with ?format=ndjson or Accept: application/x-ndjson.
+    """
+    cache_args = normalize_filter_args(request.args, SCHOLARSHIP_FILTER_ARGS)
+
+    if wants_ndjson():
+        return stream_ndjson(scholarship_to_dict(row) for row in query_scholarship_rows(dict(cache_args)))
+
+    return cached_json_response(lambda: build_scholarship_list(dict(cache_args)), cache_args)
+
+def build_filters(args):
+    """Translate normalized filter args into DatabaseManager filters"""
     filters = {}
 
-    country = request.args.get('country')
-    degree_level = request.args.get('degree_level')
-    funding_type = request.args.get('funding_type')
-    gpa_min = request.args.get('gpa_min', type=float)
-    gpa_max = request.args.get('gpa_max', type=float)
-    deadline_days = request.args.get('deadline_days', type=int)
+    country = args.get('country')
+    degree_level = args.get('degree_level')
+    funding_type = args.get('funding_type')
+    gpa_min = args.get('gpa_min')
+    gpa_max = args.get('gpa_max')
+    deadline_days = args.get('deadline_days')
 
     if country:
         filters['country'] = country
@@ -58,82 +298,70 @@ def get_scholarships():
     if deadline_days:
         filters['deadline_before'] = datetime.now() + timedelta(days=deadline_days)
 
-    scholarships = db.get_scholarships(filters)
-
-    # Convert to JSON-serializable format
-    result = []
-    for scholarship in scholarships:
-        scholarship_data = {
-            'id': scholarship.id,
-            'name': scholarship.name,
-            'description': scholarship.description,
-            'eligibility': scholarship.eligibility,
-            'deadline': scholarship.deadline.isoformat() if scholarship.deadline else None,
-            'funding_type': scholarship.funding_type,
-            'country': scholarship.country,
-            'university': scholarship.university,
-            'degree_level': scholarship.degree_level,
-            'gpa_requirement': scholarship.gpa_requirement,
-            'application_link': scholarship.application_link,
-            'source_url': scholarship.source_url,
-            'source_name': scholarship.source_name,
-            'scraped_at': scholarship.scraped_at.isoformat(),
-            'summary': scholarship.summary or (summarizer.summarize_scholarship(scholarship.description or '') if summarizer else (scholarship.description[:200] + '...' if scholarship.description else ''))
-        }
-        result.append(scholarship_data)
-
-    return jsonify(result)
+    return filters
+
+def scholarship_to_dict(row):
+    """Serialize a scholarship row, filling in a summary when none is stored"""
+    scholarship_data = scholarship_serializer.to_dict(row)
+    if not scholarship_data['summary']:
+        description = scholarship_data['description']
+        if summarizer:
+            scholarship_data['summary'] = summarizer.summarize_scholarship(description or '')
+        else:
+            scholarship_data['summary'] = description[:200] + '...' if description else ''
+    return scholarship_data
+
+def query_scholarship_rows(args):
+    """Active scholarship rows matching normalized filter args, from the read model when available"""
+    filters = build_filters(args)
+    if read_model:
+        return read_model.query(filters)
+    return db.iter_scholarship_rows(scholarship_serializer.columns, filters, app.config['DASHBOARD_STREAM_BATCH_SIZE'])
+
+def build_scholarship_list(args):
+    """Build the /api/scholarships payload from normalized filter args"""
+    return [scholarship_to_dict(row) for row in query_scholarship_rows(args)]
+
+@app.route('/api/facets')
+def get_facets():
+    """Per-value counts of country, degree level and funding type under the current filters.
+
+    Each field's counts ignore that field's own filter, so they show what selecting
+    another value would return.
+    """
+    cache_args = normalize_filter_args(request.args, SCHOLARSHIP_FILTER_ARGS)
+    return cached_json_response(lambda: build_facets(dict(cache_args)), cache_args)
+
+def build_facets(args):
+    filters = build_filters(args)
+    if read_model:
+        return read_model.facet_counts(filters)
+    return db.get_facet_counts(CATEGORICAL_FIELDS, filters)
+
+def distinct_values(field):
+    if read_model:
+        return read_model.distinct_values(field)
+    return db.get_distinct_values(getattr(Scholarship, field))
 
 @app.route('/api/scholarships/<int:scholarship_id>')
 def get_scholarship(scholarship_id):
     """Get detailed information about a specific scholarship"""
-    scholarships = db.get_scholarships()
-    scholarship = next((s for s in scholarships if s.id == scholarship_id), None)
+    row = db.get_scholarship_row(scholarship_id, scholarship_serializer.columns)
 
-    if not scholarship:
+    if row is None:
         return jsonify({'error': 'Scholarship not found'}), 404
 
-    scholarship_data = {
-        'id': scholarship.id,
-        'name': scholarship.name,
-        'description': scholarship.description,
-        'eligibility': scholarship.eligibility,
-        'deadline': scholarship.deadline.isoformat() if scholarship.deadline else None,
-        'funding_type': scholarship.funding_type,
-        'country': scholarship.country,
-        'university': scholarship.university,
-        'degree_level': scholarship.degree_level,
-        'gpa_requirement': scholarship.gpa_requirement,
-        'application_link': scholarship.application_link,
-        'source_url': scholarship.source_url,
-        'source_name': scholarship.source_name,
-        'scraped_at': scholarship.scraped_at.isoformat(),
-        'summary': scholarship.summary or (summarizer.summarize_scholarship(scholarship.description or '') if summarizer else scholarship.description[:200] + '...' if scholarship.description else '')
-    }
-
-    return jsonify(scholarship_data)
+    return jsonify(scholarship_to_dict(row))
 
 @app.route('/api/countries')
 def get_countries():
     """Get list of available countries"""
-    scholarships = db.get_scholarships()
-    countries = set()
-    for scholarship in scholarships:
-        if scholarship.country:
-            countries.add(scholarship.country)
-
-    return jsonify(sorted(list(countries)))
+    return cached_json_response(lambda: distinct_values('country'))
 
 @app.route('/api/funding-types')
 def get_funding_types():
     """Get list of available funding types"""
-    scholarships = db.get_scholarships()
-    funding_types = set()
-    for scholarship in scholarships:
-        if scholarship.funding_type:
-            funding_types.add(scholarship.funding_type)
-
-    return jsonify(sorted(list(funding_types)))
+    return cached_json_response(lambda: distinct_values('funding_type'))
 
 @app.route('/api/subscribe', methods=['POST'])
 def subscribe():
@@ -156,6 +384,21 @@ def subscribe():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus text exposition: dashboard request and summarizer metrics plus the latest crawl run"""
+    crawl_run, sources = db.get_latest_crawl_run()
+    last_crawl.clear()
+    last_crawl_source.clear()
+    if crawl_run is not None:
+        for field in LAST_CRAWL_FIELDS:
+            last_crawl.set(getattr(crawl_run, field) or 0, field=field)
+        for source in sources:
+            for field in LAST_CRAWL_SOURCE_FIELDS:
+                last_crawl_source.set(getattr(source, field) or 0, source=source.source_url, field=field)
+
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/summarize', methods=['POST'])
 def summarize_text():
     """Summarize scholarship text"""
@@ -1,8 +1,13 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Float
+import os
+import threading
+
+from sqlalchemy import create_engine, event, inspect, Column, Integer, String, Text, DateTime, Boolean, Float, Index, and_, or_, case, func, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime
-import json
+from datetime import datetime, timedelta
+
+from config import Config
 
 Base = declarative_base()
 
@@ -26,6 +31,17 @@ class Scholarship(Base):
     is_active = Column(Boolean, default=True)
     summary = Column(Text)  # AI-generated summary
 
+    __table_args__ = (
+        Index('ix_scholarships_name_source', 'name', 'source_url'),  # upsert key
+        # Partial indexes over the active set, which every read path filters on; expired
+        # history accumulates outside them, so hot queries stay fast as it grows. There are
+        # deliberately no full indexes on these columns (see OBSOLETE_INDEXES)
+        Index('ix_scholarships_active_deadline', 'deadline',
+              sqlite_where=text('is_active = 1'), postgresql_where=text('is_active')),
+        Index('ix_scholarships_active_scraped_at', 'scraped_at', 'id',
+              sqlite_where=text('is_active = 1'), postgresql_where=text('is_active')),
+    )
+
 class Subscription(Base):
     __tablename__ = 'subscriptions'
 
@@ -36,10 +52,202 @@ class Subscription(Base):
     subscribed_at = Column(DateTime, default=datetime.utcnow)
     last_notified = Column(DateTime)
 
+class DataVersion(Base):
+    __tablename__ = 'data_version'
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class CrawlState(Base):
+    __tablename__ = 'crawl_state'
+
+    source_url = Column(String(500), primary_key=True)
+    last_fetched_at = Column(DateTime)
+    last_changed_at = Column(DateTime)
+    content_hash = Column(String(64))  # hash of the scholarships extracted on the last fetch
+    last_yield = Column(Integer, default=0)  # scholarships extracted on the last fetch
+    fetch_count = Column(Integer, default=0)
+    change_count = Column(Integer, default=0)
+    revisit_interval = Column(Integer)  # seconds
+    next_fetch_at = Column(DateTime, index=True)
+
+class ArchivedPage(Base):
+    __tablename__ = 'archived_pages'
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String(500), nullable=False, index=True)
+    kind = Column(String(20), nullable=False, default='listing')  # listing, detail
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+    segment = Column(String(100), nullable=False)  # file name under ARCHIVE_DIR
+    offset = Column(Integer, nullable=False)
+    length = Column(Integer, nullable=False)
+    content_hash = Column(String(64))
+
+    __table_args__ = (
+        Index('ix_archived_pages_segment_offset', 'segment', 'offset'),
+    )
+
+class CrawlRun(Base):
+    __tablename__ = 'crawl_runs'
+
+    id = Column(Integer, primary_key=True)
+    started_at = Column(DateTime, index=True)
+    finished_at = Column(DateTime)
+    duration_seconds = Column(Float)
+    save_seconds = Column(Float)
+    sources = Column(Integer, default=0)
+    pages = Column(Integer, default=0)
+    bytes = Column(Integer, default=0)
+    items_extracted = Column(Integer, default=0)
+    items_saved = Column(Integer, default=0)
+    errors = Column(Integer, default=0)
+
+class CrawlSourceStats(Base):
+    __tablename__ = 'crawl_source_stats'
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, nullable=False, index=True)
+    source_url = Column(String(500), nullable=False)
+    pages = Column(Integer, default=0)
+    bytes = Column(Integer, default=0)
+    fetch_seconds = Column(Float, default=0)  # network and rendering, including Playwright
+    robots_seconds = Column(Float, default=0)
+    parse_seconds = Column(Float, default=0)
+    items_extracted = Column(Integer, default=0)
+    items_saved = Column(Integer, default=0)
+    errors = Column(Integer, default=0)
+    last_error = Column(Text)
+
+class NotificationPayload(Base):
+    __tablename__ = 'notification_payloads'
+
+    id = Column(String(64), primary_key=True)  # sha256 of subject + content
+    subject = Column(String(500))
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class NotificationOutbox(Base):
+    __tablename__ = 'notification_outbox'
+
+    id = Column(Integer, primary_key=True)
+    idempotency_key = Column(String(255), nullable=False, unique=True)  # e.g. weekly:2024-W42:17:email
+    subscription_id = Column(Integer, index=True)
+    channel = Column(String(20), nullable=False)  # email, telegram
+    recipient = Column(String(255), nullable=False)
+    payload_id = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default='pending', index=True)  # pending, sending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    claim_token = Column(String(64), index=True)
+    claimed_at = Column(DateTime)  # renewed while the claiming worker is still sending
+    next_attempt_at = Column(DateTime)  # failed rows are not claimed again before this
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime)
+
+# Indexes dropped by migrate(): full-table indexes superseded by the partial active-set ones
+OBSOLETE_INDEXES = ('ix_scholarships_deadline', 'ix_scholarships_scraped_at')
+
+# One engine (and connection pool) per database URL per process
+_engines = {}
+_migrated = set()
+_engines_lock = threading.Lock()
+
+def _is_sqlite_memory(url):
+    return url.startswith('sqlite') and (url.rstrip('/') in ('sqlite:', 'sqlite:/') or ':memory:' in url)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets the dashboard read while a scrape writes; the rest trades durability of the last commit for speed"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute(f'PRAGMA synchronous={Config.SQLITE_SYNCHRONOUS}')
+    cursor.execute(f'PRAGMA cache_size=-{Config.SQLITE_CACHE_SIZE_KB}')  # negative = KiB
+    cursor.execute(f'PRAGMA mmap_size={Config.SQLITE_MMAP_SIZE_MB * 1024 * 1024}')
+    cursor.execute(f'PRAGMA busy_timeout={Config.SQLITE_BUSY_TIMEOUT_MS}')
+    cursor.close()
+
+def get_engine(database_url=None):
+    """Process-wide engine for database_url, created with pool settings and pragmas on first use"""
+    database_url = database_url or Config.DATABASE_URL
+    with _engines_lock:
+        engine = _engines.get(database_url)
+        if engine is not None:
+            return engine
+
+        if database_url.startswith('sqlite'):
+            options = {'connect_args': {'timeout': Config.SQLITE_BUSY_TIMEOUT_MS / 1000}}
+            if not _is_sqlite_memory(database_url):
+                options.update(pool_size=Config.DB_POOL_SIZE, max_overflow=Config.DB_MAX_OVERFLOW)
+        else:
+            options = {
+                'pool_size': Config.DB_POOL_SIZE,
+                'max_overflow': Config.DB_MAX_OVERFLOW,
+                'pool_recycle': Config.DB_POOL_RECYCLE,
+                'pool_pre_ping': True,
+            }
+
+        engine = create_engine(database_url, echo=False, **options)
+        if database_url.startswith('sqlite') and not _is_sqlite_memory(database_url):
+            event.listen(engine, 'connect', _set_sqlite_pragmas)
+        _engines[database_url] = engine
+        return engine
+
+def migrate(engine):
+    """Create missing tables, columns and indexes (create_all skips anything added to existing tables)"""
+    Base.metadata.create_all(engine)
+    _add_missing_columns(engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        for name in OBSOLETE_INDEXES:
+            conn.execute(text(f'DROP INDEX IF EXISTS {name}'))
+    _seed_data_version(engine)
+
+def _add_missing_columns(engine):
+    """ALTER TABLE ... ADD COLUMN for nullable columns added to a model after its table was created"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+def _seed_data_version(engine):
+    """Create the data version row up front, so bumping it is always an UPDATE.
+
+    Inserted lazily, two writers making their first write at once would both
+    INSERT it and one of them would lose its whole transaction.
+    """
+    try:
+        with engine.begin() as conn:
+            if conn.execute(DataVersion.__table__.select().where(DataVersion.id == 1)).first() is None:
+                conn.execute(DataVersion.__table__.insert().values(id=1, version=0, updated_at=datetime.utcnow()))
+    except IntegrityError:
+        pass  # another process seeded it first
+
+def _migrate_once(engine):
+    with _engines_lock:
+        if engine in _migrated:
+            return
+        migrate(engine)
+        _migrated.add(engine)
+
+def _reset_pools_after_fork():
+    # Pooled connections belong to the parent; children open their own
+    for engine in _engines.values():
+        engine.dispose(close=False)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
 class DatabaseManager:
-    def __init__(self, database_url='sqlite:///scholarships.db'):
-        self.engine = create_engine(database_url, echo=False)
-        Base.metadata.create_all(self.engine)
+    def __init__(self, database_url=None):
+        self.engine = get_engine(database_url)
+        if Config.AUTO_MIGRATE:
+            _migrate_once(self.engine)
         self.Session = sessionmaker(bind=self.engine)
 
     def add_scholarship(self, scholarship_data):
@@ -48,6 +256,7 @@ class DatabaseManager:
         try:
             scholarship = Scholarship(**scholarship_data)
             session.add(scholarship)
+            self._bump_data_version(session)
             session.commit()
             return scholarship.id
         except Exception as e:
@@ -56,25 +265,115 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def add_scholarships(self, scholarships):
+        """Insert many scholarships in one transaction; returns the number inserted"""
+        if not scholarships:
+            return 0
+        session = self.Session()
+        try:
+            session.bulk_insert_mappings(Scholarship, scholarships)
+            self._bump_data_version(session)
+            session.commit()
+            return len(scholarships)
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def upsert_scholarships(self, scholarships):
+        """Insert scholarships or update the existing row with the same (name, source_url).
+
+        Returns (inserted, updated). Summary and is_active on existing rows are left alone.
+        """
+        session = self.Session()
+        try:
+            inserted = updated = 0
+            for data in scholarships:
+                existing = session.query(Scholarship).filter(
+                    Scholarship.name == data['name'],
+                    Scholarship.source_url == data.get('source_url')
+                ).first()
+                if existing is None:
+                    session.add(Scholarship(**data))
+                    inserted += 1
+                    continue
+
+                changed = False
+                for key, value in data.items():
+                    if getattr(existing, key) != value:
+                        setattr(existing, key, value)
+                        changed = True
+                updated += changed
+
+            if inserted or updated:
+                self._bump_data_version(session)
+            session.commit()
+            return inserted, updated
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
     def get_scholarships(self, filters=None, limit=None):
         """Retrieve scholarships with optional filters"""
         session = self.Session()
         try:
-            query = session.query(Scholarship).filter(Scholarship.is_active == True)
+            query = self._apply_filters(session.query(Scholarship), filters)
+
+            if limit:
+                query = query.limit(limit)
+
+            return query.all()
+        finally:
+            session.close()
+
+    def get_scholarship_rows(self, columns, filters=None, limit=None):
+        """Retrieve active scholarships as plain row tuples of the given columns"""
+        session = self.Session()
+        try:
+            query = self._apply_filters(session.query(*columns), filters)
+
+            if limit:
+                query = query.limit(limit)
+
+            return query.all()
+        finally:
+            session.close()
+
+    def iter_scholarship_rows(self, columns, filters=None, batch_size=500):
+        """Yield active scholarships as row tuples from a server-side cursor"""
+        session = self.Session()
+        try:
+            query = self._apply_filters(session.query(*columns), filters)
+            for row in query.yield_per(batch_size):
+                yield row
+        finally:
+            session.close()
+
+    def iter_scholarship_changes(self, columns, since=None, since_id=0, batch_size=500):
+        """Yield active scholarships scraped after the (scraped_at, id) watermark, oldest first"""
+        session = self.Session()
+        try:
+            query = self._apply_filters(session.query(*columns), None)
+            if since is not None:
+                query = query.filter(or_(
+                    Scholarship.scraped_at > since,
+                    and_(Scholarship.scraped_at == since, Scholarship.id > since_id)
+                ))
+            query = query.order_by(Scholarship.scraped_at, Scholarship.id)
+            for row in query.yield_per(batch_size):
+                yield row
+        finally:
+            session.close()
 
-            if filters:
-                if 'country' in filters:
-                    query = query.filter(Scholarship.country.ilike(f'%{filters["country"]}%'))
-                if 'degree_level' in filters:
-                    query = query.filter(Scholarship.degree_level.ilike(f'%{filters["degree_level"]}%'))
-                if 'funding_type' in filters:
-                    query = query.filter(Scholarship.funding_type.ilike(f'%{filters["funding_type"]}%'))
-                if 'gpa_min' in filters:
-                    query = query.filter(Scholarship.gpa_requirement >= filters['gpa_min'])
-                if 'gpa_max' in filters:
-                    query = query.filter(Scholarship.gpa_requirement <= filters['gpa_max'])
-                if 'deadline_before' in filters:
-                    query = query.filter(Scholarship.deadline <= filters['deadline_before'])
+    def get_scholarships_scraped_since(self, columns, since, limit=None):
+        """Active scholarships with scraped_at >= since, newest first (uses ix_scholarships_active_scraped_at)"""
+        session = self.Session()
+        try:
+            query = self._apply_filters(session.query(*columns), None)
+            query = query.filter(Scholarship.scraped_at >= since).order_by(Scholarship.scraped_at.desc())
 
             if limit:
                 query = query.limit(limit)
@@ -83,6 +382,72 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def get_scholarships_with_deadline_between(self, columns, start, end, limit=None):
+        """Active scholarships with start <= deadline <= end, soonest first (uses ix_scholarships_active_deadline)"""
+        session = self.Session()
+        try:
+            query = self._apply_filters(session.query(*columns), None)
+            query = query.filter(Scholarship.deadline.between(start, end)).order_by(Scholarship.deadline)
+
+            if limit:
+                query = query.limit(limit)
+
+            return query.all()
+        finally:
+            session.close()
+
+    def get_scholarship_row(self, scholarship_id, columns):
+        """Retrieve a single active scholarship as a row tuple, or None"""
+        session = self.Session()
+        try:
+            query = self._apply_filters(session.query(*columns), None)
+            return query.filter(Scholarship.id == scholarship_id).first()
+        finally:
+            session.close()
+
+    def get_distinct_values(self, column):
+        """Return the sorted, non-empty distinct values of a column over active scholarships"""
+        session = self.Session()
+        try:
+            query = self._apply_filters(session.query(column).distinct(), None)
+            return sorted(value for (value,) in query.filter(column.isnot(None)) if value)
+        finally:
+            session.close()
+
+    def get_facet_counts(self, fields, filters=None):
+        """{field: {value: count}} over active scholarships matching every filter except the field's own"""
+        session = self.Session()
+        try:
+            counts = {}
+            for field in fields:
+                column = getattr(Scholarship, field)
+                others = {name: value for name, value in (filters or {}).items() if name != field}
+                query = self._apply_filters(session.query(column, func.count()), others)
+                counts[field] = {value: count for value, count in query.filter(column.isnot(None)).group_by(column) if value}
+            return counts
+        finally:
+            session.close()
+
+    def _apply_filters(self, query, filters):
+        """Restrict a scholarship query to active rows matching the given filters"""
+        query = query.filter(Scholarship.is_active == True)
+
+        if filters:
+            if 'country' in filters:
+                query = query.filter(Scholarship.country.ilike(f'%{filters["country"]}%'))
+            if 'degree_level' in filters:
+                query = query.filter(Scholarship.degree_level.ilike(f'%{filters["degree_level"]}%'))
+            if 'funding_type' in filters:
+                query = query.filter(Scholarship.funding_type.ilike(f'%{filters["funding_type"]}%'))
+            if 'gpa_min' in filters:
+                query = query.filter(Scholarship.gpa_requirement >= filters['gpa_min'])
+            if 'gpa_max' in filters:
+                query = query.filter(Scholarship.gpa_requirement <= filters['gpa_max'])
+            if 'deadline_before' in filters:
+                query = query.filter(Scholarship.deadline <= filters['deadline_before'])
+
+        return query
+
     def update_scholarship(self, scholarship_id, updates):
         """Update an existing scholarship"""
         session = self.Session()
@@ -92,6 +457,7 @@ class DatabaseManager:
                 for key, value in updates.items():
                     if hasattr(scholarship, key):
                         setattr(scholarship, key, value)
+                self._bump_data_version(session)
                 session.commit()
                 return True
             return False
@@ -101,6 +467,83 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def deactivate_expired(self, now=None, grace_days=None, unseen_days=None):
+        """Mark active scholarships inactive in a single UPDATE; returns the number deactivated.
+
+        A scholarship expires once its deadline is more than grace_days past, or when it
+        has not been scraped for unseen_days (0 disables that rule).
+        """
+        now = now or datetime.utcnow()
+        grace_days = Config.EXPIRE_GRACE_DAYS if grace_days is None else grace_days
+        unseen_days = Config.EXPIRE_UNSEEN_DAYS if unseen_days is None else unseen_days
+
+        expired = [Scholarship.deadline < now - timedelta(days=grace_days)]
+        if unseen_days:
+            expired.append(Scholarship.scraped_at < now - timedelta(days=unseen_days))
+
+        session = self.Session()
+        try:
+            count = session.query(Scholarship).filter(Scholarship.is_active == True, or_(*expired)).update(
+                {Scholarship.is_active: False}, synchronize_session=False
+            )
+            if count:
+                self._bump_data_version(session)
+            session.commit()
+            return count
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def get_unsummarized_scholarships(self, limit):
+        """(id, description) rows for active scholarships that still need a summary"""
+        session = self.Session()
+        try:
+            query = self._apply_filters(session.query(Scholarship.id, Scholarship.description), None)
+            query = query.filter(
+                or_(Scholarship.summary.is_(None), Scholarship.summary == ''),
+                Scholarship.description.isnot(None)
+            )
+            return query.order_by(Scholarship.id).limit(limit).all()
+        finally:
+            session.close()
+
+    def update_summaries(self, summaries):
+        """Store many summaries in one transaction; summaries maps scholarship id -> text"""
+        if not summaries:
+            return 0
+
+        session = self.Session()
+        try:
+            session.bulk_update_mappings(Scholarship, [
+                {'id': scholarship_id, 'summary': summary} for scholarship_id, summary in summaries.items()
+            ])
+            self._bump_data_version(session)
+            session.commit()
+            return len(summaries)
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def _bump_data_version(self, session):
+        """Increment the scholarship data version inside the caller's transaction (row seeded by migrate())"""
+        session.query(DataVersion).filter(DataVersion.id == 1).update(
+            {DataVersion.version: DataVersion.version + 1, DataVersion.updated_at: datetime.utcnow()},
+            synchronize_session=False
+        )
+
+    def get_data_version(self):
+        """Return the current scholarship data version (0 if nothing was written yet)"""
+        session = self.Session()
+        try:
+            version = session.query(DataVersion.version).filter(DataVersion.id == 1).scalar()
+            return version or 0
+        finally:
+            session.close()
+
     def add_subscription(self, subscription_data):
         """Add a new subscription"""
         session = self.Session()
@@ -115,35 +558,289 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def get_crawl_states(self, source_urls):
+        """Crawl state rows for the given sources, keyed by source_url"""
+        session = self.Session()
+        try:
+            states = session.query(CrawlState).filter(CrawlState.source_url.in_(list(source_urls))).all()
+            return {state.source_url: state for state in states}
+        finally:
+            session.close()
+
+    def save_crawl_state(self, source_url, updates):
+        """Insert or update the crawl state of one source"""
+        session = self.Session()
+        try:
+            state = session.get(CrawlState, source_url) or CrawlState(source_url=source_url)
+            for key, value in updates.items():
+                setattr(state, key, value)
+            session.add(state)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def save_crawl_run(self, run, sources):
+        """Persist one crawl run and its per-source stats; returns the run id"""
+        session = self.Session()
+        try:
+            crawl_run = CrawlRun(**run)
+            session.add(crawl_run)
+            session.flush()
+            session.add_all(CrawlSourceStats(run_id=crawl_run.id, **source) for source in sources)
+            session.commit()
+            return crawl_run.id
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def get_latest_crawl_run(self):
+        """(CrawlRun, [CrawlSourceStats]) for the most recent run, or (None, [])"""
+        session = self.Session()
+        try:
+            crawl_run = session.query(CrawlRun).order_by(CrawlRun.id.desc()).first()
+            if crawl_run is None:
+                return None, []
+            sources = (session.query(CrawlSourceStats)
+                       .filter(CrawlSourceStats.run_id == crawl_run.id)
+                       .order_by(CrawlSourceStats.source_url)
+                       .all())
+            return crawl_run, sources
+        finally:
+            session.close()
+
+    def add_archived_page(self, entry):
+        """Index one archived page record"""
+        session = self.Session()
+        try:
+            session.add(ArchivedPage(**entry))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def get_archived_hash(self, url):
+        """Content hash of the newest archived copy of url, or None"""
+        session = self.Session()
+        try:
+            row = (session.query(ArchivedPage.content_hash)
+                   .filter(ArchivedPage.url == url)
+                   .order_by(ArchivedPage.id.desc())
+                   .first())
+            return row[0] if row else None
+        finally:
+            session.close()
+
+    def get_archived_urls(self, kind=None):
+        """Set of URLs with at least one archived copy"""
+        session = self.Session()
+        try:
+            query = session.query(ArchivedPage.url).distinct()
+            if kind:
+                query = query.filter(ArchivedPage.kind == kind)
+            return {url for (url,) in query}
+        finally:
+            session.close()
+
+    def iter_latest_archived_pages(self, kind=None, batch_size=500):
+        """Stream the newest index entry per URL in segment/offset order for sequential reads.
+
+        Pages through the index with a keyset so no read transaction stays open
+        while the caller writes (SQLite would otherwise block the writer).
+        """
+        after = None
+        while True:
+            session = self.Session()
+            try:
+                latest = session.query(func.max(ArchivedPage.id)).group_by(ArchivedPage.url)
+                query = session.query(
+                    ArchivedPage.kind, ArchivedPage.url, ArchivedPage.segment,
+                    ArchivedPage.offset, ArchivedPage.length
+                ).filter(ArchivedPage.id.in_(latest))
+                if kind:
+                    query = query.filter(ArchivedPage.kind == kind)
+                if after:
+                    query = query.filter(or_(
+                        ArchivedPage.segment > after[0],
+                        and_(ArchivedPage.segment == after[0], ArchivedPage.offset > after[1])
+                    ))
+                rows = query.order_by(ArchivedPage.segment, ArchivedPage.offset).limit(batch_size).all()
+            finally:
+                session.close()
+
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1].segment, rows[-1].offset)
+
+    def enqueue_notifications(self, payloads, entries):
+        """Persist payloads and outbox entries, skipping idempotency keys that already exist.
+
+        payloads: dicts with id, subject, content. entries: dicts with idempotency_key,
+        subscription_id, channel, recipient, payload_id. Returns the number of new entries.
+        """
+        session = self.Session()
+        try:
+            payload_ids = [payload['id'] for payload in payloads]
+            known_payloads = {
+                payload_id for (payload_id,) in
+                session.query(NotificationPayload.id).filter(NotificationPayload.id.in_(payload_ids))
+            } if payload_ids else set()
+            session.add_all(
+                NotificationPayload(**payload) for payload in payloads if payload['id'] not in known_payloads
+            )
+
+            keys = [entry['idempotency_key'] for entry in entries]
+            known_keys = set()
+            for start in range(0, len(keys), 500):
+                known_keys.update(
+                    key for (key,) in session.query(NotificationOutbox.idempotency_key)
+                    .filter(NotificationOutbox.idempotency_key.in_(keys[start:start + 500]))
+                )
+            new_entries = [entry for entry in entries if entry['idempotency_key'] not in known_keys]
+            session.bulk_insert_mappings(NotificationOutbox, new_entries)
+
+            session.commit()
+            return len(new_entries)
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def claim_outbox_batch(self, claim_token, limit, lease_expired_before, now=None):
+        """Atomically claim up to `limit` deliverable outbox rows for one worker.
+
+        Pending rows are claimable once their next_attempt_at has passed, as are
+        'sending' rows whose lease was last renewed before lease_expired_before
+        (left behind by a crashed worker). Returns the claimed rows joined with
+        their payloads.
+        """
+        now = now or datetime.utcnow()
+        session = self.Session()
+        try:
+            claimable = or_(
+                and_(NotificationOutbox.status == 'pending',
+                     or_(NotificationOutbox.next_attempt_at.is_(None), NotificationOutbox.next_attempt_at <= now)),
+                and_(NotificationOutbox.status == 'sending', NotificationOutbox.claimed_at < lease_expired_before)
+            )
+            candidate_ids = [
+                outbox_id for (outbox_id,) in
+                session.query(NotificationOutbox.id).filter(claimable).order_by(NotificationOutbox.id).limit(limit)
+            ]
+            if not candidate_ids:
+                return []
+
+            # Re-check claimability in the UPDATE so concurrent workers never share a row
+            session.query(NotificationOutbox).filter(
+                NotificationOutbox.id.in_(candidate_ids), claimable
+            ).update({
+                NotificationOutbox.status: 'sending',
+                NotificationOutbox.claim_token: claim_token,
+                NotificationOutbox.claimed_at: now,
+                NotificationOutbox.attempts: NotificationOutbox.attempts + 1,
+            }, synchronize_session=False)
+            session.commit()
+
+            return session.query(
+                NotificationOutbox.id, NotificationOutbox.subscription_id, NotificationOutbox.channel,
+                NotificationOutbox.recipient, NotificationOutbox.attempts,
+                NotificationPayload.subject, NotificationPayload.content
+            ).join(
+                NotificationPayload, NotificationPayload.id == NotificationOutbox.payload_id
+            ).filter(
+                NotificationOutbox.claim_token == claim_token, NotificationOutbox.status == 'sending'
+            ).order_by(NotificationOutbox.id).all()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def renew_outbox_lease(self, claim_token, now=None):
+        """Extend the lease on rows still being sent under claim_token; returns how many are held"""
+        session = self.Session()
+        try:
+            renewed = session.query(NotificationOutbox).filter(
+                NotificationOutbox.claim_token == claim_token, NotificationOutbox.status == 'sending'
+            ).update({NotificationOutbox.claimed_at: now or datetime.utcnow()}, synchronize_session=False)
+            session.commit()
+            return renewed
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def complete_outbox_batch(self, claim_token, sent, failed, max_attempts):
+        """Record delivery outcomes for rows still held under claim_token.
+
+        sent: list of (outbox_id, subscription_id). failed: list of (outbox_id, error,
+        next_attempt_at). Failed rows return to 'pending' until they reach max_attempts.
+        Rows whose lease was taken over by another worker are left to their new owner.
+        Subscribers with at least one sent delivery get last_notified stamped in one
+        UPDATE. Returns the number of outbox rows updated.
+        """
+        session = self.Session()
+        try:
+            now = datetime.utcnow()
+            held = and_(NotificationOutbox.claim_token == claim_token, NotificationOutbox.status == 'sending')
+            updated = 0
+            if sent:
+                updated += session.query(NotificationOutbox).filter(
+                    NotificationOutbox.id.in_([outbox_id for outbox_id, _ in sent]), held
+                ).update({
+                    NotificationOutbox.status: 'sent',
+                    NotificationOutbox.sent_at: now,
+                    NotificationOutbox.claim_token: None,
+                }, synchronize_session=False)
+
+                subscription_ids = {subscription_id for _, subscription_id in sent if subscription_id}
+                if subscription_ids:
+                    session.query(Subscription).filter(Subscription.id.in_(subscription_ids)).update(
+                        {Subscription.last_notified: now}, synchronize_session=False
+                    )
+
+            for outbox_id, error, next_attempt_at in failed:
+                updated += session.query(NotificationOutbox).filter(NotificationOutbox.id == outbox_id, held).update({
+                    NotificationOutbox.status: case(
+                        (NotificationOutbox.attempts >= max_attempts, 'failed'), else_='pending'
+                    ),
+                    NotificationOutbox.last_error: str(error)[:1000],
+                    NotificationOutbox.next_attempt_at: next_attempt_at,
+                    NotificationOutbox.claim_token: None,
+                }, synchronize_session=False)
+
+            session.commit()
+            return updated
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def get_outbox_counts(self):
+        """Number of outbox rows per status"""
+        session = self.Session()
+        try:
+            return dict(
+                session.query(NotificationOutbox.status, func.count(NotificationOutbox.id))
+                .group_by(NotificationOutbox.status).all()
+            )
+        finally:
+            session.close()
+
     def export_to_json(self, filepath, filters=None):
         """Export scholarships to JSON file"""
-        scholarships = self.get_scholarships(filters)
-        data = []
-
-        for scholarship in scholarships:
-            scholarship_dict = {
-                'id': scholarship.id,
-                'name': scholarship.name,
-                'description': scholarship.description,
-                'eligibility': scholarship.eligibility,
-                'deadline': scholarship.deadline.isoformat() if scholarship.deadline else None,
-                'funding_type': scholarship.funding_type,
-                'country': scholarship.country,
-                'university': scholarship.university,
-                'degree_level': scholarship.degree_level,
-                'gpa_requirement': scholarship.gpa_requirement,
-                'application_link': scholarship.application_link,
-                'source_url': scholarship.source_url,
-                'source_name': scholarship.source_name,
-                'scraped_at': scholarship.scraped_at.isoformat(),
-                'summary': scholarship.summary
-            }
-            data.append(scholarship_dict)
+        from exporter import ScholarshipExporter
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
-        return len(data)
+        return ScholarshipExporter(self).export(filepath, 'json', filters)
 
     def get_subscriptions(self):
         """Get all subscriptions"""
@@ -0,0 +1,157 @@
+"""
+Concurrent notification delivery for ScholarSift.
+
+Deliveries fan out concurrently with a concurrency cap per channel. Telegram
+sends respect the Bot API limits (about 30 messages/s overall and 1 message/s
+per chat) through token buckets. Transient failures are retried with
+exponential backoff.
+"""
+
+import asyncio
+import smtplib
+import time
+from collections import namedtuple
+
+try:
+    import telegram.error
+    TELEGRAM_AVAILABLE = True
+except ImportError:
+    TELEGRAM_AVAILABLE = False
+
+from config import Config
+from mailer import is_connection_error
+from metrics import registry, span
+
+notifications_total = registry.counter('scholarsift_notifications_total', 'Notification deliveries by outcome')
+notification_retries = registry.counter('scholarsift_notification_retries_total', 'Notification send attempts retried')
+
+# A single message to deliver: channel is 'email' or 'telegram'
+Delivery = namedtuple('Delivery', ['channel', 'recipient', 'subject', 'content'])
+
+class TokenBucket:
+    """Async token bucket allowing `rate` acquisitions per second, bursting up to `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+def retry_delay(error, attempt, backoff=None):
+    """Seconds to wait before retrying a transient failure, or None if it is permanent"""
+    backoff = Config.DELIVERY_RETRY_BACKOFF if backoff is None else backoff
+    if TELEGRAM_AVAILABLE:
+        if isinstance(error, telegram.error.RetryAfter):
+            retry_after = error.retry_after
+            return retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else float(retry_after)
+        if isinstance(error, telegram.error.BadRequest):
+            return None
+        if isinstance(error, (telegram.error.TimedOut, telegram.error.NetworkError)):
+            return backoff * 2 ** attempt
+
+    if isinstance(error, smtplib.SMTPResponseException) and 400 <= error.smtp_code < 500:
+        return backoff * 2 ** attempt
+    if isinstance(error, asyncio.TimeoutError) or is_connection_error(error):
+        return backoff * 2 ** attempt
+
+    return None
+
+class DeliveryEngine:
+    """Fans deliveries out concurrently under per-channel caps and rate limits.
+
+    `send_email(delivery)` is a blocking callable run in a worker thread and
+    `send_telegram(delivery)` is a coroutine function; both raise on failure.
+    """
+
+    def __init__(self, send_email=None, send_telegram=None, email_concurrency=None,
+                 telegram_concurrency=None, telegram_rate=None, telegram_chat_rate=None,
+                 max_retries=None, retry_backoff=None):
+        self.senders = {'email': send_email, 'telegram': send_telegram}
+        self.max_retries = Config.DELIVERY_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_backoff = Config.DELIVERY_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        self._limits = {
+            'email': email_concurrency or Config.SMTP_POOL_SIZE,
+            'telegram': telegram_concurrency or Config.TELEGRAM_CONCURRENCY,
+        }
+        self._telegram_rate = telegram_rate or Config.TELEGRAM_RATE_LIMIT
+        self._telegram_chat_rate = telegram_chat_rate or Config.TELEGRAM_CHAT_RATE_LIMIT
+
+    async def _acquire_telegram_tokens(self, chat_id, chat_buckets, global_bucket):
+        """Wait for both the per-chat and the global Telegram rate limits"""
+        chat_bucket = chat_buckets.get(chat_id)
+        if chat_bucket is None:
+            chat_bucket = chat_buckets[chat_id] = TokenBucket(self._telegram_chat_rate, 1)
+        await chat_bucket.acquire()
+        await global_bucket.acquire()
+
+    async def _send_once(self, delivery):
+        if delivery.channel == 'telegram':
+            await self.senders['telegram'](delivery)
+        else:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.senders['email'], delivery)
+
+    async def _deliver(self, delivery, semaphores, chat_buckets, global_bucket):
+        if self.senders.get(delivery.channel) is None:
+            return delivery, RuntimeError(f"No sender configured for {delivery.channel}")
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                # Rate limits are waited out before taking a concurrency slot
+                if delivery.channel == 'telegram':
+                    await self._acquire_telegram_tokens(delivery.recipient, chat_buckets, global_bucket)
+                async with semaphores[delivery.channel]:
+                    with span('deliver', channel=delivery.channel):
+                        await self._send_once(delivery)
+                notifications_total.inc(channel=delivery.channel, status='sent')
+                return delivery, None
+            except Exception as e:
+                delay = retry_delay(e, attempt, self.retry_backoff)
+                if delay is None or attempt == self.max_retries:
+                    print(f"❌ Error sending {delivery.channel} to {delivery.recipient}: {e}")
+                    notifications_total.inc(channel=delivery.channel, status='failed')
+                    return delivery, e
+                notification_retries.inc(channel=delivery.channel)
+                await asyncio.sleep(delay)
+
+    async def deliver(self, deliveries, on_result=None):
+        """Deliver everything concurrently; returns (delivery, error) pairs in input order.
+
+        on_result(index, delivery, error), a coroutine function, is awaited as each
+        delivery finishes, so callers can record outcomes before the rest are done.
+        """
+        # Locks and buckets are bound to the running loop, so build them per call
+        semaphores = {channel: asyncio.Semaphore(limit) for channel, limit in self._limits.items()}
+        global_bucket = TokenBucket(self._telegram_rate)
+        chat_buckets = {}
+
+        async def deliver_one(index, delivery):
+            result = await self._deliver(delivery, semaphores, chat_buckets, global_bucket)
+            if on_result is not None:
+                await on_result(index, *result)
+            return result
+
+        return await asyncio.gather(*[deliver_one(index, delivery) for index, delivery in enumerate(deliveries)])
+
+    @staticmethod
+    def count_sent(results):
+        """Successful deliveries per channel"""
+        counts = {'email': 0, 'telegram': 0}
+        for delivery, error in results:
+            if error is None:
+                counts[delivery.channel] += 1
+        return counts
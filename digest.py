@@ -0,0 +1,170 @@
+"""
+Digest rendering for ScholarSift notifications.
+
+Templates are compiled once at import. Each scholarship's email card and
+Telegram entry is rendered once and cached. A digest is assembled by joining
+cached fragments, and a fully rendered digest is memoized by its title and
+scholarship set, so every subscriber segment that shares a match set reuses
+one rendering.
+"""
+
+from collections import OrderedDict
+from string import Template
+
+from config import Config
+
+HTML_HEADER = Template("""
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                .header { background: #007bff; color: white; padding: 20px; text-align: center; }
+                .scholarship { border: 1px solid #ddd; margin: 10px 0; padding: 15px; border-radius: 5px; }
+                .deadline { color: #dc3545; font-weight: bold; }
+                .apply-btn { background: #28a745; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; }
+                .footer { margin-top: 30px; padding: 20px; background: #f8f9fa; text-align: center; }
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>🎓 $title</h1>
+                <p>ScholarSift - Your Smart Scholarship Discovery Platform</p>
+            </div>
+
+            <div style="padding: 20px;">
+                <p>Hello! Here are the latest scholarship opportunities:</p>
+        """)
+
+HTML_CARD = Template("""
+            <div class="scholarship">
+                <h3>$name</h3>
+                $country
+                $degree_level
+                $funding
+                $gpa
+                $deadline
+                <p>$summary</p>
+                <a href="$application_link" class="apply-btn">Apply Now</a>
+            </div>
+            """)
+
+HTML_FOOTER = """
+            </div>
+            <div class="footer">
+                <p>This is an automated update from ScholarSift.</p>
+                <p>You can manage your subscription preferences anytime.</p>
+                <p><a href="https://scholarsift.com/unsubscribe">Unsubscribe</a> | <a href="https://scholarsift.com">Visit Website</a></p>
+            </div>
+        </body>
+        </html>
+        """
+
+TELEGRAM_HEADERS = {
+    False: "🎓 New Scholarships This Week\n\n",
+    True: "🚨 URGENT DEADLINES\n\n",
+}
+TELEGRAM_MAX_ITEMS = 5
+TELEGRAM_FOOTER = "Visit our website for more details and filtering options."
+
+class LRUCache:
+    """Minimal bounded mapping that evicts the least recently used key"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+def format_funding(funding_type):
+    return funding_type.replace('_', ' ').title()
+
+class DigestRenderer:
+    """Renders email and Telegram digests from cached per-scholarship fragments.
+
+    Fragments are keyed by the scholarship row itself, so an edited row renders
+    a fresh fragment while unchanged rows are reused across runs.
+    """
+
+    def __init__(self, max_fragments=None, max_digests=None):
+        self._cards = LRUCache(max_fragments or Config.DIGEST_FRAGMENT_CACHE_SIZE)
+        self._telegram_items = LRUCache(max_fragments or Config.DIGEST_FRAGMENT_CACHE_SIZE)
+        self._digests = LRUCache(max_digests or Config.DIGEST_CACHE_SIZE)
+
+    @staticmethod
+    def _key(scholarship):
+        return tuple(scholarship)
+
+    def render_card(self, scholarship):
+        """HTML card for one scholarship"""
+        key = self._key(scholarship)
+        card = self._cards.get(key)
+        if card is not None:
+            return card
+
+        s = scholarship
+        return self._cards.set(key, HTML_CARD.substitute(
+            name=s.name,
+            country=f'<p><strong>Country:</strong> {s.country}</p>' if s.country else '',
+            degree_level=f'<p><strong>Degree Level:</strong> {s.degree_level}</p>' if s.degree_level else '',
+            funding=f'<p><strong>Funding:</strong> {format_funding(s.funding_type)}</p>' if s.funding_type else '',
+            gpa=f'<p><strong>GPA Requirement:</strong> {s.gpa_requirement}</p>' if s.gpa_requirement else '',
+            deadline=f'<p class="deadline"><strong>Deadline:</strong> {s.deadline.strftime("%B %d, %Y")}</p>' if s.deadline else '',
+            summary=(s.summary or s.description[:200] + "...") if s.description else "No description available",
+            application_link=s.application_link,
+        ))
+
+    def render_telegram_item(self, scholarship):
+        """Telegram entry for one scholarship"""
+        key = self._key(scholarship)
+        item = self._telegram_items.get(key)
+        if item is not None:
+            return item
+
+        s = scholarship
+        lines = [f"📚 {s.name}\n"]
+        if s.country:
+            lines.append(f"🌍 {s.country}\n")
+        if s.deadline:
+            lines.append(f"⏰ {s.deadline.strftime('%Y-%m-%d')}\n")
+        if s.funding_type:
+            lines.append(f"💰 {format_funding(s.funding_type)}\n")
+        lines.append(f"🔗 {s.application_link}\n\n")
+        return self._telegram_items.set(key, ''.join(lines))
+
+    def render_html(self, scholarships, title="New Scholarships"):
+        """Full HTML digest, memoized per (title, scholarship set)"""
+        digest_key = ('html', title, tuple(self._key(s) for s in scholarships))
+        html = self._digests.get(digest_key)
+        if html is not None:
+            return html
+
+        parts = [HTML_HEADER.substitute(title=title)]
+        parts.extend(self.render_card(scholarship) for scholarship in scholarships)
+        parts.append(HTML_FOOTER)
+        return self._digests.set(digest_key, ''.join(parts))
+
+    def render_telegram(self, scholarships, urgent=False):
+        """Telegram digest (first TELEGRAM_MAX_ITEMS entries), memoized per scholarship set"""
+        shown = scholarships[:TELEGRAM_MAX_ITEMS]
+        digest_key = ('telegram', urgent, len(scholarships), tuple(self._key(s) for s in shown))
+        message = self._digests.get(digest_key)
+        if message is not None:
+            return message
+
+        parts = [TELEGRAM_HEADERS[urgent]]
+        parts.extend(self.render_telegram_item(scholarship) for scholarship in shown)
+        if len(scholarships) > TELEGRAM_MAX_ITEMS:
+            parts.append(f"... and {len(scholarships) - TELEGRAM_MAX_ITEMS} more scholarships!\n\n")
+        parts.append(TELEGRAM_FOOTER)
+        return self._digests.set(digest_key, ''.join(parts))
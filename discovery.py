@@ -0,0 +1,236 @@
+"""
+Discovery crawler: finds new scholarship pages by following links out from
+the seed sources.
+
+The frontier is a priority queue ordered by keyword relevance, and every URL
+is normalized before it is considered. The seen-set is a Bloom filter, so
+memory stays fixed at millions of URLs. Crawl depth, pages per domain and
+total pages are all bounded. Pages are handed to the scraper's extractor as
+they are fetched, so the pipeline saves results while the crawl continues.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import math
+import time
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+from urllib.robotparser import RobotFileParser
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from config import Config
+
+# Query parameters that never change page content, matched exactly; only utm_* is matched by prefix,
+# so meaningful keys like reference= or refid= survive
+TRACKING_PARAMS = frozenset(('fbclid', 'gclid', 'mc_cid', 'mc_eid', '_ga', 'ref', 'referrer'))
+TRACKING_PARAM_PREFIXES = ('utm_',)
+
+# File types that are never scholarship pages
+SKIPPED_EXTENSIONS = (
+    '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.css', '.js',
+    '.zip', '.mp4', '.mp3', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx'
+)
+
+def is_tracking_param(key):
+    key = key.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PARAM_PREFIXES)
+
+def normalize_url(url, base=None):
+    """Canonical form of an http(s) URL, or None if it is not crawlable.
+
+    Resolves relative links, lowercases scheme and host, drops default ports,
+    fragments and tracking parameters, and sorts the query string.
+    """
+    if base:
+        url = urljoin(base, url)
+
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    if scheme not in ('http', 'https') or not parsed.hostname:
+        return None
+
+    host = parsed.hostname.lower()
+    if parsed.port and parsed.port != {'http': 80, 'https': 443}[scheme]:
+        host = f'{host}:{parsed.port}'
+
+    path = parsed.path or '/'
+    if path.lower().endswith(SKIPPED_EXTENSIONS):
+        return None
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not is_tracking_param(key)
+    )
+    return urlunparse((scheme, host, path, '', urlencode(query), ''))
+
+class BloomFilter:
+    """Fixed-size probabilistic set: no false negatives, ~error_rate false positives"""
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def __contains__(self, item):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item):
+        """Add item; returns True if it was (probably) not present before"""
+        added = False
+        for p in self._positions(item):
+            mask = 1 << (p & 7)
+            if not self.bits[p >> 3] & mask:
+                self.bits[p >> 3] |= mask
+                added = True
+        return added
+
+def score_link(url, anchor_text):
+    """Relevance of a link by SCHOLARSHIP_KEYWORDS in its anchor text (x2) and URL (x1)"""
+    anchor_text = anchor_text.lower()
+    url_text = url.lower().replace('-', ' ').replace('_', ' ')
+    score = 0
+    for keyword in Config.SCHOLARSHIP_KEYWORDS:
+        if keyword in anchor_text:
+            score += 2
+        if keyword in url_text:
+            score += 1
+    return score
+
+class DiscoveryCrawler:
+    """Bounded best-first link crawler that feeds pages into the scraper"""
+
+    def __init__(self, scraper, max_depth=None, max_pages=None, max_pages_per_domain=None,
+                 min_score=None, concurrency=None):
+        self.scraper = scraper
+        self.max_depth = Config.DISCOVERY_MAX_DEPTH if max_depth is None else max_depth
+        self.max_pages = max_pages or Config.DISCOVERY_MAX_PAGES
+        self.max_pages_per_domain = max_pages_per_domain or Config.DISCOVERY_MAX_PAGES_PER_DOMAIN
+        self.min_score = Config.DISCOVERY_MIN_SCORE if min_score is None else min_score
+        self.concurrency = concurrency or Config.DISCOVERY_CONCURRENCY
+
+        self.seen = BloomFilter(Config.DISCOVERY_BLOOM_CAPACITY)
+        self.frontier = []
+        self.domain_pages = {}
+        self.domain_last_fetch = {}
+        self.robots = {}  # domain -> RobotFileParser, or None when unreadable
+        self.discovered_sources = {}  # domain -> scholarships extracted
+        self.pages_fetched = 0
+        self._sequence = 0
+
+    def push(self, url, depth, score):
+        """Add a normalized URL to the frontier unless already seen"""
+        if self.seen.add(url):
+            self._sequence += 1
+            heapq.heappush(self.frontier, (-score, depth, self._sequence, url))
+
+    def extract_links(self, html, page_url):
+        """(normalized url, anchor text) pairs from a page's <a href> tags"""
+        links = []
+        for anchor in BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('a', href=True)).find_all('a'):
+            url = normalize_url(anchor['href'], page_url)
+            if url:
+                links.append((url, anchor.get_text(' ', strip=True)))
+        return links
+
+    def _next_batch(self):
+        """Pop up to `concurrency` frontier entries from distinct domains within budget"""
+        batch = []
+        deferred = []
+        batch_domains = set()
+        while self.frontier and len(batch) < self.concurrency and self.pages_fetched + len(batch) < self.max_pages:
+            entry = heapq.heappop(self.frontier)
+            domain = urlparse(entry[3]).netloc
+            if self.domain_pages.get(domain, 0) >= self.max_pages_per_domain:
+                continue  # domain budget spent: drop
+            if domain in batch_domains:
+                deferred.append(entry)  # one request per domain at a time
+                continue
+            batch_domains.add(domain)
+            batch.append(entry)
+
+        for entry in deferred:
+            heapq.heappush(self.frontier, entry)
+        return batch
+
+    def _allowed(self, url):
+        """robots.txt check with one parser fetched and cached per domain"""
+        if not Config.RESPECT_ROBOTS_TXT:
+            return True
+
+        parsed = urlparse(url)
+        if parsed.netloc not in self.robots:
+            parser = RobotFileParser(f"{parsed.scheme}://{parsed.netloc}/robots.txt")
+            try:
+                parser.read()
+            except Exception as e:
+                print(f"Error checking robots.txt for {url}: {e}")
+                parser = None
+            self.robots[parsed.netloc] = parser
+
+        parser = self.robots[parsed.netloc]
+        return parser is None or parser.can_fetch(Config.DEFAULT_USER_AGENT, url)
+
+    def _fetch(self, url):
+        """Blocking fetch honouring robots.txt and the per-domain request delay"""
+        domain = urlparse(url).netloc
+        wait = self.domain_last_fetch.get(domain, 0) + Config.REQUEST_DELAY - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self.domain_last_fetch[domain] = time.monotonic()
+
+        if not self._allowed(url):
+            return None
+        response = self.scraper.session.get(url, timeout=30)
+        response.raise_for_status()
+        if 'html' not in response.headers.get('Content-Type', 'text/html'):
+            return None
+        return self.scraper.archive_page(url, response.text)
+
+    async def crawl(self, seeds):
+        """Async generator yielding (url, scholarships) for each fetched page"""
+        for seed in seeds:
+            url = normalize_url(seed)
+            if url:
+                self.push(url, 0, float('inf'))
+
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                break
+
+            for _, _, _, url in batch:
+                domain = urlparse(url).netloc
+                self.domain_pages[domain] = self.domain_pages.get(domain, 0) + 1
+            self.pages_fetched += len(batch)
+
+            results = await asyncio.gather(
+                *[loop.run_in_executor(None, self._fetch, url) for _, _, _, url in batch],
+                return_exceptions=True
+            )
+
+            for (_, depth, _, url), html in zip(batch, results):
+                if isinstance(html, Exception):
+                    print(f"Error fetching {url}: {html}")
+                    continue
+                if not html:
+                    continue
+
+                if depth < self.max_depth:
+                    for link, anchor_text in self.extract_links(html, url):
+                        score = score_link(link, anchor_text)
+                        if score >= self.min_score:
+                            self.push(link, depth + 1, score)
+
+                scholarships = self.scraper.extract_scholarship_data(html, url)
+                if scholarships:
+                    domain = urlparse(url).netloc
+                    self.discovered_sources[domain] = self.discovered_sources.get(domain, 0) + len(scholarships)
+                yield url, scholarships
@@ -0,0 +1,308 @@
+"""
+Streaming export of scholarships to JSON, NDJSON, CSV, Parquet and Arrow.
+
+Rows are read through a server-side cursor and written incrementally, so
+memory stays flat regardless of table size. Every export goes to a temporary
+file in the target directory and is atomically renamed into place, so readers
+never observe a half-written file.
+"""
+
+import csv
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows: exports are still serialised between threads of one process
+    fcntl = None
+
+from config import Config
+from serializers import scholarship_serializer
+
+# pyarrow is slow to import, so it is only loaded by the first Parquet/Arrow export
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+pa = pq = None
+
+def _load_pyarrow():
+    global pa, pq
+    if pa is None:
+        import pyarrow
+        import pyarrow.parquet
+        pa, pq = pyarrow, pyarrow.parquet
+
+EXPORT_FORMATS = ('json', 'ndjson', 'csv', 'parquet', 'arrow')
+
+# File extension per export format
+EXPORT_EXTENSIONS = {
+    'json': 'json',
+    'ndjson': 'ndjson',
+    'csv': 'csv',
+    'parquet': 'parquet',
+    'arrow': 'arrow',
+}
+
+@contextmanager
+def atomic_write(filepath, mode='w', **open_kwargs):
+    """Open a temp file next to filepath and rename it over filepath on success"""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(filepath)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+class ScholarshipExporter:
+    """Writes active scholarships to disk in one of EXPORT_FORMATS"""
+
+    def __init__(self, db, serializer=scholarship_serializer, batch_size=None):
+        self.db = db
+        self.serializer = serializer
+        self.batch_size = batch_size or Config.EXPORT_BATCH_SIZE
+
+    def default_path(self, format):
+        """Default output path for a format, e.g. data/scholarships.csv"""
+        return os.path.join('data', f'scholarships.{EXPORT_EXTENSIONS[format]}')
+
+    def export(self, filepath=None, format='json', filters=None):
+        """Export scholarships and return the number of rows written"""
+        format = format.lower()
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+        if format in ('parquet', 'arrow') and not PYARROW_AVAILABLE:
+            raise RuntimeError(f"{format} export requires pyarrow - install it with: pip install pyarrow")
+
+        filepath = filepath or self.default_path(format)
+        rows = self.db.iter_scholarship_rows(self.serializer.columns, filters, self.batch_size)
+        return self.write_rows(rows, filepath, format)
+
+    def write_rows(self, rows, filepath, format='json'):
+        """Write an iterable of row tuples (in serializer field order) to filepath"""
+        writer = getattr(self, f'_write_{format}')
+        if format in ('parquet', 'arrow'):
+            _load_pyarrow()
+            with atomic_write(filepath, 'wb') as f:
+                return writer(rows, f)
+
+        with atomic_write(filepath, 'w', encoding='utf-8', newline='') as f:
+            return writer(rows, f)
+
+    def _write_json(self, rows, f):
+        """JSON array, formatted like json.dump(..., indent=2)"""
+        count = 0
+        for record in self.serializer.serialize(rows):
+            f.write(',\n  ' if count else '[\n  ')
+            f.write(json.dumps(record, ensure_ascii=False, indent=2).replace('\n', '\n  '))
+            count += 1
+
+        f.write('\n]' if count else '[]')
+        return count
+
+    def _write_ndjson(self, rows, f):
+        count = 0
+        for record in self.serializer.serialize(rows):
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+        return count
+
+    def _write_csv(self, rows, f):
+        writer = csv.writer(f)
+        writer.writerow(self.serializer.fields)
+
+        count = 0
+        for record in self.serializer.serialize(rows):
+            writer.writerow(record.values())
+            count += 1
+        return count
+
+    def _arrow_schema(self):
+        """Arrow schema matching the serializer's columns"""
+        arrow_types = {
+            'Integer': pa.int64(),
+            'Float': pa.float64(),
+            'Boolean': pa.bool_(),
+            'DateTime': pa.timestamp('us'),
+        }
+        return pa.schema([
+            (column.key, arrow_types.get(type(column.type).__name__, pa.string()))
+            for column in self.serializer.columns
+        ])
+
+    def _arrow_batches(self, rows, schema):
+        """Group raw row tuples into Arrow record batches of batch_size rows"""
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                yield self._record_batch(batch, schema), len(batch)
+                batch = []
+
+        if batch:
+            yield self._record_batch(batch, schema), len(batch)
+
+    def _record_batch(self, batch, schema):
+        columns = zip(*batch)
+        return pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema
+        )
+
+    def _write_parquet(self, rows, f):
+        schema = self._arrow_schema()
+        count = 0
+        with pq.ParquetWriter(f, schema, compression='zstd') as writer:
+            for batch, size in self._arrow_batches(rows, schema):
+                writer.write_batch(batch)
+                count += size
+        return count
+
+    def _write_arrow(self, rows, f):
+        schema = self._arrow_schema()
+        count = 0
+        with pa.ipc.new_file(f, schema) as writer:
+            for batch, size in self._arrow_batches(rows, schema):
+                writer.write_batch(batch)
+                count += size
+        return count
+
+_state_locks = {}
+_state_locks_guard = threading.Lock()
+
+@contextmanager
+def export_lock(state_path):
+    """Serialise every export that shares a state file, across threads and processes.
+
+    Without it a compaction can truncate change-log lines that a concurrent
+    export appended after the snapshot was read, while that export's watermark
+    has already moved past them.
+    """
+    path = os.path.abspath(state_path)
+    with _state_locks_guard:
+        lock = _state_locks.setdefault(path, threading.Lock())
+
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f'{path}.lock', 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+class IncrementalExporter:
+    """Appends scholarships scraped since the last export to an NDJSON change log.
+
+    Progress is tracked by a (scraped_at, id) watermark persisted in a small
+    JSON state file. When the change log grows past EXPORT_COMPACT_EVERY rows,
+    or the snapshot is older than EXPORT_COMPACT_INTERVAL_HOURS, a full JSON
+    snapshot is rewritten and the change log is truncated. Consumers load the
+    snapshot, then apply change-log lines in order keyed by id.
+
+    Each public method holds export_lock for the state file and reads the
+    state inside it, so concurrent jobs never act on a stale watermark.
+    """
+
+    def __init__(self, db, snapshot_path='data/scholarships.json',
+                 changes_path='data/scholarships.changes.ndjson',
+                 state_path='data/export_state.json'):
+        self.db = db
+        self.snapshot_path = snapshot_path
+        self.changes_path = changes_path
+        self.state_path = state_path
+        self.exporter = ScholarshipExporter(db)
+
+    def load_state(self):
+        """Read the persisted watermark state (empty state if none yet)"""
+        if not os.path.exists(self.state_path):
+            return {'watermark': None, 'watermark_id': 0, 'pending_changes': 0, 'snapshot_at': None}
+
+        with open(self.state_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_state(self, state):
+        with atomic_write(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+
+    def export_changes(self):
+        """Append rows past the watermark to the change log and return how many were written"""
+        with export_lock(self.state_path):
+            return self._export_changes(self.load_state())
+
+    def _export_changes(self, state):
+        since = datetime.fromisoformat(state['watermark']) if state['watermark'] else None
+
+        serializer = self.exporter.serializer
+        rows = self.db.iter_scholarship_changes(serializer.columns, since, state['watermark_id'], self.exporter.batch_size)
+
+        count = 0
+        last_row = None
+        os.makedirs(os.path.dirname(os.path.abspath(self.changes_path)), exist_ok=True)
+        with open(self.changes_path, 'a', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(serializer.to_dict(row), ensure_ascii=False))
+                f.write('\n')
+                last_row = row
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+
+        if last_row is not None:
+            state['watermark'] = last_row.scraped_at.isoformat()
+            state['watermark_id'] = last_row.id
+            state['pending_changes'] += count
+            self.save_state(state)
+
+        return count
+
+    def needs_compaction(self, state):
+        """True when the change log is long enough, or the snapshot old enough, to rewrite"""
+        if not state['snapshot_at'] or not os.path.exists(self.snapshot_path):
+            return True
+        if state['pending_changes'] >= Config.EXPORT_COMPACT_EVERY:
+            return True
+        snapshot_age = datetime.now() - datetime.fromisoformat(state['snapshot_at'])
+        return state['pending_changes'] > 0 and snapshot_age >= timedelta(hours=Config.EXPORT_COMPACT_INTERVAL_HOURS)
+
+    def compact(self):
+        """Rewrite the full snapshot and truncate the change log; returns the snapshot row count"""
+        with export_lock(self.state_path):
+            return self._compact(self.load_state())
+
+    def _compact(self, state):
+        count = self.exporter.export(self.snapshot_path, 'json')
+
+        with atomic_write(self.changes_path, 'w', encoding='utf-8'):
+            pass
+
+        state['pending_changes'] = 0
+        state['snapshot_at'] = datetime.now().isoformat()
+        self.save_state(state)
+        return count
+
+    def run(self, force_compact=False):
+        """Export new changes, compacting when due (or forced). Returns (changes_written, snapshot_rows or None)"""
+        with export_lock(self.state_path):
+            state = self.load_state()
+            changes = self._export_changes(state)
+
+            snapshot_rows = None
+            if force_compact or self.needs_compaction(state):
+                snapshot_rows = self._compact(state)
+
+        return changes, snapshot_rows
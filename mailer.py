@@ -0,0 +1,140 @@
+"""
+Pooled SMTP delivery for ScholarSift notifications.
+
+Authenticated connections are reused across many messages instead of doing a
+connect/STARTTLS/login/quit cycle per recipient. A connection is retired after
+SMTP_MAX_MESSAGES_PER_CONNECTION messages, and dropped connections are
+replaced transparently.
+"""
+
+import queue
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from config import Config
+
+def is_connection_error(error):
+    """True if the error means the connection itself is unusable and should be replaced.
+
+    smtplib.SMTPException subclasses OSError, so protocol-level replies such as a
+    refused recipient are excluded unless they signal a disconnect.
+    """
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+class SMTPConnectionPool:
+    """Thread-safe pool of authenticated SMTP connections"""
+
+    def __init__(self, host=None, port=None, username=None, password=None, use_tls=None,
+                 size=None, max_messages_per_connection=None, timeout=30):
+        self.host = host or Config.SMTP_SERVER
+        self.port = port or Config.SMTP_PORT
+        self.username = username if username is not None else Config.SMTP_USERNAME
+        self.password = password if password is not None else Config.SMTP_PASSWORD
+        self.use_tls = Config.SMTP_USE_TLS if use_tls is None else use_tls
+        self.size = size or Config.SMTP_POOL_SIZE
+        self.max_messages_per_connection = max_messages_per_connection or Config.SMTP_MAX_MESSAGES_PER_CONNECTION
+        self.timeout = timeout
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._sent_counts = {}
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Open, secure and authenticate a new SMTP connection"""
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except BaseException:
+            server.close()
+            raise
+        return server
+
+    def _discard(self, server):
+        with self._lock:
+            self._sent_counts.pop(id(server), None)
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _release(self, server):
+        """Return a healthy connection to the pool, retiring it at its message limit"""
+        with self._lock:
+            self._sent_counts[id(server)] += 1
+            exhausted = self._sent_counts[id(server)] >= self.max_messages_per_connection
+        if exhausted:
+            self._discard(server)
+        else:
+            self._idle.put(server)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; broken connections are discarded instead of returned"""
+        self._slots.acquire()
+        try:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                server = self._connect()
+                with self._lock:
+                    self._sent_counts[id(server)] = 0
+
+            try:
+                yield server
+            except smtplib.SMTPException as e:
+                if is_connection_error(e):
+                    self._discard(server)
+                else:
+                    self._release(server)
+                raise
+            except BaseException:
+                self._discard(server)
+                raise
+            else:
+                self._release(server)
+        finally:
+            self._slots.release()
+
+    def send(self, msg, retries=1):
+        """Send one email.message.Message, reconnecting on a dropped connection"""
+        sender = msg['From'] or self.username
+        for attempt in range(retries + 1):
+            try:
+                with self.connection() as server:
+                    server.sendmail(sender, msg['To'], msg.as_string())
+                return True
+            except Exception as e:
+                if attempt == retries or not is_connection_error(e):
+                    raise
+
+    def send_many(self, messages):
+        """Send messages across up to `size` parallel connections.
+
+        Returns a list of (msg, error) pairs in input order; error is None on success.
+        """
+        def deliver(msg):
+            try:
+                self.send(msg)
+                return msg, None
+            except Exception as e:
+                return msg, e
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(deliver, messages))
+
+    def close(self):
+        """Close all idle connections"""
+        while True:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(server)
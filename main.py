@@ -2,6 +2,10 @@
 """
 ScholarSift - Smart Scholarship Scraper
 Main entry point for the scholarship scraping system
+
+Each command imports only what it uses: the scraping stack (Playwright,
+BeautifulSoup, fake_useragent) is loaded the first time a command needs the
+scraper, so --export, --migrate and --help start quickly.
 """
 
 import asyncio
@@ -9,92 +13,306 @@ import argparse
 import sys
 from datetime import datetime
 
-from scraper import ScholarshipScraper
 from database import DatabaseManager
+from exporter import ScholarshipExporter, IncrementalExporter, EXPORT_FORMATS
+from profiling import profiled, PROFILE_MODES
 from config import Config
 
 class ScholarSift:
-    def __init__(self):
-        self.scraper = ScholarshipScraper()
+    def __init__(self, profile_mode=None):
         self.db = DatabaseManager()
+        self.profile_mode = profile_mode  # daemon: profile each scrape run
+        self._scraper = None
+
+    @property
+    def scraper(self):
+        """ScholarshipScraper sharing this app's database, created on first use"""
+        if self._scraper is None:
+            from scraper import ScholarshipScraper
+            self._scraper = ScholarshipScraper(self.db)
+        return self._scraper
 
-    async def scrape_scholarships(self, urls=None, discovery_mode=False):
+    async def scrape_scholarships(self, urls=None, discovery_mode=False, force=False):
         """Main scraping function"""
         print("🚀 Starting ScholarSift scraping...")
 
+        if discovery_mode:
+            return await self.discover_scholarships(urls)
+
         if urls is None:
             urls = Config.SEED_SOURCES
+            if not force:
+                # Only crawl seed sources whose adaptive revisit interval has elapsed
+                due = self.scraper.recrawl.due_sources(urls)
+                print(f"🗓️  {len(due)}/{len(urls)} sources due for recrawl")
+                urls = due
 
-        if discovery_mode:
-            print("🔍 Discovery mode enabled - finding new sources...")
-            # This would be implemented in a future enhancement
-            urls = Config.SEED_SOURCES
+        if not urls:
+            print("ℹ️  No sources due for recrawl")
+            return 0
 
         print(f"📋 Scraping {len(urls)} sources...")
-        scholarships = await self.scraper.scrape_multiple_urls(urls)
+        found, saved_count = await self.scraper.scrape_and_save(urls)
+        self.scraper.finish_run()
 
-        if scholarships:
-            print(f"✅ Found {len(scholarships)} potential scholarships")
-            saved_count = self.scraper.save_scholarships(scholarships)
+        if found:
+            print(f"✅ Found {found} potential scholarships")
             print(f"💾 Saved {saved_count} scholarships to database")
 
-            # Export to JSON
-            export_count = self.db.export_to_json('data/scholarships.json')
-            print(f"📄 Exported {export_count} scholarships to JSON")
+            # Export only what changed since the last run
+            changes, snapshot_rows = IncrementalExporter(self.db).run()
+            print(f"📄 Exported {changes} changed scholarships to data/scholarships.changes.ndjson")
+            if snapshot_rows is not None:
+                print(f"📄 Compacted snapshot: {snapshot_rows} scholarships in data/scholarships.json")
 
             return saved_count
         else:
             print("❌ No scholarships found")
             return 0
 
+    async def discover_scholarships(self, seeds):
+        """Crawl outward from the seed sources, saving scholarships as pages are fetched"""
+        from discovery import DiscoveryCrawler
+        from writer import BatchWriter
+
+        print("🔍 Discovery mode enabled - finding new sources...")
+        crawler = DiscoveryCrawler(self.scraper)
+        writer = BatchWriter(self.scraper.save_scholarships)
+
+        try:
+            async for url, scholarships in crawler.crawl(seeds or Config.SEED_SOURCES):
+                await writer.submit(scholarships)
+        finally:
+            saved_count = await writer.aclose()
+
+        print(f"🕸️  Crawled {crawler.pages_fetched} pages, {len(crawler.frontier)} links left in frontier")
+        for domain, count in sorted(crawler.discovered_sources.items(), key=lambda item: -item[1]):
+            print(f"   🌐 {domain}: {count} scholarships")
+        print(f"💾 Saved {saved_count} scholarships to database")
+
+        if saved_count:
+            changes, snapshot_rows = IncrementalExporter(self.db).run()
+            print(f"📄 Exported {changes} changed scholarships to data/scholarships.changes.ndjson")
+            if snapshot_rows is not None:
+                print(f"📄 Compacted snapshot: {snapshot_rows} scholarships in data/scholarships.json")
+        return saved_count
+
+    def summarize_backfill(self, summarizer, batch_size=None):
+        """Summarize up to batch_size scholarships that have no summary yet"""
+        rows = self.db.get_unsummarized_scholarships(batch_size or Config.SUMMARIZE_BATCH_SIZE)
+        summaries = {
+            scholarship_id: summarizer.summarize_scholarship(description)
+            for scholarship_id, description in rows
+        }
+        updated = self.db.update_summaries({k: v for k, v in summaries.items() if v})
+        print(f"📝 Summarized {updated} scholarships")
+        return updated
+
+    def expire_scholarships(self):
+        """Deactivate expired and long-unseen scholarships, then rewrite the export snapshot without them"""
+        expired = self.db.deactivate_expired()
+        print(f"🗑️  Deactivated {expired} expired scholarships")
+        if expired:
+            # Deactivation doesn't touch scraped_at, so only a fresh snapshot drops them. run() advances
+            # the watermark past rows the snapshot will include, under the lock the scrape job's export takes
+            _, snapshot_rows = IncrementalExporter(self.db).run(force_compact=True)
+            print(f"📄 Compacted snapshot: {snapshot_rows} scholarships in data/scholarships.json")
+        return expired
+
+    async def scrape_job(self):
+        """Daemon scrape run, profiled when the daemon was started with --profile"""
+        if not self.profile_mode:
+            return await self.scrape_scholarships()
+        with profiled('scrape', self.profile_mode):
+            return await self.scrape_scholarships()
+
+    async def run_daemon(self):
+        """Run scrape, summarization and notification jobs on their intervals in one resident process"""
+        from scheduler import Scheduler
+        from metrics import registry
+
+        # Refresh the metrics textfile after every job; the dashboard process serves its own at /metrics
+        scheduler = Scheduler(after_job=registry.write_textfile)
+        loop = asyncio.get_running_loop()
+
+        scheduler.add_job('scrape', Config.SCRAPE_INTERVAL_MINUTES * 60, self.scrape_job)
+        scheduler.add_job('expire', Config.EXPIRE_INTERVAL_MINUTES * 60,
+                          lambda: loop.run_in_executor(None, self.expire_scholarships))
+
+        try:
+            from summarizer import ScholarshipSummarizer
+            summarizer = ScholarshipSummarizer()
+            scheduler.add_job(
+                'summarize', Config.SUMMARIZE_INTERVAL_MINUTES * 60,
+                lambda: loop.run_in_executor(None, self.summarize_backfill, summarizer)
+            )
+        except ImportError as e:
+            print(f"⚠️  Summarization job disabled: {e}")
+
+        try:
+            from notifications import NotificationManager
+            notifications = NotificationManager()
+            scheduler.add_job('urgent-notifications', Config.URGENT_NOTIFY_INTERVAL_MINUTES * 60,
+                              notifications.send_urgent_notifications)
+            scheduler.add_job('weekly-digest', Config.WEEKLY_DIGEST_INTERVAL_MINUTES * 60,
+                              notifications.send_weekly_digest, run_immediately=False)
+        except ImportError as e:
+            print(f"⚠️  Notification jobs disabled: {e}")
+
+        try:
+            await scheduler.run_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Shut down the scraper's shared browser, if one was launched"""
+        if self._scraper is not None:
+            await self._scraper.close()
+
     def get_scholarships(self, filters=None):
         """Retrieve scholarships with filters"""
         return self.db.get_scholarships(filters)
 
-    def export_data(self, format='json', filters=None):
+    def reextract_archive(self, workers=None):
+        """Run the current parsers over the newest archived copy of every page and upsert the results"""
+        from concurrent.futures import ProcessPoolExecutor
+        from itertools import islice
+        from archive import PageArchive
+        from scraper import init_reextract_worker, reextract_archived_page
+
+        print("♻️  Re-extracting scholarships from the page archive...")
+        pages = PageArchive(self.db).iter_latest()
+        detail_urls = self.db.get_archived_urls('detail')
+        page_count = inserted = updated = 0
+
+        with ProcessPoolExecutor(max_workers=workers or Config.REEXTRACT_WORKERS or None,
+                                 initializer=init_reextract_worker) as pool:
+            # Bounded rounds keep at most REEXTRACT_CHUNK_SIZE pages of HTML in memory
+            while True:
+                chunk = list(islice(pages, Config.REEXTRACT_CHUNK_SIZE))
+                if not chunk:
+                    break
+
+                scholarships = []
+                for kind, url, found, detail_links in pool.map(reextract_archived_page, chunk, chunksize=8):
+                    if kind == 'listing' and detail_urls.intersection(detail_links):
+                        continue  # previews of archived detail pages
+                    scholarships.extend(found)
+
+                added, changed = self.db.upsert_scholarships(scholarships)
+                page_count += len(chunk)
+                inserted += added
+                updated += changed
+                print(f"   {page_count} pages: {inserted} new, {updated} updated")
+
+        print(f"✅ Re-extracted {page_count} archived pages: {inserted} new, {updated} updated scholarships")
+        if inserted or updated:
+            # In-place updates keep their scraped_at, so only a snapshot carries them
+            changes, snapshot_rows = IncrementalExporter(self.db).run(force_compact=bool(updated))
+            print(f"📄 Exported {changes} changed scholarships to data/scholarships.changes.ndjson")
+            if snapshot_rows is not None:
+                print(f"📄 Compacted snapshot: {snapshot_rows} scholarships in data/scholarships.json")
+        return inserted + updated
+
+    def export_data(self, format='json', filters=None, output=None):
         """Export scholarship data"""
-        if format.lower() == 'json':
-            count = self.db.export_to_json('data/scholarships.json', filters)
-            print(f"📄 Exported {count} scholarships to JSON")
-        else:
-            print("❌ Unsupported export format")
+        exporter = ScholarshipExporter(self.db)
+        output = output or exporter.default_path(format.lower())
+
+        try:
+            count = exporter.export(output, format, filters)
+            print(f"📄 Exported {count} scholarships to {output}")
+        except (ValueError, RuntimeError) as e:
+            print(f"❌ {e}")
 
 async def main():
     parser = argparse.ArgumentParser(description='ScholarSift - Smart Scholarship Scraper')
     parser.add_argument('--scrape', action='store_true', help='Scrape scholarships from sources')
     parser.add_argument('--urls', nargs='*', help='Specific URLs to scrape')
     parser.add_argument('--discovery', action='store_true', help='Enable discovery mode')
-    parser.add_argument('--export', choices=['json', 'csv'], help='Export data')
+    parser.add_argument('--force', action='store_true', help='Crawl all seed sources, even those not due for recrawl')
+    parser.add_argument('--export', choices=EXPORT_FORMATS, help='Export data')
+    parser.add_argument('--output', help='Export file path (default: data/scholarships.<format>)')
     parser.add_argument('--filter-country', help='Filter by country')
     parser.add_argument('--filter-degree', choices=['undergraduate', 'masters', 'phd'], help='Filter by degree level')
     parser.add_argument('--filter-gpa', type=float, help='Minimum GPA requirement')
+    parser.add_argument('--outbox-worker', action='store_true', help='Run a worker that delivers queued notifications')
+    parser.add_argument('--daemon', action='store_true', help='Run scrape, summarize and notification jobs on a schedule')
+    parser.add_argument('--reextract', action='store_true', help='Re-run extraction over archived pages without refetching')
+    parser.add_argument('--workers', type=int, help='Worker processes for --reextract (default: one per CPU)')
+    parser.add_argument('--migrate', action='store_true', help='Create missing tables and indexes, then exit')
+    parser.add_argument('--expire', action='store_true', help='Deactivate scholarships past their deadline or no longer seen')
 
-    args = parser.parse_args()
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_MODES,
+                        help='Profile this run: cprofile (main thread, .pstats) or sample (all threads, collapsed stacks)')
 
-    app = ScholarSift()
+    args = parser.parse_args()
 
-    if args.scrape:
-        saved = await app.scrape_scholarships(args.urls, args.discovery)
-        if saved > 0:
-            print(f"\n🎉 Successfully scraped and saved {saved} scholarships!")
-        else:
-            print("\n⚠️  No new scholarships were found or saved.")
+    command = next((name for name, _ in COMMANDS if getattr(args, name)), None)
+    if command is None:
+        parser.print_help()
         return
 
-    if args.export:
-        filters = {}
-        if args.filter_country:
-            filters['country'] = args.filter_country
-        if args.filter_degree:
-            filters['degree_level'] = args.filter_degree
-        if args.filter_gpa:
-            filters['gpa_min'] = args.filter_gpa
+    handler = dict(COMMANDS)[command]
+    if args.profile and command != 'daemon':
+        with profiled(command, args.profile):
+            await handler(args)
+    else:
+        await handler(args)
 
-        app.export_data(args.export, filters)
-        return
+async def run_migrate(args):
+    from database import get_engine, migrate
+    migrate(get_engine())
+    print(f"✅ Database schema is up to date ({Config.DATABASE_URL})")
+
+async def run_outbox_worker(args):
+    from notifications import NotificationManager
+    await NotificationManager().run_outbox_worker()
+
+async def run_daemon(args):
+    await ScholarSift(profile_mode=args.profile).run_daemon()
+
+async def run_expire(args):
+    ScholarSift().expire_scholarships()
+
+async def run_reextract(args):
+    ScholarSift().reextract_archive(args.workers)
+
+async def run_scrape(args):
+    app = ScholarSift()
+    try:
+        saved = await app.scrape_scholarships(args.urls, args.discovery, args.force)
+    finally:
+        await app.close()
+    if saved > 0:
+        print(f"\n🎉 Successfully scraped and saved {saved} scholarships!")
+    else:
+        print("\n⚠️  No new scholarships were found or saved.")
+
+async def run_export(args):
+    filters = {}
+    if args.filter_country:
+        filters['country'] = args.filter_country
+    if args.filter_degree:
+        filters['degree_level'] = args.filter_degree
+    if args.filter_gpa:
+        filters['gpa_min'] = args.filter_gpa
+
+    ScholarSift().export_data(args.export, filters, args.output)
 
-    # Default: show help
-    parser.print_help()
+# Command flag -> handler, checked in order; the first flag given wins
+COMMANDS = (
+    ('migrate', run_migrate),
+    ('outbox_worker', run_outbox_worker),
+    ('daemon', run_daemon),
+    ('expire', run_expire),
+    ('reextract', run_reextract),
+    ('scrape', run_scrape),
+    ('export', run_export),
+)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
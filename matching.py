@@ -0,0 +1,162 @@
+"""
+Subscriber preference matching for personalised digests.
+
+Preferences are parsed once into a compact, hashable SubscriberPreferences
+tuple. Subscribers with identical preferences form a segment that is matched
+once. Matching intersects bitmasks from an inverted index over the candidate
+scholarships (one bitmask per facet value), so cost grows with the number of
+distinct segments, not subscribers x scholarships.
+"""
+
+import json
+from bisect import bisect_right
+from collections import namedtuple, OrderedDict
+from functools import lru_cache
+
+from config import Config
+
+class SubscriberPreferences(namedtuple('SubscriberPreferences', [
+        'weekly', 'urgent', 'custom', 'countries', 'degree_levels', 'funding_types', 'gpa'])):
+    """Normalized subscriber preferences; doubles as the segment key"""
+    __slots__ = ()
+
+    @property
+    def is_unfiltered(self):
+        """True when this segment receives every candidate scholarship"""
+        return not self.custom or not (self.countries or self.degree_levels or self.funding_types or self.gpa is not None)
+
+def _facet_values(preferences, plural, singular):
+    """Read a facet as a frozenset of lowercase strings from list or scalar keys"""
+    values = preferences.get(plural, preferences.get(singular))
+    if not values:
+        return frozenset()
+    if isinstance(values, str):
+        values = [values]
+    return frozenset(str(value).strip().lower() for value in values if str(value).strip())
+
+@lru_cache(maxsize=Config.PREFERENCE_CACHE_SIZE)
+def parse_preferences(raw):
+    """Parse a subscription's preferences JSON (memoized per distinct string)"""
+    try:
+        preferences = json.loads(raw or '{}')
+    except ValueError:
+        preferences = {}
+    if not isinstance(preferences, dict):
+        preferences = {}
+
+    try:
+        gpa = float(preferences['gpa']) if preferences.get('gpa') not in (None, '') else None
+    except (TypeError, ValueError):
+        gpa = None
+
+    return SubscriberPreferences(
+        weekly=bool(preferences.get('weekly', True)),
+        urgent=bool(preferences.get('urgent', True)),
+        custom=bool(preferences.get('custom', True)),
+        countries=_facet_values(preferences, 'countries', 'country'),
+        degree_levels=_facet_values(preferences, 'degree_levels', 'degree_level'),
+        funding_types=_facet_values(preferences, 'funding_types', 'funding_type'),
+        gpa=gpa,
+    )
+
+class PreferenceMatcher:
+    """Inverted facet index over a candidate set of scholarships.
+
+    Each facet value maps to an int bitmask of candidate positions, so a
+    segment's matches are the AND of the OR-ed masks of its wanted values.
+    """
+
+    # Scholarship degree levels that satisfy any degree preference
+    WILDCARD_DEGREES = ('any',)
+
+    def __init__(self, scholarships):
+        self.scholarships = list(scholarships)
+        self.all_mask = (1 << len(self.scholarships)) - 1
+        self.index = {'countries': {}, 'degree_levels': {}, 'funding_types': {}}
+
+        gpa_bits = []
+        self.no_gpa_mask = 0
+        for position, scholarship in enumerate(self.scholarships):
+            bit = 1 << position
+            self._add(self.index['countries'], scholarship.country, bit)
+            self._add(self.index['degree_levels'], scholarship.degree_level, bit)
+            self._add(self.index['funding_types'], scholarship.funding_type, bit)
+            if scholarship.gpa_requirement is None:
+                self.no_gpa_mask |= bit
+            else:
+                gpa_bits.append((scholarship.gpa_requirement, bit))
+
+        # Prefix masks over GPA requirements: _gpa_masks[i] covers the i smallest requirements
+        gpa_bits.sort(key=lambda item: item[0])
+        self._gpa_thresholds = [gpa for gpa, _ in gpa_bits]
+        self._gpa_masks = [0]
+        for _, bit in gpa_bits:
+            self._gpa_masks.append(self._gpa_masks[-1] | bit)
+
+    @staticmethod
+    def _add(facet_index, value, bit):
+        if value:
+            key = value.strip().lower()
+            facet_index[key] = facet_index.get(key, 0) | bit
+
+    def _facet_mask(self, facet, wanted):
+        facet_index = self.index[facet]
+        mask = 0
+        for value in wanted:
+            mask |= facet_index.get(value, 0)
+        if facet == 'degree_levels':
+            for value in self.WILDCARD_DEGREES:
+                mask |= facet_index.get(value, 0)
+        return mask
+
+    def match_mask(self, preferences):
+        """Bitmask of candidates matching one preference segment"""
+        if preferences.is_unfiltered:
+            return self.all_mask
+
+        mask = self.all_mask
+        for facet in ('countries', 'degree_levels', 'funding_types'):
+            wanted = getattr(preferences, facet)
+            if wanted:
+                mask &= self._facet_mask(facet, wanted)
+                if not mask:
+                    return 0
+
+        if preferences.gpa is not None:
+            eligible = self._gpa_masks[bisect_right(self._gpa_thresholds, preferences.gpa)]
+            mask &= eligible | self.no_gpa_mask
+
+        return mask
+
+    def scholarships_for(self, mask):
+        """Candidates selected by a bitmask, in original order"""
+        selected = []
+        while mask:
+            low_bit = mask & -mask
+            selected.append(self.scholarships[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return selected
+
+    def match(self, preferences):
+        return self.scholarships_for(self.match_mask(preferences))
+
+    def match_segments(self, subscriptions, flag=None):
+        """Group subscriptions by preferences and match each segment once.
+
+        `flag` ('weekly' or 'urgent') drops subscribers who opted out. Returns an
+        OrderedDict of preferences -> (subscriptions, matched scholarships),
+        omitting segments with no matches.
+        """
+        segments = OrderedDict()
+        for subscription in subscriptions:
+            preferences = parse_preferences(subscription.preferences)
+            if flag and not getattr(preferences, flag):
+                continue
+            segments.setdefault(preferences, []).append(subscription)
+
+        matched = OrderedDict()
+        for preferences, members in segments.items():
+            scholarships = self.match(preferences)
+            if scholarships:
+                matched[preferences] = (members, scholarships)
+        return matched
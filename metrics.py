@@ -0,0 +1,215 @@
+"""
+In-process metrics for ScholarSift: counters, gauges, histograms and timing spans.
+
+Metrics live in a thread-safe registry and render in the Prometheus text
+exposition format. The dashboard serves its registry at /metrics. Batch
+processes (CLI scrapes and the daemon) also write theirs to
+METRICS_TEXTFILE after each run, for a node_exporter textfile collector or
+for reading directly.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from config import Config
+
+# Seconds; spans stage work from sub-millisecond parses to minute-long crawls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def _format_value(value):
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Counter:
+    """Monotonic count per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, lock):
+        self.name = name
+        self.help = help_text
+        self.lock = lock
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self.values.get(_label_key(labels), 0)
+
+    def render(self):
+        return [f'{self.name}{_format_labels(key)} {_format_value(value)}'
+                for key, value in sorted(self.values.items())]
+
+class Gauge:
+    """Last value set per label set"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, lock):
+        self.name = name
+        self.help = help_text
+        self.lock = lock
+        self.values = {}
+
+    def set(self, value, **labels):
+        with self.lock:
+            self.values[_label_key(labels)] = value
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+
+    def render(self):
+        return [f'{self.name}{_format_labels(key)} {_format_value(value)}'
+                for key, value in sorted(self.values.items())]
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label set"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, lock, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.lock = lock
+        self.buckets = tuple(buckets)
+        self.values = {}  # label key -> [bucket counts..., sum, count]
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            state = self.values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels):
+        state = self.values.get(_label_key(labels))
+        return state[-1] if state else 0
+
+    def render(self):
+        lines = []
+        for key, state in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, state):
+                lines.append(f'{self.name}_bucket{_format_labels(key, [("le", bound)])} {count}')
+            lines.append(f'{self.name}_bucket{_format_labels(key, [("le", "+Inf")])} {state[-1]}')
+            lines.append(f'{self.name}_sum{_format_labels(key)} {_format_value(state[-2])}')
+            lines.append(f'{self.name}_count{_format_labels(key)} {state[-1]}')
+        return lines
+
+class MetricsRegistry:
+    """Named metrics; get-or-create so modules can declare them independently"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+
+    def _get(self, cls, name, help_text, **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, help_text, self.lock, **kwargs)
+            return metric
+
+    def counter(self, name, help_text=''):
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name, help_text=''):
+        return self._get(Gauge, name, help_text)
+
+    def histogram(self, name, help_text='', buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    def render(self):
+        """Prometheus text exposition of every metric"""
+        lines = []
+        with self.lock:
+            for name, metric in sorted(self.metrics.items()):
+                lines.append(f'# HELP {name} {metric.help}')
+                lines.append(f'# TYPE {name} {metric.kind}')
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path=None):
+        """Atomically write the exposition to path (default METRICS_TEXTFILE)"""
+        path = path or Config.METRICS_TEXTFILE
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+registry = MetricsRegistry()
+
+stage_seconds = registry.histogram('scholarsift_stage_seconds', 'Time spent per pipeline stage')
+stage_errors = registry.counter('scholarsift_stage_errors_total', 'Stage executions that raised')
+
+@contextmanager
+def span(stage, **labels):
+    """Time a block into scholarsift_stage_seconds{stage=...}; count it as an error if it raises.
+
+    Yields a dict the block may fill with extra results; 'seconds' is set on exit.
+    """
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    except Exception:
+        stage_errors.inc(stage=stage, **labels)
+        raise
+    finally:
+        result['seconds'] = time.perf_counter() - start
+        stage_seconds.observe(result['seconds'], stage=stage, **labels)
+
+# Per-source counters persisted to crawl_source_stats
+SOURCE_STAT_FIELDS = (
+    'pages', 'bytes', 'fetch_seconds', 'robots_seconds', 'parse_seconds',
+    'items_extracted', 'items_saved', 'errors'
+)
+
+class CrawlRunStats:
+    """Accumulates per-source stage timings and counts for one crawl run"""
+
+    def __init__(self):
+        self.started_at = datetime.utcnow()
+        self.save_seconds = 0.0
+        self.sources = {}
+
+    def source(self, source_url):
+        """Mutable stats dict for source_url, created on first use"""
+        if source_url not in self.sources:
+            self.sources[source_url] = dict.fromkeys(SOURCE_STAT_FIELDS, 0)
+            self.sources[source_url]['last_error'] = None
+        return self.sources[source_url]
+
+    def to_records(self):
+        """(run dict, [source dicts]) ready for DatabaseManager.save_crawl_run"""
+        finished_at = datetime.utcnow()
+        sources = [dict(stats, source_url=url) for url, stats in self.sources.items()]
+        run = {
+            'started_at': self.started_at,
+            'finished_at': finished_at,
+            'duration_seconds': (finished_at - self.started_at).total_seconds(),
+            'save_seconds': self.save_seconds,
+            'sources': len(sources),
+        }
+        for field in ('pages', 'bytes', 'items_extracted', 'items_saved', 'errors'):
+            run[field] = sum(source[field] for source in sources)
+        return run, sources
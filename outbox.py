@@ -0,0 +1,154 @@
+"""
+Durable notification outbox for ScholarSift.
+
+Digest runs enqueue one outbox row per subscriber channel, each with an
+idempotency key, and rendered bodies are stored once per unique payload.
+An OutboxWorker claims rows in batches and delivers them through the
+DeliveryEngine. Each outcome is recorded as soon as its delivery finishes, and
+the worker renews its lease while the batch is in flight. Failed rows wait out
+an exponential backoff before they are claimed again. If a run or worker
+crashes, restarting it resumes from what is still pending:
+- re-running a digest never enqueues the same key twice
+- rows already marked sent are never claimed again
+- only deliveries that were in flight at the crash are reclaimed, once the
+  lease expires
+- a worker whose lease was taken over cannot overwrite the new owner's results
+"""
+
+import asyncio
+import hashlib
+import uuid
+from datetime import datetime, timedelta
+
+from config import Config
+from delivery import Delivery, DeliveryEngine
+
+def payload_id(subject, content):
+    """Content hash used to store each distinct rendered body once"""
+    digest = hashlib.sha256()
+    digest.update((subject or '').encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(content.encode('utf-8'))
+    return digest.hexdigest()
+
+def enqueue_deliveries(db, kind, period, pairs):
+    """Enqueue (subscription_id, Delivery) pairs for one digest run.
+
+    kind/period (e.g. 'weekly', '2024-W42') form the idempotency key together
+    with the subscription and channel. Returns the number of newly queued rows.
+    """
+    payloads = {}
+    entries = []
+    for subscription_id, delivery in pairs:
+        key = payload_id(delivery.subject, delivery.content)
+        payloads.setdefault(key, {'id': key, 'subject': delivery.subject, 'content': delivery.content})
+        entries.append({
+            'idempotency_key': f'{kind}:{period}:{subscription_id}:{delivery.channel}',
+            'subscription_id': subscription_id,
+            'channel': delivery.channel,
+            'recipient': delivery.recipient,
+            'payload_id': key,
+            'status': 'pending',
+            'attempts': 0,
+            'created_at': datetime.utcnow(),
+        })
+
+    return db.enqueue_notifications(list(payloads.values()), entries)
+
+class OutboxWorker:
+    """Drains the notification outbox in batches"""
+
+    def __init__(self, db, delivery_engine, batch_size=None, lease_seconds=None, max_attempts=None, retry_backoff=None):
+        self.db = db
+        self.delivery = delivery_engine
+        self.batch_size = batch_size or Config.OUTBOX_BATCH_SIZE
+        self.lease_seconds = lease_seconds or Config.OUTBOX_LEASE_SECONDS
+        self.max_attempts = max_attempts or Config.OUTBOX_MAX_ATTEMPTS
+        self.retry_backoff = Config.OUTBOX_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        self.worker_id = uuid.uuid4().hex
+
+    def retry_at(self, attempts, now):
+        """When a row that failed on its `attempts`-th try may be claimed again"""
+        return now + timedelta(seconds=self.retry_backoff * 2 ** (attempts - 1))
+
+    async def drain_once(self):
+        """Claim and deliver one batch. Returns per-channel sent counts, or None when idle"""
+        claim_token = f'{self.worker_id}:{uuid.uuid4().hex[:8]}'
+        lease_expired_before = datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+        rows = self.db.claim_outbox_batch(claim_token, self.batch_size, lease_expired_before)
+        if not rows:
+            return None
+
+        deliveries = [Delivery(row.channel, row.recipient, row.subject, row.content) for row in rows]
+        outcomes = []  # (row, error) pairs not yet written
+        lock = asyncio.Lock()
+
+        async def record(index, delivery, error):
+            outcomes.append((rows[index], error))
+            # Outcomes that finish while a write is in flight go out together in the next one
+            async with lock:
+                await self._record(claim_token, outcomes)
+
+        renewal = asyncio.create_task(self._renew_lease(claim_token))
+        try:
+            results = await self.delivery.deliver(deliveries, on_result=record)
+        finally:
+            renewal.cancel()
+
+        async with lock:
+            await self._record(claim_token, outcomes, retry_later=False)
+        return DeliveryEngine.count_sent(results)
+
+    async def _record(self, claim_token, outcomes, retry_later=True):
+        """Write and clear the pending outcomes. With retry_later, a failed write leaves them for the next call"""
+        if not outcomes:
+            return
+        batch = outcomes[:]
+        del outcomes[:]
+
+        now = datetime.utcnow()
+        sent = [(row.id, row.subscription_id) for row, error in batch if error is None]
+        failed = [(row.id, error, self.retry_at(row.attempts, now)) for row, error in batch if error is not None]
+        try:
+            updated = await asyncio.to_thread(self.db.complete_outbox_batch, claim_token, sent, failed, self.max_attempts)
+        except Exception as e:
+            if not retry_later:
+                raise
+            print(f"⚠️  Could not record {len(batch)} outbox results yet: {e}")
+            outcomes[:0] = batch
+            return
+
+        if updated < len(batch):
+            print(f"⚠️  {len(batch) - updated} outbox rows were reclaimed by another worker before their results were recorded")
+
+    async def _renew_lease(self, claim_token):
+        """Keep the claim alive while deliveries are still running"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await asyncio.to_thread(self.db.renew_outbox_lease, claim_token)
+            except Exception as e:
+                print(f"⚠️  Could not renew outbox lease: {e}")
+
+    async def drain(self, max_batches=None):
+        """Deliver until the outbox is empty (or max_batches). Returns per-channel sent counts"""
+        totals = {'email': 0, 'telegram': 0}
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            counts = await self.drain_once()
+            if counts is None:
+                break
+            for channel, count in counts.items():
+                totals[channel] += count
+            batches += 1
+        return totals
+
+    async def run_forever(self, poll_interval=None):
+        """Long-running worker loop for a dedicated notification process"""
+        poll_interval = poll_interval or Config.OUTBOX_POLL_INTERVAL
+        print(f"📬 Outbox worker {self.worker_id[:8]} started")
+        while True:
+            counts = await self.drain()
+            if counts['email'] or counts['telegram']:
+                print(f"📬 Delivered {counts['email']} emails, {counts['telegram']} Telegram messages")
+            await asyncio.sleep(poll_interval)
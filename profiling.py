@@ -0,0 +1,192 @@
+"""
+Profiling helpers for ScholarSift.
+
+Two modes:
+- cprofile: deterministic cProfile of the calling thread, saved as a .pstats
+  file (snakeviz, pstats, gprof2dot).
+- sample: a background thread snapshots stacks every PROFILE_SAMPLE_INTERVAL_MS
+  and saves them as collapsed stacks (.collapsed), ready for flamegraph.pl or
+  speedscope. Overhead is bounded by the interval, so it is the mode to leave
+  on in production at a low request sample rate.
+
+Each saved profile gets a .txt summary of the top functions next to it.
+Old profiles beyond PROFILE_MAX_FILES are pruned.
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import count
+
+from config import Config
+
+PROFILE_MODES = ['cprofile', 'sample']
+
+_sequence = count()
+
+class StackSampler:
+    """Wall-clock sampling profiler over one thread, or all threads but its own"""
+
+    def __init__(self, interval=None, thread_id=None):
+        self.interval = interval or Config.PROFILE_SAMPLE_INTERVAL_MS / 1000
+        self.thread_id = thread_id
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if self.thread_id is not None:
+                frames = {self.thread_id: frames[self.thread_id]} if self.thread_id in frames else {}
+                names = {}
+            else:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for ident, frame in frames.items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                if self.thread_id is None:
+                    stack.append(names.get(ident, f'thread-{ident}'))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_collapsed(self, path):
+        """Brendan Gregg collapsed-stack format: 'frame;frame;frame count' per line"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, samples in self.stacks.most_common():
+                f.write(f'{stack} {samples}\n')
+
+    def summary(self, limit=None):
+        """Top functions by self and inclusive share of samples"""
+        limit = limit or Config.PROFILE_TOP_N
+        total = sum(self.stacks.values())
+        if not total:
+            return 'No samples collected'
+
+        own, inclusive = Counter(), Counter()
+        for stack, samples in self.stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += samples
+            for frame in set(frames):
+                inclusive[frame] += samples
+
+        lines = [f'{self.samples} samples @ {self.interval * 1000:.0f}ms', '   self   total  function']
+        for frame, samples in own.most_common(limit):
+            lines.append(f'{samples / total:>6.1%} {inclusive[frame] / total:>7.1%}  {frame}')
+        return '\n'.join(lines)
+
+def pstats_summary(profiler, limit=None):
+    """Top functions by cumulative time from a cProfile.Profile"""
+    limit = limit or Config.PROFILE_TOP_N
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+
+    lines = [f'{stats.total_calls} calls in {stats.total_tt:.3f}s', '   calls    tottime    cumtime  function']
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in rows:
+        lines.append(f'{calls:>8} {tottime:>9.3f}s {cumtime:>9.3f}s  '
+                     f'{function} ({os.path.basename(filename)}:{line})')
+    return '\n'.join(lines)
+
+def prune_profiles(directory, keep=None):
+    """Delete the oldest profile files beyond `keep` (profile + summary count as one)"""
+    keep = keep or Config.PROFILE_MAX_FILES
+    profiles = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(('.pstats', '.collapsed'))),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in profiles[:max(0, len(profiles) - keep)]:
+        for path in (entry.path, os.path.splitext(entry.path)[0] + '.txt'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+class Profile:
+    """One profiling session: start(), stop(), then save() if it was worth keeping"""
+
+    def __init__(self, mode='cprofile', interval=None, thread_id=None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}; expected one of {PROFILE_MODES}")
+        self.mode = mode
+        self.profiler = cProfile.Profile() if mode == 'cprofile' else None
+        self.sampler = StackSampler(interval, thread_id) if mode == 'sample' else None
+        self.started_at = None
+        self.elapsed = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        if self.profiler:
+            self.profiler.enable()  # raises ValueError if another profiler is active on 3.12+
+        else:
+            self.sampler.start()
+        return self
+
+    def stop(self):
+        if self.profiler:
+            self.profiler.disable()
+        else:
+            self.sampler.stop()
+        self.elapsed = time.perf_counter() - self.started_at
+        return self.elapsed
+
+    def summary(self):
+        if self.profiler:
+            return pstats_summary(self.profiler)
+        return self.sampler.summary()
+
+    def save(self, name, output_dir=None):
+        """Write the profile and its summary; returns (profile path, summary text)"""
+        output_dir = output_dir or Config.PROFILE_DIR
+        os.makedirs(output_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        base = os.path.join(output_dir, f'{name}-{stamp}-{os.getpid()}-{next(_sequence)}')
+
+        if self.profiler:
+            path = base + '.pstats'
+            self.profiler.dump_stats(path)
+        else:
+            path = base + '.collapsed'
+            self.sampler.write_collapsed(path)
+
+        summary = f'{name}: {self.elapsed:.3f}s ({self.mode})\n{self.summary()}\n'
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(summary)
+
+        prune_profiles(output_dir)
+        return path, summary
+
+@contextmanager
+def profiled(name, mode='cprofile', output_dir=None, min_seconds=0):
+    """Profile a block and save it (with a printed summary) if it ran at least min_seconds"""
+    profile = Profile(mode).start()
+    try:
+        yield profile
+    finally:
+        elapsed = profile.stop()
+        if elapsed >= min_seconds:
+            path, summary = profile.save(name, output_dir)
+            print(f"🔬 Profile written to {path}")
+            print(summary.rstrip())
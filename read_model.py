@@ -0,0 +1,131 @@
+"""
+In-process read model for dashboard filtering.
+
+A columnar snapshot of the active scholarships is held in NumPy arrays:
+- categorical columns (country, degree level, funding type) become integer
+  codes plus one packed bitmap per distinct value
+- GPA and deadline become float arrays, with NaN where the value is missing
+
+Filters and facet counts are then vectorized bitwise operations instead of
+ilike scans. The snapshot is rebuilt when the database's data version
+changes. Without NumPy, NUMPY_AVAILABLE is False and callers keep using SQL.
+"""
+
+import threading
+from datetime import datetime
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Filterable with a case-insensitive substring match, like DatabaseManager._apply_filters
+CATEGORICAL_FIELDS = ('country', 'degree_level', 'funding_type')
+
+EPOCH = datetime(1970, 1, 1)
+
+def _seconds(value):
+    return (value - EPOCH).total_seconds() if value is not None else np.nan
+
+class ScholarshipSnapshot:
+    """Columnar view of the active scholarships at one data version"""
+
+    def __init__(self, version, rows, columns):
+        self.version = version
+        self.rows = rows
+        self.size = len(rows)
+        names = [column.key for column in columns]
+
+        self.values = {}  # field -> sorted distinct values; a value's code is its position
+        self.codes = {}
+        self.bitmaps = {}  # field -> [packed bitmap per code]
+        for field in CATEGORICAL_FIELDS:
+            index = names.index(field)
+            values = sorted({row[index] for row in rows if row[index]})
+            lookup = {value: code for code, value in enumerate(values)}
+            codes = np.fromiter((lookup.get(row[index], -1) for row in rows), dtype=np.int32, count=self.size)
+            self.values[field] = values
+            self.codes[field] = codes
+            self.bitmaps[field] = [np.packbits(codes == code) for code in range(len(values))]
+
+        gpa, deadline = names.index('gpa_requirement'), names.index('deadline')
+        self.gpa = np.array([row[gpa] if row[gpa] is not None else np.nan for row in rows], dtype=np.float64)
+        self.deadline = np.fromiter((_seconds(row[deadline]) for row in rows), dtype=np.float64, count=self.size)
+        self.all_rows = np.packbits(np.ones(self.size, dtype=bool))
+
+    def _substring_bitmap(self, field, query):
+        """OR of the bitmaps of every value containing query (case-insensitive)"""
+        query = str(query).lower()
+        bitmap = np.zeros_like(self.all_rows)
+        for code, value in enumerate(self.values[field]):
+            if query in value.lower():
+                bitmap |= self.bitmaps[field][code]
+        return bitmap
+
+    def match(self, filters, exclude=None):
+        """Packed bitmap of the rows matching filters, ignoring the filter on `exclude`"""
+        mask = self.all_rows.copy()
+        for field in CATEGORICAL_FIELDS:
+            if field != exclude and filters.get(field):
+                mask &= self._substring_bitmap(field, filters[field])
+
+        # NaN compares False, matching SQL's NULL handling
+        with np.errstate(invalid='ignore'):
+            if filters.get('gpa_min') is not None:
+                mask &= np.packbits(self.gpa >= filters['gpa_min'])
+            if filters.get('gpa_max') is not None:
+                mask &= np.packbits(self.gpa <= filters['gpa_max'])
+            if filters.get('deadline_before') is not None:
+                mask &= np.packbits(self.deadline <= _seconds(filters['deadline_before']))
+        return mask
+
+    def _indices(self, mask):
+        return np.flatnonzero(np.unpackbits(mask, count=self.size))
+
+    def filter(self, filters):
+        """Rows matching filters, in snapshot order"""
+        return [self.rows[i] for i in self._indices(self.match(filters or {}))]
+
+    def facet_counts(self, filters):
+        """{field: {value: count}} over rows matching every filter except the field's own"""
+        filters = filters or {}
+        counts = {}
+        for field in CATEGORICAL_FIELDS:
+            codes = self.codes[field][self._indices(self.match(filters, exclude=field))]
+            totals = np.bincount(codes[codes >= 0], minlength=len(self.values[field]))
+            counts[field] = {value: int(total) for value, total in zip(self.values[field], totals) if total}
+        return counts
+
+class ScholarshipReadModel:
+    """Keeps a ScholarshipSnapshot in step with the database's data version"""
+
+    def __init__(self, db, columns):
+        self.db = db
+        self.columns = columns
+        self.snapshot = None
+        self.lock = threading.Lock()
+
+    def current(self, version=None):
+        """Snapshot for version (default: the database's current one), rebuilding it if stale"""
+        if version is None:
+            version = self.db.get_data_version()
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with self.lock:
+            if self.snapshot is None or self.snapshot.version != version:
+                # Rows may be newer than version; that only costs an extra rebuild next time
+                rows = self.db.get_scholarship_rows(self.columns)
+                self.snapshot = ScholarshipSnapshot(version, rows, self.columns)
+            return self.snapshot
+
+    def query(self, filters=None):
+        return self.current().filter(filters)
+
+    def facet_counts(self, filters=None):
+        return self.current().facet_counts(filters)
+
+    def distinct_values(self, field):
+        return list(self.current().values[field])
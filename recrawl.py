@@ -0,0 +1,76 @@
+"""
+Adaptive per-source recrawl scheduling.
+
+Each source keeps its own revisit interval in the crawl_state table. When a
+fetch yields a different set of scholarships than last time, the interval is
+halved (down to RECRAWL_MIN_INTERVAL_HOURS). When nothing changed, it is
+doubled (up to RECRAWL_MAX_INTERVAL_HOURS). Sources that change often are
+therefore crawled frequently, and stale ones back off exponentially.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+
+from config import Config
+
+def content_hash(scholarships):
+    """Order-independent hash of the scholarships extracted from a source.
+
+    Extracted records are hashed instead of raw HTML, so rotating ads,
+    timestamps and nonces do not count as changes.
+    """
+    keys = sorted(
+        f"{s.get('name')}|{s.get('application_link')}|{s.get('deadline')}" for s in scholarships
+    )
+    return hashlib.sha256('\n'.join(keys).encode('utf-8')).hexdigest()
+
+class RecrawlPolicy:
+    """Decides which sources are due and adapts their revisit intervals"""
+
+    def __init__(self, db, min_interval=None, max_interval=None, default_interval=None):
+        self.db = db
+        self.min_interval = min_interval or Config.RECRAWL_MIN_INTERVAL_HOURS * 3600
+        self.max_interval = max_interval or Config.RECRAWL_MAX_INTERVAL_HOURS * 3600
+        self.default_interval = default_interval or Config.RECRAWL_DEFAULT_INTERVAL_HOURS * 3600
+
+    def due_sources(self, urls, now=None):
+        """Sources never crawled, or whose next_fetch_at has passed, in input order"""
+        now = now or datetime.now()
+        states = self.db.get_crawl_states(urls)
+        due = []
+        for url in urls:
+            state = states.get(url)
+            if state is None or state.next_fetch_at is None or state.next_fetch_at <= now:
+                due.append(url)
+        return due
+
+    def record_fetch(self, url, scholarships, now=None):
+        """Update a source's state after a successful fetch. Returns True if its content changed"""
+        now = now or datetime.now()
+        state = self.db.get_crawl_states([url]).get(url)
+        new_hash = content_hash(scholarships)
+
+        interval = state.revisit_interval if state and state.revisit_interval else self.default_interval
+        # An empty fetch is usually a failed or blocked page, so it backs off like an unchanged one
+        changed = state is None or (bool(scholarships) and state.content_hash != new_hash)
+        if state is None:
+            pass  # first sighting keeps the default interval
+        elif changed:
+            interval = max(self.min_interval, interval // 2)
+        else:
+            interval = min(self.max_interval, interval * 2)
+
+        updates = {
+            'last_fetched_at': now,
+            'content_hash': new_hash if scholarships or state is None else state.content_hash,
+            'last_yield': len(scholarships),
+            'fetch_count': (state.fetch_count or 0) + 1 if state else 1,
+            'revisit_interval': interval,
+            'next_fetch_at': now + timedelta(seconds=interval),
+        }
+        if changed:
+            updates['last_changed_at'] = now
+            updates['change_count'] = (state.change_count or 0) + 1 if state else 1
+
+        self.db.save_crawl_state(url, updates)
+        return changed
@@ -0,0 +1,114 @@
+"""
+Resident job scheduler for ScholarSift's daemon mode.
+
+Jobs are coroutine functions run on fixed intervals inside one long-lived
+event loop, so engines, connection pools and loaded models stay warm between
+runs. A job never overlaps with itself: a tick that arrives while the
+previous run is still going is skipped. Each run's duration is reported.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from metrics import registry
+
+job_seconds = registry.histogram('scholarsift_job_seconds', 'Daemon job run time')
+job_failures = registry.counter('scholarsift_job_failures_total', 'Daemon job runs that raised')
+
+class Job:
+    """A named coroutine function with an interval and run statistics"""
+
+    def __init__(self, name, interval, func, run_immediately=True):
+        self.name = name
+        self.interval = interval  # seconds
+        self.func = func
+        self.next_run = time.monotonic() if run_immediately else time.monotonic() + interval
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_duration = None
+        self.total_duration = 0.0
+
+    @property
+    def average_duration(self):
+        return self.total_duration / self.runs if self.runs else None
+
+class Scheduler:
+    """Runs interval jobs without overlap and reports their durations"""
+
+    def __init__(self, tick=1.0, after_job=None):
+        self.jobs = []
+        self.tick = tick
+        self.after_job = after_job  # sync callable run after every job, e.g. a metrics dump
+        self._tasks = set()
+
+    def add_job(self, name, interval, func, run_immediately=True):
+        """Register `func` (an async callable) to run every `interval` seconds"""
+        job = Job(name, interval, func, run_immediately)
+        self.jobs.append(job)
+        return job
+
+    async def run_job(self, job):
+        """Run a job once unless it is already running"""
+        if job.running:
+            job.skipped += 1
+            print(f"⏭️  Skipping {job.name}: previous run still in progress")
+            return
+
+        job.running = True
+        start = time.perf_counter()
+        print(f"▶️  {job.name} started at {datetime.now():%Y-%m-%d %H:%M:%S}")
+        try:
+            await job.func()
+            status = "finished"
+        except Exception as e:
+            job.failures += 1
+            job_failures.inc(job=job.name)
+            status = f"failed ({e})"
+        finally:
+            duration = time.perf_counter() - start
+            job.running = False
+            job.runs += 1
+            job.last_duration = duration
+            job.total_duration += duration
+            job_seconds.observe(duration, job=job.name)
+
+        if self.after_job:
+            try:
+                self.after_job()
+            except Exception as e:
+                print(f"⚠️  After-job hook failed: {e}")
+
+        next_run = datetime.now() + timedelta(seconds=max(0, job.next_run - time.monotonic()))
+        print(f"⏱️  {job.name} {status} in {duration:.1f}s (next run ~{next_run:%Y-%m-%d %H:%M})")
+
+    async def run_forever(self):
+        """Dispatch due jobs until cancelled"""
+        print(f"🕒 Scheduler started with {len(self.jobs)} jobs")
+        try:
+            while True:
+                now = time.monotonic()
+                for job in self.jobs:
+                    if job.next_run <= now:
+                        job.next_run = now + job.interval
+                        task = asyncio.create_task(self.run_job(job))
+                        self._tasks.add(task)
+                        task.add_done_callback(self._tasks.discard)
+
+                next_due = min(job.next_run for job in self.jobs) if self.jobs else now + self.tick
+                await asyncio.sleep(max(0.0, min(self.tick, next_due - time.monotonic())))
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            self.report()
+
+    def report(self):
+        """Print per-job run statistics"""
+        print("📊 Scheduler job summary:")
+        for job in self.jobs:
+            average = f"{job.average_duration:.1f}s" if job.average_duration is not None else "-"
+            last = f"{job.last_duration:.1f}s" if job.last_duration is not None else "-"
+            print(f"   {job.name}: {job.runs} runs, {job.failures} failed, {job.skipped} skipped, "
+                  f"last {last}, avg {average}")
@@ -1,24 +1,120 @@
 import asyncio
 import re
 import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
 
 import requests
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
-from fake_useragent import UserAgent
 
 from config import Config
 from database import DatabaseManager
+from recrawl import RecrawlPolicy
+from discovery import normalize_url
+from structured import extract_entities, parse_date
+from archive import PageArchive
+from writer import BatchWriter
+from metrics import registry, span, CrawlRunStats
+
+# Link text that points from a listing entry to its full page
+DETAIL_LINK_TEXT = re.compile(r'read more|learn more|more info|more details|view details|details|full description|continue reading', re.I)
+NEXT_PAGE_TEXT = re.compile(r'^(next|next page|older posts|older entries|[›»>]|next\s*[›»>])$', re.I)
+CONTAINER_CLASS = re.compile(r'scholarship|opportunity|grant|award')
+
+# Stage name -> per-source stats field its time is charged to
+STAGE_FIELDS = {
+    'robots': 'robots_seconds',
+    'playwright': 'fetch_seconds',
+    'fetch': 'fetch_seconds',
+    'parse': 'parse_seconds',
+}
+
+pages_fetched = registry.counter('scholarsift_pages_fetched_total', 'Pages fetched by the scraper')
+bytes_fetched = registry.counter('scholarsift_bytes_fetched_total', 'HTML bytes fetched by the scraper')
+fetch_errors = registry.counter('scholarsift_fetch_errors_total', 'Page fetches that returned nothing')
+scholarships_extracted = registry.counter('scholarsift_scholarships_extracted_total', 'Scholarships extracted from pages')
+scholarships_saved = registry.counter('scholarsift_scholarships_saved_total', 'Scholarships written to the database')
+
+# Stats dict of the seed source the running task is scraping (set per scrape_url task)
+_current_source = ContextVar('current_source', default=None)
+
+class HostLimiter:
+    """Per-host concurrency cap with a minimum spacing between request starts"""
+
+    def __init__(self, concurrency, delay):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.delay = delay
+        self.lock = asyncio.Lock()
+        self.next_start = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self.semaphore:
+            async with self.lock:
+                wait = self.next_start - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self.next_start = time.monotonic() + self.delay
+            yield
 
 class ScholarshipScraper:
-    def __init__(self):
-        self.db = DatabaseManager()
-        self.ua = UserAgent()
+    def __init__(self, db=None):
+        self.db = db or DatabaseManager()
+        self.recrawl = RecrawlPolicy(self.db)
+        self.archive = PageArchive(self.db) if Config.ARCHIVE_ENABLED else None
+        self._ua = None
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': Config.DEFAULT_USER_AGENT})
+        self.host_limiters = {}
+        self.seen_urls = set()  # normalized URLs fetched in the current crawl
+        self.run_stats = CrawlRunStats()
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+
+    @property
+    def ua(self):
+        """fake_useragent reads its whole browser database on construction, so defer it to the first Playwright fetch"""
+        if self._ua is None:
+            from fake_useragent import UserAgent
+            self._ua = UserAgent()
+        return self._ua
+
+    @contextmanager
+    def stage(self, name):
+        """Timing span for a scraper stage, also charged to the current source's stats"""
+        stats = _current_source.get()
+        result = {}
+        try:
+            with span(name) as result:
+                yield result
+        except Exception as e:
+            if stats is not None:
+                stats['errors'] += 1
+                stats['last_error'] = f'{name}: {e}'[:500]
+            raise
+        finally:
+            if stats is not None and name in STAGE_FIELDS:
+                stats[STAGE_FIELDS[name]] += result.get('seconds', 0)
+
+    def record_fetch(self, html, kind):
+        """Count a fetched page (or a failed fetch) for metrics and the current source"""
+        stats = _current_source.get()
+        if html:
+            size = len(html.encode('utf-8'))
+            pages_fetched.inc(kind=kind)
+            bytes_fetched.inc(size)
+            if stats is not None:
+                stats['pages'] += 1
+                stats['bytes'] += size
+        else:
+            fetch_errors.inc(kind=kind)
+            if stats is not None:
+                stats['errors'] += 1
+        return html
 
     def check_robots_txt(self, url):
         """Check if scraping is allowed by robots.txt"""
@@ -110,46 +206,251 @@ class ScholarshipScraper:
                     continue
         return None
 
-    async def scrape_with_playwright(self, url):
-        """Scrape dynamic content with Playwright"""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=Config.PLAYWRIGHT_HEADLESS)
+    async def get_browser(self):
+        """Chromium instance shared by every fetch, launched on first use (and again if it died)"""
+        # Imported here so re-extraction and non-scraping commands don't load Playwright
+        from playwright.async_api import async_playwright
+
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=Config.PLAYWRIGHT_HEADLESS)
+            return self._browser
+
+    async def close(self):
+        """Shut down the shared browser; the next Playwright fetch launches a new one"""
+        async with self._browser_lock:
+            if self._browser is not None:
+                try:
+                    await self._browser.close()
+                except Exception as e:
+                    print(f"Error closing browser: {e}")
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def fetch_with_playwright(self, url):
+        """Render dynamic content in a fresh context of the shared browser and return the page HTML"""
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        context = None
+        try:
+            browser = await self.get_browser()
             context = await browser.new_context(
                 user_agent=self.ua.random,
                 viewport={'width': 1920, 'height': 1080}
             )
             page = await context.new_page()
+            await page.goto(url, timeout=Config.PLAYWRIGHT_TIMEOUT)
+            await page.wait_for_load_state('networkidle')
+            return await page.content()
 
-            try:
-                await page.goto(url, timeout=Config.PLAYWRIGHT_TIMEOUT)
-                await page.wait_for_load_state('networkidle')
-
-                # Extract scholarship data
-                content = await page.content()
-                return self.extract_scholarship_data(content, url)
-
-            except PlaywrightTimeoutError:
-                print(f"Timeout scraping {url}")
-                return []
-            except Exception as e:
-                print(f"Error scraping {url}: {e}")
-                return []
-            finally:
-                await browser.close()
+        except PlaywrightTimeoutError:
+            print(f"Timeout scraping {url}")
+            return None
+        except Exception as e:
+            print(f"Error scraping {url}: {e}")
+            return None
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    print(f"Error closing browser context for {url}: {e}")
 
-    def scrape_with_requests(self, url):
-        """Scrape static content with requests"""
+    def fetch_with_requests(self, url):
+        """Fetch static content with requests"""
         try:
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
-            return self.extract_scholarship_data(response.text, url)
+            return response.text
         except Exception as e:
             print(f"Error scraping {url}: {e}")
+            return None
+
+    def archive_page(self, url, html, kind='listing'):
+        """Keep the raw HTML for offline re-extraction; never fails the scrape"""
+        if self.archive and html:
+            try:
+                self.archive.store(url, html, kind)
+            except Exception as e:
+                print(f"Error archiving {url}: {e}")
+        return html
+
+    def fetch_and_archive(self, url, kind='listing'):
+        """Fetch with requests and archive the page"""
+        return self.archive_page(url, self.fetch_with_requests(url), kind)
+
+    async def scrape_with_playwright(self, url):
+        """Scrape dynamic content with Playwright"""
+        with self.stage('playwright'):
+            html = self.record_fetch(await self.fetch_with_playwright(url), 'listing')
+        if not html:
             return []
+        await asyncio.get_running_loop().run_in_executor(None, self.archive_page, url, html)
+        return await self.scrape_listing(html, url)
+
+    async def scrape_with_requests(self, url):
+        """Scrape static content with requests"""
+        with self.stage('fetch'):
+            html = await asyncio.get_running_loop().run_in_executor(None, self.fetch_and_archive, url)
+        self.record_fetch(html, 'listing')
+        return await self.scrape_listing(html, url) if html else []
+
+    async def fetch_politely(self, url, kind='listing'):
+        """Fetch with requests inside the host's concurrency and delay budget"""
+        host = urlparse(url).netloc
+        if host not in self.host_limiters:
+            self.host_limiters[host] = HostLimiter(Config.HOST_CONCURRENCY, Config.REQUEST_DELAY)
+        async with self.host_limiters[host].slot():
+            with self.stage('fetch'):
+                html = await asyncio.get_running_loop().run_in_executor(None, self.fetch_and_archive, url, kind)
+        return self.record_fetch(html, kind)
+
+    def claim_url(self, url):
+        """Normalize url and mark it seen; None if it was already fetched this crawl"""
+        url = normalize_url(url)
+        if not url or url in self.seen_urls:
+            return None
+        self.seen_urls.add(url)
+        return url
+
+    def find_next_page(self, soup, page_url):
+        """URL of the listing's next page from rel=next or a "Next" pagination link"""
+        link = soup.find(['a', 'link'], rel='next', href=True)
+        if not link:
+            for anchor in soup.find_all('a', href=True):
+                classes = ' '.join(anchor.get('class', []))
+                if NEXT_PAGE_TEXT.match(anchor.get_text(strip=True)) or 'next' in classes.split():
+                    link = anchor
+                    break
+        return normalize_url(link['href'], page_url) if link else None
+
+    def find_detail_links(self, soup, page_url):
+        """Same-host links from listing entries to their full scholarship pages"""
+        host = urlparse(page_url).netloc
+        candidates = []
+
+        for container in soup.find_all(['div', 'article', 'section', 'li'], class_=CONTAINER_CLASS):
+            anchor = (container.find('a', href=True, string=DETAIL_LINK_TEXT)
+                      or container.select_one('h1 a[href], h2 a[href], h3 a[href], h4 a[href]'))
+            if anchor:
+                candidates.append(anchor['href'])
+
+        for anchor in soup.find_all('a', href=True):
+            if DETAIL_LINK_TEXT.fullmatch(anchor.get_text(' ', strip=True)):
+                candidates.append(anchor['href'])
+
+        links = []
+        for href in candidates:
+            url = normalize_url(href, page_url)
+            if url and urlparse(url).netloc == host and url != normalize_url(page_url) and url not in links:
+                links.append(url)
+        return links
+
+    async def scrape_listing(self, html, url):
+        """Extract a listing page, following pagination and expanding entries into detail pages"""
+        self.seen_urls.add(normalize_url(url))
+        listing_scholarships = []
+        preview_scholarships = []
+        detail_urls = []
+
+        for _ in range(Config.MAX_LISTING_PAGES):
+            with self.stage('parse'):
+                soup = BeautifulSoup(html, 'lxml')
+                page_links = self.find_detail_links(soup, url)
+                next_url = self.find_next_page(soup, url)
+                page_scholarships = self.parse_structured(html, url) or self.extract_from_soup(soup, url)
+
+            if page_links:
+                # Listing entries are previews of these detail pages; keep them only as a fallback
+                detail_urls.extend(link for link in page_links if link not in detail_urls)
+                preview_scholarships.extend(page_scholarships)
+            else:
+                listing_scholarships.extend(page_scholarships)
+
+            if not next_url or not self.claim_url(next_url):
+                break
+            url = next_url
+            html = await self.fetch_politely(url)
+            if not html:
+                break
+
+        detail_urls = [link for link in detail_urls if self.claim_url(link)][:Config.MAX_DETAIL_PAGES]
+        pages = await asyncio.gather(*[self.fetch_politely(link, 'detail') for link in detail_urls])
+        with self.stage('parse'):
+            scholarships = [
+                scholarship
+                for link, page in zip(detail_urls, pages) if page
+                for scholarship in [self.parse_detail_page(page, link)] if scholarship
+            ]
+        if detail_urls:
+            print(f"📑 Expanded {len(scholarships)}/{len(detail_urls)} detail pages from {urlparse(url).netloc}")
+
+        return (scholarships or preview_scholarships) + listing_scholarships
+
+    def reextract_page(self, kind, url, html):
+        """Run the current parsers over an archived page without fetching anything.
+
+        Returns (scholarships, detail_links); listing entries that link to archived
+        detail pages are previews the caller should drop in favour of those pages.
+        """
+        if kind == 'detail':
+            scholarship = self.parse_detail_page(html, url)
+            return ([scholarship] if scholarship else []), []
+
+        soup = BeautifulSoup(html, 'lxml')
+        detail_links = self.find_detail_links(soup, url)
+        return self.parse_structured(html, url) or self.extract_from_soup(soup, url), detail_links
+
+    def parse_detail_page(self, html_content, source_url):
+        """Parse a single scholarship's full page"""
+        structured = self.parse_structured(html_content, source_url, detail=True)
+        if structured:
+            return structured[0]
 
-    def extract_scholarship_data(self, html_content, source_url):
-        """Extract scholarship information from HTML"""
         soup = BeautifulSoup(html_content, 'lxml')
+        for script in soup(["script", "style", "nav", "header", "footer"]):
+            script.decompose()
+
+        container = soup.find('main') or soup.find('article') or soup.body or soup
+        return self.parse_scholarship_container(container, source_url)
+
+    def extract_scholarship_data(self, html_content, source_url):
+        """Extract scholarship information from HTML, structured data first"""
+        return (self.parse_structured(html_content, source_url)
+                or self.extract_from_soup(BeautifulSoup(html_content, 'lxml'), source_url))
+
+    def parse_structured(self, html_content, source_url, detail=False):
+        """Build scholarships from JSON-LD entities (and meta tags on detail pages)"""
+        scholarships = []
+        for entity in extract_entities(html_content, include_meta=detail):
+            text = ' '.join(filter(None, [
+                entity['name'], entity['description'], entity['educational_level'], entity['amount']
+            ]))
+            if entity.get('from_meta') and not any(k in text.lower() for k in Config.SCHOLARSHIP_KEYWORDS):
+                continue
+
+            scholarships.append({
+                'name': entity['name'],
+                'description': (entity['description'] or text)[:1000],
+                'eligibility': text,
+                'deadline': parse_date(entity['deadline']) or self.parse_deadline(text),
+                'funding_type': self.parse_funding_type(text),
+                'country': entity['country'],
+                'university': entity['provider'],
+                'degree_level': self.parse_degree_level(entity['educational_level'] or text),
+                'gpa_requirement': self.parse_gpa(text),
+                'application_link': urljoin(source_url, entity['url']) if entity['url'] else source_url,
+                'source_url': source_url,
+                'source_name': urlparse(source_url).netloc
+            })
+        return scholarships
+
+    def extract_from_soup(self, soup, source_url):
+        """Extract scholarship information from a parsed page"""
         scholarships = []
 
         # Remove script and style elements
@@ -160,13 +461,13 @@ class ScholarshipScraper:
         scholarship_containers = []
 
         # Pattern 1: Common scholarship page structure
-        containers = soup.find_all(['div', 'article', 'section'], class_=re.compile(r'scholarship|opportunity|grant|award'))
+        containers = soup.find_all(['div', 'article', 'section'], class_=CONTAINER_CLASS)
         if containers:
             scholarship_containers.extend(containers)
 
         # Pattern 2: List items
         if not scholarship_containers:
-            list_items = soup.find_all('li', class_=re.compile(r'scholarship|opportunity|grant|award'))
+            list_items = soup.find_all('li', class_=CONTAINER_CLASS)
             scholarship_containers.extend(list_items)
 
         # Pattern 3: Table rows
@@ -184,7 +485,7 @@ class ScholarshipScraper:
                     break
 
         # Extract data from each container
-        for container in scholarship_containers[:10]:  # Limit to first 10
+        for container in scholarship_containers[:Config.MAX_CONTAINERS_PER_PAGE]:
             scholarship = self.parse_scholarship_container(container, source_url)
             if scholarship:
                 scholarships.append(scholarship)
@@ -269,44 +570,149 @@ class ScholarshipScraper:
 
     async def scrape_url(self, url):
         """Scrape a single URL for scholarships"""
-        if not self.check_robots_txt(url):
+        stats = self.run_stats.source(url)
+        _current_source.set(stats)
+
+        with self.stage('robots'):
+            allowed = self.check_robots_txt(url)
+        if not allowed:
             print(f"Robots.txt disallows scraping {url}")
             return []
 
         # Try Playwright first for dynamic content
+        scholarships = []
         try:
             scholarships = await self.scrape_with_playwright(url)
-            if scholarships:
-                return scholarships
         except Exception as e:
             print(f"Playwright failed for {url}: {e}")
 
         # Fallback to requests for static content
-        return self.scrape_with_requests(url)
+        if not scholarships:
+            scholarships = await self.scrape_with_requests(url)
+
+        stats['items_extracted'] = len(scholarships)
+        scholarships_extracted.inc(len(scholarships))
+        return scholarships
 
     async def scrape_multiple_urls(self, urls):
         """Scrape multiple URLs concurrently"""
+        self.seen_urls = set()
+        self.run_stats = CrawlRunStats()
         tasks = [self.scrape_url(url) for url in urls]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
         all_scholarships = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                print(f"Error scraping {urls[i]}: {result}")
-            else:
+        for url, result in zip(urls, results):
+            if self.record_result(url, result):
                 all_scholarships.extend(result)
 
         return all_scholarships
 
-    def save_scholarships(self, scholarships):
-        """Save scholarships to database"""
-        saved_count = 0
-        for scholarship in scholarships:
+    async def scrape_and_save(self, urls):
+        """Scrape URLs concurrently, saving each source's scholarships on the writer thread as it finishes.
+
+        Returns (scholarships found, scholarships saved).
+        """
+        self.seen_urls = set()
+        self.run_stats = CrawlRunStats()
+        writer = BatchWriter(self.save_scholarships)
+
+        async def scrape(url):
             try:
-                scholarship_id = self.db.add_scholarship(scholarship)
-                if scholarship_id:
-                    saved_count += 1
+                return url, await self.scrape_url(url)
             except Exception as e:
-                print(f"Error saving scholarship {scholarship['name']}: {e}")
+                return url, e
+
+        found = 0
+        try:
+            for next_result in asyncio.as_completed([scrape(url) for url in urls]):
+                url, result = await next_result
+                if self.record_result(url, result):
+                    found += len(result)
+                    await writer.submit(result)
+        finally:
+            saved = await writer.aclose()
+        return found, saved
+
+    def record_result(self, url, result):
+        """Record a source's outcome in the run stats and recrawl state; True if it succeeded"""
+        if isinstance(result, Exception):
+            print(f"Error scraping {url}: {result}")
+            stats = self.run_stats.source(url)
+            stats['errors'] += 1
+            stats['last_error'] = str(result)[:500]
+            return False
+        self.recrawl.record_fetch(url, result)
+        return True
 
-        return saved_count
+    def save_scholarships(self, scholarships):
+        """Save scholarships to database in WRITE_BATCH_SIZE transactions"""
+        saved = []
+        with span('save') as result:
+            for start in range(0, len(scholarships), Config.WRITE_BATCH_SIZE):
+                batch = scholarships[start:start + Config.WRITE_BATCH_SIZE]
+                try:
+                    self.db.add_scholarships(batch)
+                    saved.extend(batch)
+                    continue
+                except Exception as e:
+                    print(f"Error saving batch of {len(batch)} scholarships, retrying one by one: {e}")
+
+                for scholarship in batch:
+                    try:
+                        if self.db.add_scholarship(scholarship):
+                            saved.append(scholarship)
+                    except Exception as e:
+                        print(f"Error saving scholarship {scholarship['name']}: {e}")
+
+        # Detail pages live on their listing's host, so attribute saves to sources by host.
+        # list() snapshots the sources the crawl may still be adding to from the event loop.
+        source_by_host = {urlparse(url).netloc: stats for url, stats in list(self.run_stats.sources.items())}
+        for scholarship in saved:
+            stats = source_by_host.get(urlparse(scholarship.get('source_url') or '').netloc)
+            if stats is not None:
+                stats['items_saved'] += 1
+
+        self.run_stats.save_seconds += result['seconds']
+        scholarships_saved.inc(len(saved))
+        return len(saved)
+
+    def finish_run(self):
+        """Persist the current crawl run's stats, write the metrics textfile and start a new run"""
+        run, sources = self.run_stats.to_records()
+        self.run_stats = CrawlRunStats()
+        if not sources:
+            return run
+
+        fetch = sum(source['fetch_seconds'] for source in sources)
+        parse = sum(source['parse_seconds'] for source in sources)
+        robots = sum(source['robots_seconds'] for source in sources)
+        print(f"⏱️  Crawl run: {run['duration_seconds']:.1f}s wall, {run['pages']} pages, "
+              f"{run['bytes'] / 1024:.0f} KB, {run['items_extracted']} extracted, {run['items_saved']} saved, "
+              f"{run['errors']} errors")
+        print(f"   Stage time (summed over sources): fetch {fetch:.1f}s, parse {parse:.1f}s, "
+              f"robots {robots:.1f}s, save {run['save_seconds']:.1f}s")
+
+        try:
+            self.db.save_crawl_run(run, sources)
+            registry.write_textfile()
+        except Exception as e:
+            print(f"Error recording crawl run: {e}")
+        return run
+
+_reextract_scraper = None
+
+def init_reextract_worker():
+    """ProcessPool initializer: one scraper per worker process"""
+    global _reextract_scraper
+    _reextract_scraper = ScholarshipScraper()
+
+def reextract_archived_page(page):
+    """ProcessPool task: (kind, url, html) -> (kind, url, scholarships, detail_links)"""
+    kind, url, html = page
+    try:
+        scholarships, detail_links = _reextract_scraper.reextract_page(kind, url, html)
+    except Exception as e:
+        print(f"Error re-extracting {url}: {e}")
+        scholarships, detail_links = [], []
+    return kind, url, scholarships, detail_links
@@ -0,0 +1,58 @@
+"""
+Shared serialization for Scholarship rows.
+
+Consumers (dashboard API, exports, notifications) select plain column tuples
+instead of hydrating ORM objects, then turn them into dicts through a field
+list that is compiled once per projection.
+"""
+
+from sqlalchemy import DateTime
+
+from database import Scholarship
+
+# Public representation of a scholarship, in output order
+SCHOLARSHIP_FIELDS = (
+    'id', 'name', 'description', 'eligibility', 'deadline', 'funding_type',
+    'country', 'university', 'degree_level', 'gpa_requirement',
+    'application_link', 'source_url', 'source_name', 'scraped_at', 'summary'
+)
+
+class ScholarshipSerializer:
+    """Compiled projection of Scholarship columns to JSON-ready dicts"""
+
+    def __init__(self, fields=None):
+        self.fields = tuple(fields or SCHOLARSHIP_FIELDS)
+
+        table_columns = Scholarship.__table__.columns
+        unknown = [field for field in self.fields if field not in table_columns]
+        if unknown:
+            raise ValueError(f"Unknown scholarship fields: {', '.join(unknown)}")
+
+        # Columns to pass to session.query() / DatabaseManager row methods
+        self.columns = tuple(getattr(Scholarship, field) for field in self.fields)
+        # Positions that hold datetimes and need isoformat()
+        self._datetime_positions = tuple(
+            position for position, field in enumerate(self.fields)
+            if isinstance(table_columns[field].type, DateTime)
+        )
+
+    def to_dict(self, row):
+        """Convert one row tuple (in self.fields order) to a dict"""
+        if not self._datetime_positions:
+            return dict(zip(self.fields, row))
+
+        values = list(row)
+        for position in self._datetime_positions:
+            value = values[position]
+            if value is not None:
+                values[position] = value.isoformat()
+        return dict(zip(self.fields, values))
+
+    def serialize(self, rows):
+        """Lazily convert an iterable of row tuples to dicts"""
+        to_dict = self.to_dict
+        for row in rows:
+            yield to_dict(row)
+
+# Shared full-width serializer
+scholarship_serializer = ScholarshipSerializer()
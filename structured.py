@@ -0,0 +1,190 @@
+"""
+Structured-data extraction: JSON-LD, microdata and OpenGraph.
+
+A streaming html.parser pass collects only the <script type="application/ld+json">
+blocks, meta tags and itemprop values, without building a DOM. Scholarship
+entities found there are cheaper to read and more accurate than the
+heading/regex heuristics, so the scraper tries this tier first.
+"""
+
+import html as html_lib
+import json
+from datetime import datetime
+from html.parser import HTMLParser
+
+# schema.org types that describe a single scholarship opportunity
+SCHOLARSHIP_TYPES = {
+    'EducationalOccupationalProgram', 'Event', 'Grant', 'MonetaryGrant',
+    'Scholarship', 'FinancialAidProgram'
+}
+
+class StructuredDataParser(HTMLParser):
+    """Collects JSON-LD script bodies, meta tag content and microdata itemprops"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld = []
+        self.meta = {}
+        self.itemprops = {}
+        self.title = None
+        self._in_json_ld = False
+        self._in_title = False
+        self._buffer = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'script' and (attrs.get('type') or '').lower() == 'application/ld+json':
+            self._in_json_ld = True
+            self._buffer = []
+        elif tag == 'meta':
+            key = attrs.get('property') or attrs.get('name')
+            if key and attrs.get('content'):
+                self.meta.setdefault(key.lower(), attrs['content'].strip())
+        elif tag == 'title' and self.title is None:
+            self._in_title = True
+            self._buffer = []
+
+        prop = attrs.get('itemprop')
+        value = attrs.get('content') or attrs.get('datetime') or (attrs.get('href') if tag == 'link' else None)
+        if prop and value:
+            self.itemprops.setdefault(prop, value.strip())
+
+    def handle_data(self, data):
+        if self._in_json_ld or self._in_title:
+            self._buffer.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == 'script' and self._in_json_ld:
+            self.json_ld.append(''.join(self._buffer))
+            self._in_json_ld = False
+        elif tag == 'title' and self._in_title:
+            self.title = ''.join(self._buffer).strip()
+            self._in_title = False
+
+def _nodes(data):
+    """Flatten JSON-LD documents, lists and @graph containers into nodes"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _nodes(item)
+    elif isinstance(data, dict):
+        if '@graph' in data:
+            yield from _nodes(data['@graph'])
+        if '@type' in data:
+            yield data
+
+def _types(node):
+    types = node.get('@type')
+    return set(types) if isinstance(types, list) else {types}
+
+def _text(value):
+    """Plain string from a JSON-LD value that may be a list, a Thing or a string"""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('@id') or value.get('url')
+    # Script bodies are raw text, but CMS plugins often emit entity-escaped strings
+    return html_lib.unescape(value).strip() if isinstance(value, str) and value.strip() else None
+
+def _country(node):
+    location = node.get('location') or node.get('eligibleRegion') or node.get('areaServed')
+    if isinstance(location, list):
+        location = location[0] if location else None
+    if isinstance(location, dict):
+        address = location.get('address')
+        if isinstance(address, dict):
+            return _text(address.get('addressCountry'))
+        return _text(location.get('addressCountry')) or _text(location)
+    return _text(location)
+
+def _amount(node):
+    amount = node.get('amount') or node.get('offers') or node.get('estimatedCost')
+    if isinstance(amount, list):
+        amount = amount[0] if amount else None
+    if isinstance(amount, dict):
+        value = amount.get('value') or amount.get('price')
+        currency = amount.get('currency') or amount.get('priceCurrency') or ''
+        return f'{value} {currency}'.strip() if value else None
+    return str(amount) if amount else None
+
+def _date_text(value):
+    """Date string from a JSON-LD value that may be a list, a typed literal or a number"""
+    if isinstance(value, list):
+        value = next((v for v in value if isinstance(v, (str, dict))), None)
+    if isinstance(value, dict):
+        value = value.get('@value')
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+def parse_date(value):
+    """ISO-8601 date or datetime string to a naive datetime, or None"""
+    value = _date_text(value)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = datetime.strptime(value[:10], '%Y-%m-%d')
+        except ValueError:
+            return None
+    return parsed.replace(tzinfo=None)
+
+def _entity_from_node(node):
+    return {
+        'name': _text(node.get('name')) or _text(node.get('headline')),
+        'description': _text(node.get('description')),
+        'deadline': (_date_text(node.get('applicationDeadline'))
+                     or _date_text(node.get('endDate'))
+                     or _date_text(node.get('validThrough'))),
+        'url': _text(node.get('url')) or _text(node.get('sameAs')),
+        'provider': _text(node.get('provider')) or _text(node.get('funder')) or _text(node.get('organizer')),
+        'country': _country(node),
+        'educational_level': (_text(node.get('educationalCredentialAwarded'))
+                              or _text(node.get('educationalLevel'))
+                              or _text(node.get('educationalProgramMode'))),
+        'amount': _amount(node),
+    }
+
+def extract_entities(html, include_meta=False):
+    """Scholarship entities from JSON-LD, or from microdata/OpenGraph when include_meta
+
+    Meta tags describe the page as a whole, so they only make sense for a
+    single-scholarship detail page; listing pages rely on JSON-LD alone.
+    """
+    if not include_meta and 'ld+json' not in html:
+        return []
+
+    parser = StructuredDataParser()
+    parser.feed(html)
+    parser.close()
+
+    entities = []
+    for block in parser.json_ld:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        for node in _nodes(data):
+            if _types(node) & SCHOLARSHIP_TYPES:
+                entity = _entity_from_node(node)
+                if entity['name']:
+                    entities.append(entity)
+
+    if entities or not include_meta:
+        return entities
+
+    # OpenGraph tags exist on nearly every page; from_meta tells the caller to check the wording
+    props, meta = parser.itemprops, parser.meta
+    name = props.get('name') or meta.get('og:title') or meta.get('twitter:title') or parser.title
+    if not name:
+        return []
+    return [{
+        'name': name,
+        'description': props.get('description') or meta.get('og:description') or meta.get('description'),
+        'deadline': props.get('applicationDeadline') or props.get('endDate') or props.get('validThrough'),
+        'url': props.get('url') or meta.get('og:url'),
+        'provider': props.get('provider') or meta.get('og:site_name'),
+        'country': props.get('addressCountry'),
+        'educational_level': props.get('educationalCredentialAwarded') or props.get('educationalLevel'),
+        'amount': props.get('amount'),
+        'from_meta': True,
+    }]
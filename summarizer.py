@@ -13,6 +13,9 @@ except ImportError:
     TRANSFORMERS_AVAILABLE = False
 
 from config import Config
+from metrics import registry, span
+
+summaries_total = registry.counter('scholarsift_summaries_total', 'Scholarship descriptions summarized')
 
 class ScholarshipSummarizer:
     def __init__(self):
@@ -118,12 +121,15 @@ class ScholarshipSummarizer:
         if not text or len(text.strip()) < 50:
             return text
 
-        if self.use_openai:
-            return self.summarize_with_openai(text, max_length)
-        elif self.use_transformers:
-            return self.summarize_with_local_model(text, max_length)
-        else:
-            return self.fallback_summary(text)
+        backend = 'openai' if self.use_openai else 'local' if self.use_transformers else 'fallback'
+        summaries_total.inc(backend=backend)
+        with span('summarize', backend=backend):
+            if self.use_openai:
+                return self.summarize_with_openai(text, max_length)
+            elif self.use_transformers:
+                return self.summarize_with_local_model(text, max_length)
+            else:
+                return self.fallback_summary(text)
 
     def batch_summarize(self, scholarships):
         """Summarize multiple scholarships"""
@@ -178,6 +178,1015 @@ def test_summarizer_logic():
         print(f"❌ Summarizer test failed: {e}")
         return False
 
+def load_dashboard(db):
+    """Import dashboard/app.py once and point it at db, with SQL queries and an empty response cache"""
+    import importlib.util
+    from config import Config
+
+    dashboard = sys.modules.get('dashboard_app')
+    if dashboard is None:
+        database_url, Config.DATABASE_URL = Config.DATABASE_URL, str(db.engine.url)
+        try:
+            spec = importlib.util.spec_from_file_location(
+                'dashboard_app', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard', 'app.py')
+            )
+            dashboard = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(dashboard)
+            sys.modules['dashboard_app'] = dashboard
+        finally:
+            Config.DATABASE_URL = database_url
+
+    dashboard.db = db
+    dashboard.read_model = None
+    dashboard.summarizer = None
+    dashboard.response_cache.clear()
+    return dashboard
+
+def test_scholarship_serializer():
+    """Test field projection, datetime output and unknown-field rejection"""
+    try:
+        import types
+        from serializers import ScholarshipSerializer, SCHOLARSHIP_FIELDS
+
+        serializer = ScholarshipSerializer(('id', 'name', 'deadline', 'gpa_requirement', 'scraped_at'))
+        row = (7, 'Global Masters Scholarship', datetime(2027, 1, 31, 12, 30), 3.5, None)
+        projected = serializer.to_dict(row)
+        print(f"   Projected: {projected}")
+
+        plain = ScholarshipSerializer(('id', 'name'))
+        lazy = plain.serialize([(1, 'First'), (2, 'Second')])
+
+        try:
+            ScholarshipSerializer(('name', 'not_a_column', 'nor_this'))
+            rejected = None
+        except ValueError as e:
+            rejected = str(e)
+        print(f"   Unknown fields: {rejected}")
+
+        return (projected == {'id': 7, 'name': 'Global Masters Scholarship', 'deadline': '2027-01-31T12:30:00',
+                              'gpa_requirement': 3.5, 'scraped_at': None}
+                and [column.key for column in serializer.columns] == list(serializer.fields)
+                and ScholarshipSerializer().fields == SCHOLARSHIP_FIELDS
+                and isinstance(lazy, types.GeneratorType)
+                and list(lazy) == [{'id': 1, 'name': 'First'}, {'id': 2, 'name': 'Second'}]
+                and rejected == 'Unknown scholarship fields: not_a_column, nor_this')
+    except Exception as e:
+        print(f"❌ Scholarship serializer test failed: {e}")
+        return False
+
+def test_dashboard_cache():
+    """Test cached API responses get a new ETag after a write and answer If-None-Match with 304"""
+    try:
+        import tempfile
+        from database import DatabaseManager
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'dashboard.db')}")
+            db.add_scholarships([{'name': 'DAAD Masters', 'country': 'Germany'}, {'name': 'Chevening', 'country': 'UK'}])
+            client = load_dashboard(db).app.test_client()
+
+            first = client.get('/api/countries')
+            etag = first.headers['ETag']
+            revalidated = client.get('/api/countries', headers={'If-None-Match': etag})
+            db.add_scholarship({'name': 'Mastercard Foundation', 'country': 'Kenya'})
+            changed = client.get('/api/countries', headers={'If-None-Match': etag})
+            db.engine.dispose()
+
+        print(f"   Statuses: {first.status_code}, {revalidated.status_code}, {changed.status_code} after a write")
+        return (first.status_code == 200 and first.get_json() == ['Germany', 'UK']
+                and revalidated.status_code == 304 and not revalidated.data
+                and changed.status_code == 200 and changed.headers['ETag'] != etag
+                and changed.get_json() == ['Germany', 'Kenya', 'UK'])
+    except Exception as e:
+        print(f"❌ Dashboard cache test failed: {e}")
+        return False
+
+def test_dashboard_streaming():
+    """Test NDJSON streaming and gzip negotiation on /api/scholarships"""
+    try:
+        import gzip
+        import tempfile
+        from database import DatabaseManager
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'dashboard.db')}")
+            db.add_scholarships([
+                {'name': f'Scholarship {i}', 'country': 'Germany', 'description': 'Fully funded masters study. ' * 5}
+                for i in range(450)
+            ])
+            client = load_dashboard(db).app.test_client()
+
+            streamed = client.get('/api/scholarships?format=ndjson', headers={'Accept-Encoding': 'gzip'})
+            lines = gzip.decompress(streamed.data).decode('utf-8').splitlines()
+            negotiated = client.get('/api/scholarships', headers={'Accept': 'application/x-ndjson'})
+            compressed = client.get('/api/scholarships', headers={'Accept-Encoding': 'gzip'})
+            plain = client.get('/api/scholarships')
+            db.engine.dispose()
+
+        print(f"   Streamed {len(lines)} NDJSON lines; JSON body {len(plain.data)} bytes, gzip {len(compressed.data)} bytes")
+        return (streamed.mimetype == 'application/x-ndjson'
+                and streamed.headers.get('Content-Encoding') == 'gzip'
+                and [json.loads(line)['name'] for line in lines] == [f'Scholarship {i}' for i in range(450)]
+                and len(negotiated.data.decode('utf-8').splitlines()) == 450
+                and compressed.headers.get('Content-Encoding') == 'gzip'
+                and json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+                and len(compressed.data) < len(plain.data) / 5)
+    except Exception as e:
+        print(f"❌ Dashboard streaming test failed: {e}")
+        return False
+
+def test_streaming_export():
+    """Test JSON, NDJSON and CSV exports agree and are written atomically"""
+    try:
+        import csv
+        import tempfile
+        from database import DatabaseManager
+        from exporter import ScholarshipExporter
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'export.db')}")
+            db.add_scholarships([
+                {'name': f'Scholarship {i}', 'country': 'Côte d’Ivoire', 'gpa_requirement': 3.0,
+                 'deadline': datetime(2030, 1, 1 + i % 28), 'is_active': i != 3}
+                for i in range(25)
+            ])
+            exporter = ScholarshipExporter(db, batch_size=4)
+            counts = {format: exporter.export(os.path.join(tmp, f'out.{format}'), format) for format in ('json', 'ndjson', 'csv')}
+            empty = exporter.export(os.path.join(tmp, 'empty.json'), 'json', {'country': 'atlantis'})
+
+            with open(os.path.join(tmp, 'out.json'), encoding='utf-8') as f:
+                records = json.load(f)
+            with open(os.path.join(tmp, 'out.ndjson'), encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f]
+            with open(os.path.join(tmp, 'out.csv'), encoding='utf-8', newline='') as f:
+                csv_rows = list(csv.DictReader(f))
+            with open(os.path.join(tmp, 'empty.json'), encoding='utf-8') as f:
+                empty_records = json.load(f)
+            leftovers = [name for name in os.listdir(tmp) if name.endswith('.tmp')]
+            db.engine.dispose()
+
+        print(f"   Rows written: {counts}, temp files left: {len(leftovers)}")
+        return (counts == {'json': 24, 'ndjson': 24, 'csv': 24}
+                and records == lines and len(csv_rows) == 24
+                and [row['name'] for row in csv_rows] == [record['name'] for record in records]
+                and records[0]['country'] == 'Côte d’Ivoire' and records[0]['deadline'].startswith('2030-01-01')
+                and empty == 0 and empty_records == [] and not leftovers)
+    except Exception as e:
+        print(f"❌ Streaming export test failed: {e}")
+        return False
+
+def test_incremental_export():
+    """Test the change log only receives rows past the watermark and compaction truncates it"""
+    try:
+        import tempfile
+        from datetime import timedelta
+        from database import DatabaseManager
+        import threading
+        from exporter import IncrementalExporter, export_lock
+
+        start = datetime(2030, 1, 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'incremental.db')}")
+            exporter = IncrementalExporter(
+                db, os.path.join(tmp, 'snapshot.json'), os.path.join(tmp, 'changes.ndjson'), os.path.join(tmp, 'state.json')
+            )
+            db.add_scholarships([{'name': name, 'scraped_at': start} for name in ('A', 'B')])
+            first = exporter.export_changes()
+            again = exporter.export_changes()
+
+            # A row on the watermark's own timestamp is still new, thanks to the id tiebreak
+            db.add_scholarships([{'name': 'C', 'scraped_at': start}, {'name': 'D', 'scraped_at': start + timedelta(hours=1)}])
+            second = exporter.export_changes()
+            with open(exporter.changes_path, encoding='utf-8') as f:
+                logged = [json.loads(line)['name'] for line in f]
+            state = exporter.load_state()
+
+            snapshot_rows = exporter.compact()
+            with open(exporter.changes_path, encoding='utf-8') as f:
+                log_after = f.read()
+            with open(exporter.snapshot_path, encoding='utf-8') as f:
+                snapshot = [record['name'] for record in json.load(f)]
+            compacted = exporter.load_state()
+            compaction_due = exporter.needs_compaction(compacted)
+
+            # An export started while another job holds the state file's lock waits for it
+            db.add_scholarships([{'name': 'E', 'scraped_at': start + timedelta(hours=2)}])
+            with export_lock(exporter.state_path):
+                concurrent = threading.Thread(target=exporter.run, kwargs={'force_compact': True})
+                concurrent.start()
+                concurrent.join(0.2)
+                waited = concurrent.is_alive()
+            concurrent.join()
+            final = exporter.load_state()
+            db.engine.dispose()
+
+        print(f"   Changes per run: {first}, {again}, {second}; change log {logged}, snapshot {snapshot}")
+        return ((first, again, second) == (2, 0, 2)
+                and logged == ['A', 'B', 'C', 'D'] and state['pending_changes'] == 4
+                and state['watermark'] == (start + timedelta(hours=1)).isoformat()
+                and snapshot_rows == 4 and sorted(snapshot) == ['A', 'B', 'C', 'D']
+                and log_after == '' and compacted['pending_changes'] == 0 and not compaction_due
+                and waited and final['watermark'] == (start + timedelta(hours=2)).isoformat() and final['pending_changes'] == 0)
+    except Exception as e:
+        print(f"❌ Incremental export test failed: {e}")
+        return False
+
+def test_notification_range_queries():
+    """Test new-scholarship and urgent-deadline range queries against the same filters in Python"""
+    try:
+        import tempfile
+        from datetime import timedelta
+        from database import DatabaseManager
+        from serializers import scholarship_serializer
+
+        now = datetime(2030, 6, 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'ranges.db')}")
+            db.add_scholarships([
+                {'name': f'Scholarship {i}', 'scraped_at': now - timedelta(days=i),
+                 'deadline': now + timedelta(days=(i * 7) % 40 - 5) if i % 4 else None, 'is_active': i % 9 != 0}
+                for i in range(30)
+            ])
+            columns = scholarship_serializer.columns
+            rows = db.get_scholarship_rows(columns)
+
+            since = now - timedelta(days=7)
+            new = db.get_scholarships_scraped_since(columns, since)
+            expected_new = sorted((row for row in rows if row.scraped_at >= since), key=lambda row: row.scraped_at, reverse=True)
+
+            end = now + timedelta(days=14)
+            urgent = db.get_scholarships_with_deadline_between(columns, now, end)
+            expected_urgent = sorted((row for row in rows if row.deadline and now <= row.deadline <= end), key=lambda row: row.deadline)
+            limited = db.get_scholarships_with_deadline_between(columns, now, end, limit=2)
+            db.engine.dispose()
+
+        print(f"   New this week: {len(new)}, urgent: {[row.name for row in urgent]}")
+        return (len(new) > 0 and [row.id for row in new] == [row.id for row in expected_new]
+                and len(urgent) > 0 and [row.deadline for row in urgent] == [row.deadline for row in expected_urgent]
+                and {row.id for row in urgent} == {row.id for row in expected_urgent}
+                and [row.id for row in limited] == [row.id for row in urgent[:2]])
+    except Exception as e:
+        print(f"❌ Notification range query test failed: {e}")
+        return False
+
+def test_smtp_pool():
+    """Test pooled SMTP delivery against a local stub SMTP server"""
+    try:
+        import smtplib
+        import socketserver
+        import threading
+        from email.mime.text import MIMEText
+        from mailer import SMTPConnectionPool
+
+        class SinkHandler(socketserver.StreamRequestHandler):
+            """Just enough SMTP for smtplib: accepts every message and records its recipient"""
+
+            def handle(self):
+                self.server.connections += 1
+                self.wfile.write(b'220 sink ready\r\n')
+                recipient, in_data = None, False
+                for line in self.rfile:
+                    if in_data:
+                        if line == b'.\r\n':
+                            in_data = False
+                            self.server.messages.append((recipient, id(self)))
+                            self.wfile.write(b'250 OK\r\n')
+                        continue
+
+                    command = line[:4].upper()
+                    if command in (b'EHLO', b'HELO'):
+                        self.wfile.write(b'250 sink\r\n')
+                    elif command == b'RCPT':
+                        recipient = line[8:].strip(b'<>\r\n').decode()
+                        self.wfile.write(b'250 OK\r\n')
+                    elif command == b'DATA':
+                        in_data = True
+                        self.wfile.write(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+                    elif command == b'QUIT':
+                        self.wfile.write(b'221 Bye\r\n')
+                        break
+                    else:
+                        self.wfile.write(b'250 OK\r\n')
+                self.server.closed += 1
+
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), SinkHandler)
+        server.daemon_threads = True
+        server.connections = server.closed = 0
+        server.messages = []
+        port = server.server_address[1]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            pool = SMTPConnectionPool(
+                host='127.0.0.1', port=port,
+                username='', password='', use_tls=False, size=2, max_messages_per_connection=5
+            )
+            messages = []
+            for i in range(20):
+                msg = MIMEText('Test digest')
+                msg['From'] = 'digest@scholarsift.test'
+                msg['To'] = f'student{i}@example.com'
+                messages.append(msg)
+
+            results = pool.send_many(messages)
+            pool.close()
+            pooled_connections = server.connections
+
+            # The sink offers no STARTTLS, so the handshake fails after the socket is open
+            tls_pool = SMTPConnectionPool(host='127.0.0.1', port=port, username='', password='', use_tls=True)
+            try:
+                tls_pool._connect()
+                tls_error = None
+            except smtplib.SMTPException as e:
+                tls_error = e
+            for _ in range(100):
+                if server.closed == server.connections:
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        errors = [error for _, error in results if error is not None]
+        recipients = sorted(recipient for recipient, _ in server.messages)
+        print(f"   Delivered {len(recipients)}/20 messages over {pooled_connections} connections")
+        print(f"   Failed STARTTLS: {tls_error!r}, {server.connections - server.closed} connections left open")
+        # 20 messages, retired every 5 per connection -> at least 4, far fewer than 20 connections
+        return (not errors and recipients == sorted(f'student{i}@example.com' for i in range(20))
+                and 4 <= pooled_connections < 20
+                and tls_error is not None and server.closed == server.connections)
+    except Exception as e:
+        print(f"❌ SMTP pool test failed: {e}")
+        return False
+
+def test_digest_renderer():
+    """Test digest output against baselines with cold and warm fragment caches"""
+    try:
+        from collections import namedtuple
+        from digest import DigestRenderer, LRUCache, HTML_HEADER, HTML_FOOTER
+        from notifications import DIGEST_FIELDS
+
+        Row = namedtuple('Row', DIGEST_FIELDS)
+        full = Row(1, 'Global Masters Scholarship', 'Full tuition for masters study in Germany.',
+                   datetime(2027, 1, 31), 'fully_funded', 'Germany', 'masters', 3.5,
+                   'https://example.org/apply/1', datetime(2026, 10, 1), 'Covers tuition and living costs.')
+        sparse = Row(2, 'Open Research Grant', None, None, None, None, None, None,
+                     'https://example.org/apply/2', datetime(2026, 10, 2), None)
+        rows = [full, sparse]
+
+        def compact(html):
+            return ' '.join(html.split())
+
+        cards = (
+            '<div class="scholarship"> <h3>Global Masters Scholarship</h3>'
+            ' <p><strong>Country:</strong> Germany</p> <p><strong>Degree Level:</strong> masters</p>'
+            ' <p><strong>Funding:</strong> Fully Funded</p> <p><strong>GPA Requirement:</strong> 3.5</p>'
+            ' <p class="deadline"><strong>Deadline:</strong> January 31, 2027</p>'
+            ' <p>Covers tuition and living costs.</p>'
+            ' <a href="https://example.org/apply/1" class="apply-btn">Apply Now</a> </div>'
+            ' <div class="scholarship"> <h3>Open Research Grant</h3> <p>No description available</p>'
+            ' <a href="https://example.org/apply/2" class="apply-btn">Apply Now</a> </div>'
+        )
+        expected_html = ' '.join([compact(HTML_HEADER.substitute(title='Weekly Picks')), cards, compact(HTML_FOOTER)])
+        expected_telegram = (
+            "🎓 New Scholarships This Week\n\n"
+            "📚 Global Masters Scholarship\n🌍 Germany\n⏰ 2027-01-31\n💰 Fully Funded\n🔗 https://example.org/apply/1\n\n"
+            "📚 Open Research Grant\n🔗 https://example.org/apply/2\n\n"
+            "Visit our website for more details and filtering options."
+        )
+
+        renderer = DigestRenderer()
+        cold = (renderer.render_html(rows, 'Weekly Picks'), renderer.render_telegram(rows))
+        card = renderer.render_card(full)
+
+        # Drop memoized digests so the next render is assembled from cached fragments
+        renderer._digests = LRUCache(10)
+        warm = (renderer.render_html(rows, 'Weekly Picks'), renderer.render_telegram(rows))
+        memoized = renderer.render_html(rows, 'Weekly Picks') is warm[0]
+        edited = compact(renderer.render_card(full._replace(country='France')))
+        print(f"   Cold matches: {compact(cold[0]) == expected_html}, {cold[1] == expected_telegram}")
+        print(f"   Warm matches: {compact(warm[0]) == expected_html}, {warm[1] == expected_telegram}")
+
+        many = [full._replace(id=i, name=f'Scholarship {i}') for i in range(7)]
+        overflow = renderer.render_telegram(many, urgent=True)
+
+        return (compact(cold[0]) == expected_html and cold[1] == expected_telegram
+                and warm == cold and memoized
+                and renderer.render_card(full) is card
+                and '<strong>Country:</strong> France' in edited
+                and overflow.startswith("🚨 URGENT DEADLINES\n\n📚 Scholarship 0\n")
+                and overflow.count('📚') == 5
+                and overflow.endswith("... and 2 more scholarships!\n\nVisit our website for more details and filtering options."))
+    except Exception as e:
+        print(f"❌ Digest renderer test failed: {e}")
+        return False
+
+def test_delivery_engine():
+    """Test concurrent delivery with rate limits and transient-failure retries"""
+    try:
+        import asyncio
+        import time
+        from delivery import Delivery, DeliveryEngine
+
+        attempts = {}
+
+        async def flaky_telegram(delivery):
+            attempts[delivery.recipient] = attempts.get(delivery.recipient, 0) + 1
+            if delivery.recipient == 'chat-0' and attempts[delivery.recipient] == 1:
+                raise ConnectionResetError('transient')
+            await asyncio.sleep(0.05)  # simulated round trip
+
+        def failing_email(delivery):
+            raise ValueError('permanent')
+
+        engine = DeliveryEngine(
+            send_email=failing_email, send_telegram=flaky_telegram,
+            telegram_concurrency=20, telegram_rate=200, telegram_chat_rate=200, max_retries=2, retry_backoff=0.01
+        )
+        deliveries = [Delivery('telegram', f'chat-{i}', None, 'hi') for i in range(40)]
+        deliveries.append(Delivery('email', 'student@example.com', 'Digest', '<p>hi</p>'))
+
+        start = time.perf_counter()
+        results = asyncio.run(engine.deliver(deliveries))
+        elapsed = time.perf_counter() - start
+        counts = DeliveryEngine.count_sent(results)
+
+        print(f"   Sent {counts['telegram']} Telegram / {counts['email']} email in {elapsed:.2f}s")
+        # 40 x 50ms in series would take 2s; the retried chat got a second attempt
+        return counts == {'email': 0, 'telegram': 40} and attempts['chat-0'] == 2 and elapsed < 1.0
+    except Exception as e:
+        print(f"❌ Delivery engine test failed: {e}")
+        return False
+
+def test_notification_outbox():
+    """Test outbox idempotency, per-delivery results, lease takeover and retry backoff"""
+    try:
+        import asyncio
+        import smtplib
+        import tempfile
+        from datetime import timedelta
+        from database import DatabaseManager
+        from delivery import Delivery, DeliveryEngine
+        from outbox import OutboxWorker, enqueue_deliveries
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'outbox.db')}")
+            subscribers = [db.add_subscription({'telegram_id': f'chat-{i}'}) for i in range(4)]
+            pairs = [(sid, Delivery('telegram', f'chat-{i}', None, 'Weekly digest')) for i, sid in enumerate(subscribers)]
+            queued = enqueue_deliveries(db, 'weekly', '2030-W01', pairs)
+            requeued = enqueue_deliveries(db, 'weekly', '2030-W01', pairs)
+
+            # Results are written as each delivery finishes, and the lease is renewed while the slow one
+            # is still sending, so another worker cannot take it over
+            release = asyncio.Event()
+            midway = {}
+            async def send_telegram(delivery):
+                if delivery.recipient == 'chat-3':
+                    await asyncio.sleep(0.1)
+                    midway.update(db.get_outbox_counts())
+                    midway['intruder'] = db.claim_outbox_batch('intruder', 10, datetime.utcnow() - timedelta(seconds=0.05))
+                    await release.wait()
+            async def drain_with_slow_chat():
+                async def unblock():
+                    await asyncio.sleep(0.2)
+                    release.set()
+                asyncio.get_running_loop().create_task(unblock())
+                engine = DeliveryEngine(send_telegram=send_telegram, telegram_chat_rate=100, max_retries=0)
+                return await OutboxWorker(db, engine, lease_seconds=0.05).drain()
+            before = datetime.utcnow()
+            counts = asyncio.run(drain_with_slow_chat())
+            notified = [subscription.last_notified for subscription in db.get_subscriptions()]
+
+            # A crashed worker's claim is only taken over once its lease has expired
+            enqueue_deliveries(db, 'weekly', '2030-W02', pairs[:2])
+            now = datetime.utcnow()
+            crashed = db.claim_outbox_batch('crashed', 10, now - timedelta(minutes=10))
+            too_soon = db.claim_outbox_batch('second', 10, now - timedelta(minutes=10))
+            taken_over = db.claim_outbox_batch('second', 10, now + timedelta(seconds=1))
+            stale_write = db.complete_outbox_batch('crashed', [(row.id, row.subscription_id) for row in crashed], [], 5)
+            owner_write = db.complete_outbox_batch('second', [(row.id, row.subscription_id) for row in taken_over], [], 5)
+
+            # A transient failure waits out its backoff instead of burning every attempt at once
+            async def always_busy(delivery):
+                raise smtplib.SMTPResponseException(421, 'try later')
+            busy = DeliveryEngine(send_telegram=always_busy, telegram_chat_rate=100, max_retries=0)
+            enqueue_deliveries(db, 'weekly', '2030-W03', pairs[:1])
+            backing_off = OutboxWorker(db, busy, max_attempts=3, retry_backoff=60)
+            asyncio.run(backing_off.drain())
+            not_due = asyncio.run(backing_off.drain_once())
+            after_backoff = db.get_outbox_counts()
+
+            # Without backoff the row is retried on every drain and gives up after max_attempts
+            enqueue_deliveries(db, 'weekly', '2030-W04', pairs[1:2])
+            retrying = OutboxWorker(db, busy, max_attempts=3, retry_backoff=0)
+            for _ in range(5):
+                asyncio.run(retrying.drain())
+            final = db.get_outbox_counts()
+            db.engine.dispose()
+
+        intruder = midway.pop('intruder', None)
+        print(f"   Queued {queued} then {requeued}; mid-batch {midway}; final {final}")
+        return (queued == 4 and requeued == 0
+                and counts == {'email': 0, 'telegram': 4}
+                and midway == {'sent': 3, 'sending': 1} and intruder == []
+                and all(stamp is not None and before <= stamp <= datetime.utcnow() for stamp in notified)
+                and len(crashed) == 2 and too_soon == [] and len(taken_over) == 2
+                and stale_write == 0 and owner_write == 2
+                and not_due is None and after_backoff == {'sent': 6, 'pending': 1}
+                and final == {'sent': 6, 'pending': 1, 'failed': 1})
+    except Exception as e:
+        print(f"❌ Notification outbox test failed: {e}")
+        return False
+
+def test_preference_matching():
+    """Test segment-based preference matching over a facet index"""
+    try:
+        from collections import namedtuple
+        from matching import PreferenceMatcher, parse_preferences
+
+        Row = namedtuple('Row', ['id', 'country', 'degree_level', 'funding_type', 'gpa_requirement'])
+        Sub = namedtuple('Sub', ['id', 'preferences'])
+        scholarships = [
+            Row(1, 'Germany', 'masters', 'fully_funded', 3.0),
+            Row(2, 'UK', 'phd', 'partial', 3.5),
+            Row(3, 'Germany', 'any', 'stipend', None),
+            Row(4, 'USA', 'masters', 'fully_funded', 3.8),
+        ]
+        subscriptions = [
+            Sub(1, json.dumps({'countries': ['Germany'], 'degree_levels': ['masters']})),
+            Sub(2, json.dumps({'countries': ['Germany'], 'degree_levels': ['masters']})),
+            Sub(3, json.dumps({'gpa': 3.5, 'custom': True})),
+            Sub(4, json.dumps({'countries': ['Germany'], 'custom': False})),
+            Sub(5, json.dumps({'weekly': False})),
+        ]
+
+        segments = PreferenceMatcher(scholarships).match_segments(subscriptions, flag='weekly')
+        matched = {
+            tuple(sub.id for sub in members): [s.id for s in found]
+            for members, found in segments.values()
+        }
+        print(f"   Segments: {matched}")
+
+        return (matched == {(1, 2): [1, 3], (3,): [1, 2, 3], (4,): [1, 2, 3, 4]}
+                and parse_preferences('not json').weekly)
+    except Exception as e:
+        print(f"❌ Preference matching test failed: {e}")
+        return False
+
+def test_discovery_frontier():
+    """Test URL normalization, the Bloom seen-set and link scoring"""
+    try:
+        from discovery import normalize_url, BloomFilter, score_link
+
+        normalized = normalize_url('../Apply?b=2&utm_source=x&a=1#top', 'HTTPS://Example.ORG:443/grants/list')
+        print(f"   Normalized: {normalized}")
+
+        seen = BloomFilter(1000)
+        first = seen.add(normalized)
+        again = seen.add(normalize_url('https://example.org/Apply?a=1&b=2'))
+        false_positives = sum(f'https://example.org/{i}' in seen for i in range(1000))
+        print(f"   Bloom: {seen.size} bits, {seen.hash_count} hashes, {false_positives}/1000 false positives")
+
+        return (normalized == 'https://example.org/Apply?a=1&b=2'
+                and normalize_url('https://x.org/s?ref=nav&referrer=feed&reference=42&refid=7&UTM_medium=mail')
+                    == 'https://x.org/s?reference=42&refid=7'
+                and normalize_url('mailto:a@b.org') is None
+                and normalize_url('/logo.png', 'https://example.org/') is None
+                and first and not again and false_positives < 10
+                and score_link('https://x.org/fellowship', 'Apply for scholarships') > score_link('https://x.org/about', 'About us'))
+    except Exception as e:
+        print(f"❌ Discovery frontier test failed: {e}")
+        return False
+
+def test_listing_expansion():
+    """Test pagination, same-host detail expansion and the listing preview fallback"""
+    try:
+        import asyncio
+        import tempfile
+        from database import DatabaseManager
+        from scraper import ScholarshipScraper
+
+        def entry(name, href, text=None):
+            heading = f'<h3>{name}</h3><a href="{href}">{text}</a>' if text else f'<h3><a href="{href}">{name}</a></h3>'
+            return f'<div class="scholarship-item">{heading}<p>Fully funded masters award.</p></div>'
+
+        def detail(name):
+            return ('<script type="application/ld+json">{"@type": "Grant", "name": "%s", '
+                    '"applicationDeadline": "2027-01-31"}</script>' % name)
+
+        pages = {
+            'https://example.org/list?page=2': (
+                entry('Beta Research Scholarship', '/s/beta')
+                + entry('Alpha Masters Scholarship', '/s/alpha', 'Read more')
+                + '<a href="/list?page=3">Next</a>'),
+            'https://example.org/list?page=3': (
+                entry('Offsite Partner Scholarship', 'https://partner.org/s/gamma')
+                + '<nav><a class="next" href="/list">»</a></nav>'),
+            'https://example.org/s/alpha': detail('Alpha Masters Scholarship (full page)'),
+            'https://example.org/s/beta': detail('Beta Research Scholarship (full page)'),
+        }
+        listing = (entry('Alpha Masters Scholarship', '/s/alpha', 'Read more')
+                   + '<link rel="next" href="/list?page=2">')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'listing.db')}")
+
+            def scraper_for(available):
+                scraper = ScholarshipScraper(db)
+                scraper.archive = None
+                scraper.fetched = []
+
+                async def fetch_politely(url, kind='listing'):
+                    scraper.fetched.append(url)
+                    return available.get(url)
+
+                scraper.fetch_politely = fetch_politely
+                return scraper
+
+            scraper = scraper_for(pages)
+            expanded = asyncio.run(scraper.scrape_listing(listing, 'https://example.org/list'))
+            print(f"   Fetched: {scraper.fetched}")
+            print(f"   Expanded: {[s['name'] for s in expanded]}")
+
+            # Every detail fetch failing falls back to the listing's own entries
+            offline = scraper_for({url: html for url, html in pages.items() if '/s/' not in url})
+            previews = asyncio.run(offline.scrape_listing(listing, 'https://example.org/list'))
+            print(f"   Previews: {[s['name'] for s in previews]}")
+            db.engine.dispose()
+
+        return (scraper.fetched == ['https://example.org/list?page=2', 'https://example.org/list?page=3',
+                                    'https://example.org/s/alpha', 'https://example.org/s/beta']
+                and [s['name'] for s in expanded] == ['Alpha Masters Scholarship (full page)',
+                                                      'Beta Research Scholarship (full page)',
+                                                      'Offsite Partner Scholarship']
+                and offline.fetched[-2:] == ['https://example.org/s/alpha', 'https://example.org/s/beta']
+                and {s['name'] for s in previews} == {'Alpha Masters Scholarship', 'Beta Research Scholarship',
+                                                      'Offsite Partner Scholarship'})
+    except Exception as e:
+        print(f"❌ Listing expansion test failed: {e}")
+        return False
+
+def test_recrawl_policy():
+    """Test adaptive revisit intervals and which sources are due"""
+    try:
+        import tempfile
+        from datetime import timedelta
+        from database import DatabaseManager
+        from recrawl import RecrawlPolicy
+
+        hour = 3600
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'recrawl.db')}")
+            policy = RecrawlPolicy(db, min_interval=hour, max_interval=8 * hour, default_interval=2 * hour)
+            url, now = 'https://example.org/a', datetime(2026, 1, 1)
+            first = [{'name': 'First Scholarship', 'application_link': 'https://example.org/1'}]
+            second = [{'name': 'Second Scholarship', 'application_link': 'https://example.org/2'}]
+
+            def fetch(scholarships):
+                changed = policy.record_fetch(url, scholarships, now=now)
+                state = db.get_crawl_states([url])[url]
+                return changed, state.revisit_interval // hour
+
+            steps = [fetch(first)]
+            steps += [fetch(first) for _ in range(3)]               # unchanged: 4h, 8h, capped at 8h
+            steps += [fetch(batch) for batch in (second, first, second, first)]  # changed: 4h, 2h, 1h, floor 1h
+            steps.append(fetch([]))                                 # an empty fetch backs off
+            steps.append(fetch(first))                              # empty fetch kept the old hash
+            print(f"   (changed, interval hours): {steps}")
+
+            policy.record_fetch('https://example.org/b', first, now=now)
+            due_at = now + timedelta(hours=2)
+            urls = ['https://example.org/new', 'https://example.org/b', url, 'https://example.org/other']
+            due = policy.due_sources(urls, now=due_at)
+            early = policy.due_sources(urls, now=now)
+            print(f"   Due: {due}, before the interval: {early}")
+            db.engine.dispose()
+
+        return (steps == [(True, 2), (False, 4), (False, 8), (False, 8),
+                          (True, 4), (True, 2), (True, 1), (True, 1),
+                          (False, 2), (False, 4)]
+                and due == ['https://example.org/new', 'https://example.org/b', 'https://example.org/other']
+                and early == ['https://example.org/new', 'https://example.org/other'])
+    except Exception as e:
+        print(f"❌ Recrawl policy test failed: {e}")
+        return False
+
+def test_structured_extraction():
+    """Test JSON-LD and OpenGraph entity extraction"""
+    try:
+        from structured import extract_entities, parse_date
+
+        html = '''<html><head>
+        <script type="application/ld+json">{"@graph": [
+            {"@type": "WebSite", "name": "Example"},
+            {"@type": "EducationalOccupationalProgram", "name": "Global Masters Scholarship",
+             "applicationDeadline": "2027-01-31", "provider": {"@type": "Organization", "name": "Example Uni"},
+             "location": {"address": {"addressCountry": "Germany"}}}
+        ]}</script>
+        <meta property="og:title" content="Example site"></head><body></body></html>'''
+        entities = extract_entities(html)
+        print(f"   JSON-LD entities: {[e['name'] for e in entities]}")
+
+        meta = extract_entities('<meta property="og:title" content="Chevening Scholarship">', include_meta=True)
+        print(f"   Meta entity: {meta[0]['name']}")
+
+        # Deadlines arrive as lists, typed literals or numbers on real pages
+        odd = extract_entities('''<script type="application/ld+json">[
+            {"@type": "Grant", "name": "List Deadline", "applicationDeadline": ["2026-03-01", "2026-09-01"]},
+            {"@type": "Grant", "name": "Object Deadline", "validThrough": {"@type": "Date", "@value": "2026-05-15"}},
+            {"@type": "Grant", "name": "Numeric Deadline", "endDate": 20260101}
+        ]</script>''')
+        odd_deadlines = [parse_date(e['deadline']) for e in odd]
+        print(f"   Odd deadlines: {odd_deadlines}")
+
+        return (len(entities) == 1
+                and entities[0]['provider'] == 'Example Uni'
+                and entities[0]['country'] == 'Germany'
+                and parse_date(entities[0]['deadline']).year == 2027
+                and meta[0]['from_meta']
+                and odd_deadlines == [datetime(2026, 3, 1), datetime(2026, 5, 15), None]
+                and parse_date(['2026-01-01']) == datetime(2026, 1, 1)
+                and parse_date({'name': 'soon'}) is None and parse_date(42) is None
+                and extract_entities('<html><h2>No structured data</h2></html>') == [])
+    except Exception as e:
+        print(f"❌ Structured extraction test failed: {e}")
+        return False
+
+def test_page_archive():
+    """Test archive round trip, dedupe of unchanged pages and scholarship upserts"""
+    try:
+        import tempfile
+        from database import DatabaseManager
+        from archive import PageArchive
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'test.db')}")
+            archive = PageArchive(db, os.path.join(tmp, 'archive'))
+
+            stored = [
+                archive.store('https://example.org/list', '<html>page one</html>'),
+                archive.store('https://example.org/list', '<html>page one</html>'),
+                archive.store('https://example.org/list', '<html>page two ✓</html>'),
+                archive.store('https://example.org/s/1', '<html>detail</html>', kind='detail'),
+            ]
+            latest = list(archive.iter_latest())
+            print(f"   Stored: {stored}, latest: {[(kind, url) for kind, url, _ in latest]}")
+
+            row = {'name': 'Example Scholarship', 'source_url': 'https://example.org/list', 'gpa_requirement': 3.0}
+            first = db.upsert_scholarships([row])
+            again = db.upsert_scholarships([row])
+            changed = db.upsert_scholarships([dict(row, gpa_requirement=3.5)])
+            print(f"   Upserts (inserted, updated): {first} {again} {changed}")
+            db.engine.dispose()
+
+        return (stored == [True, False, True, True]
+                and sorted(html for _, _, html in latest) == ['<html>detail</html>', '<html>page two ✓</html>']
+                and (first, again, changed) == ((1, 0), (0, 0), (0, 1)))
+    except Exception as e:
+        print(f"❌ Page archive test failed: {e}")
+        return False
+
+def test_database_engine():
+    """Test managers share one engine per URL and SQLite connections use WAL"""
+    try:
+        import tempfile
+        from sqlalchemy import text
+        from database import DatabaseManager, get_engine
+        from config import Config
+
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{os.path.join(tmp, 'engine.db')}"
+            first, second = DatabaseManager(url), DatabaseManager(url)
+            with first.engine.connect() as conn:
+                journal_mode = conn.execute(text('PRAGMA journal_mode')).scalar()
+                busy_timeout = conn.execute(text('PRAGMA busy_timeout')).scalar()
+            print(f"   Journal mode: {journal_mode}, busy timeout: {busy_timeout}ms")
+            shared = first.engine is second.engine is get_engine(url)
+            first.engine.dispose()
+
+        return shared and journal_mode == 'wal' and busy_timeout == Config.SQLITE_BUSY_TIMEOUT_MS
+    except Exception as e:
+        print(f"❌ Database engine test failed: {e}")
+        return False
+
+def test_batch_writer():
+    """Test the writer thread batches records and saves everything queued before close"""
+    try:
+        import asyncio
+        from writer import BatchWriter
+
+        batches = []
+        def write_batch(batch):
+            if any(record is None for record in batch):
+                raise ValueError('bad record')
+            batches.append(list(batch))
+            return len(batch)
+
+        async def feed(writer):
+            await writer.submit(range(25))
+            await writer.submit([None])
+            return await writer.aclose()
+
+        writer = BatchWriter(write_batch, batch_size=10, queue_size=4, flush_interval=5)
+        saved = asyncio.run(feed(writer))
+        print(f"   Batch sizes: {[len(batch) for batch in batches]}, saved {saved}, failed {writer.failed}")
+
+        return (saved == 20 and writer.failed == 6
+                and [len(batch) for batch in batches] == [10, 10]
+                and [record for batch in batches for record in batch] == list(range(20)))
+    except Exception as e:
+        print(f"❌ Batch writer test failed: {e}")
+        return False
+
+def test_read_model():
+    """Test the columnar snapshot agrees with SQL filtering and facet counts"""
+    try:
+        import tempfile
+        from datetime import datetime
+        from database import DatabaseManager
+        from serializers import scholarship_serializer
+        from read_model import ScholarshipReadModel, CATEGORICAL_FIELDS, NUMPY_AVAILABLE
+
+        if not NUMPY_AVAILABLE:
+            print("   NumPy not installed; dashboard uses SQL filtering")
+            return True
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'read_model.db')}")
+            db.add_scholarships([
+                {'name': f'Scholarship {i}', 'country': ['Germany', 'United States', 'United Kingdom', None][i % 4],
+                 'degree_level': ['masters', 'phd', None][i % 3], 'funding_type': ['fully_funded', 'partial'][i % 2],
+                 'gpa_requirement': [None, 2.5, 3.0, 3.5, 3.8][i % 5], 'deadline': datetime(2030, 1 + i % 12, 1) if i % 7 else None}
+                for i in range(60)
+            ])
+            model = ScholarshipReadModel(db, scholarship_serializer.columns)
+            cases = [
+                {},
+                {'country': 'united'},
+                {'country': 'germany', 'degree_level': 'masters'},
+                {'funding_type': 'partial', 'gpa_min': 3.0},
+                {'gpa_min': 2.5, 'gpa_max': 3.5, 'deadline_before': datetime(2030, 6, 1)},
+                {'country': 'atlantis'},
+            ]
+            mismatches = [
+                filters for filters in cases
+                if sorted(row[0] for row in model.query(filters)) != sorted(row[0] for row in db.get_scholarship_rows(scholarship_serializer.columns, filters))
+                or model.facet_counts(filters) != db.get_facet_counts(CATEGORICAL_FIELDS, filters)
+            ]
+            facets = model.facet_counts({'country': 'united'})
+            print(f"   Snapshot rows: {model.current().size}, facets for 'united': {facets['country']}")
+
+            before = model.current()
+            db.add_scholarship({'name': 'Late addition', 'country': 'Germany'})
+            rebuilt = model.current() is not before and model.current().size == 61
+            db.engine.dispose()
+
+        return not mismatches and rebuilt and sum(facets['country'].values()) == 45
+    except Exception as e:
+        print(f"❌ Read model test failed: {e}")
+        return False
+
+def test_expiry():
+    """Test expired and long-unseen scholarships are deactivated in bulk and leave the active set"""
+    try:
+        import tempfile
+        from datetime import datetime, timedelta
+        from sqlalchemy import text
+        from database import DatabaseManager
+        from serializers import scholarship_serializer
+
+        now = datetime.utcnow()
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'expiry.db')}")
+            db.add_scholarships([
+                {'name': 'Past deadline', 'deadline': now - timedelta(days=10), 'scraped_at': now},
+                {'name': 'Within grace', 'deadline': now - timedelta(hours=12), 'scraped_at': now},
+                {'name': 'Upcoming', 'deadline': now + timedelta(days=30), 'scraped_at': now},
+                {'name': 'Unseen', 'deadline': None, 'scraped_at': now - timedelta(days=400)},
+                {'name': 'No deadline', 'deadline': None, 'scraped_at': now},
+            ])
+            version = db.get_data_version()
+            expired = db.deactivate_expired(now, grace_days=1, unseen_days=180)
+            again = db.deactivate_expired(now, grace_days=1, unseen_days=180)
+            active = sorted(row[1] for row in db.get_scholarship_rows(scholarship_serializer.columns))
+            with db.engine.connect() as conn:
+                plan = conn.execute(text(
+                    'EXPLAIN QUERY PLAN SELECT id FROM scholarships WHERE is_active = 1 AND deadline <= :end'
+                ), {'end': now}).fetchall()
+                indexes = sorted(name for (name,) in conn.execute(text(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'scholarships'"
+                )))
+            bumped = db.get_data_version() > version
+            db.engine.dispose()
+
+        print(f"   Deactivated {expired} then {again}; active: {active}")
+        return (expired == 2 and again == 0 and bumped
+                and active == ['No deadline', 'Upcoming', 'Within grace']
+                and 'ix_scholarships_active_deadline' in str(plan)
+                and indexes == ['ix_scholarships_active_deadline', 'ix_scholarships_active_scraped_at', 'ix_scholarships_name_source'])
+    except Exception as e:
+        print(f"❌ Expiry test failed: {e}")
+        return False
+
+def test_scheduler():
+    """Test a job never overlaps with itself and every run's duration is recorded"""
+    try:
+        import asyncio
+        from scheduler import Scheduler
+
+        started = []
+        async def slow():
+            started.append(len(started))
+            await asyncio.sleep(0.1)
+
+        async def failing():
+            raise RuntimeError('boom')
+
+        hooks = []
+        scheduler = Scheduler(after_job=lambda: hooks.append(1))
+        job = scheduler.add_job('slow', 60, slow)
+        broken = scheduler.add_job('broken', 60, failing)
+
+        async def run():
+            # The second tick lands while the first run is still going
+            await asyncio.gather(scheduler.run_job(job), scheduler.run_job(job))
+            await scheduler.run_job(job)
+            await scheduler.run_job(broken)
+        asyncio.run(run())
+
+        print(f"   slow: {job.runs} runs, {job.skipped} skipped, last {job.last_duration:.2f}s; broken: {broken.failures} failed")
+        return (started == [0, 1] and job.runs == 2 and job.skipped == 1 and not job.running
+                and 0.1 <= job.last_duration < 0.5 and abs(job.total_duration - 2 * job.average_duration) < 1e-9
+                and broken.runs == 1 and broken.failures == 1 and broken.last_duration is not None
+                and len(hooks) == 3)
+    except Exception as e:
+        print(f"❌ Scheduler test failed: {e}")
+        return False
+
+def test_metrics_registry():
+    """Test counters, timing spans and Prometheus text rendering"""
+    try:
+        from metrics import MetricsRegistry, CrawlRunStats
+
+        metrics = MetricsRegistry()
+        pages = metrics.counter('test_pages_total', 'Pages')
+        latency = metrics.histogram('test_seconds', 'Latency', buckets=(0.1, 1))
+        pages.inc(kind='detail')
+        pages.inc(2, kind='detail')
+        latency.observe(0.5, stage='fetch')
+        text = metrics.render()
+        print(f"   Rendered {len(text.splitlines())} exposition lines")
+
+        run = CrawlRunStats()
+        run.source('https://a.org/')['pages'] += 3
+        run.source('https://b.org/')['errors'] += 1
+        totals, sources = run.to_records()
+
+        return ('test_pages_total{kind="detail"} 3' in text
+                and 'test_seconds_bucket{stage="fetch",le="0.1"} 0' in text
+                and 'test_seconds_bucket{stage="fetch",le="+Inf"} 1' in text
+                and metrics.counter('test_pages_total') is pages
+                and totals['pages'] == 3 and totals['errors'] == 1 and len(sources) == 2)
+    except Exception as e:
+        print(f"❌ Metrics registry test failed: {e}")
+        return False
+
+def test_profiling():
+    """Test sampled and cProfile sessions write profiles and summaries"""
+    try:
+        import tempfile
+        from profiling import Profile
+
+        def busy(seconds):
+            end = time.perf_counter() + seconds
+            while time.perf_counter() < end:
+                sum(range(1000))
+
+        import time
+        with tempfile.TemporaryDirectory() as tmp:
+            sampled = Profile('sample', interval=0.002).start()
+            busy(0.1)
+            sampled.stop()
+            sample_path, sample_summary = sampled.save('test-sample', tmp)
+
+            traced = Profile('cprofile').start()
+            busy(0.02)
+            traced.stop()
+            pstats_path, pstats_summary = traced.save('test-cprofile', tmp)
+
+            with open(sample_path) as f:
+                collapsed = f.read()
+            files = sorted(os.listdir(tmp))
+            print(f"   Files: {files}")
+            print(f"   Sampled {sampled.sampler.samples} stacks")
+
+        return (sample_path.endswith('.collapsed') and pstats_path.endswith('.pstats')
+                and 'busy (test_core.py' in collapsed
+                and 'busy' in sample_summary and 'busy' in pstats_summary
+                and len(files) == 4)
+    except Exception as e:
+        print(f"❌ Profiling test failed: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🧪 ScholarSift Core Functionality Test")
@@ -188,7 +1197,30 @@ def main():
         ("Database Schema", test_database),
         ("Scraper Logic", test_scraper_logic),
         ("Export Functionality", test_export_functionality),
-        ("Summarizer Logic", test_summarizer_logic)
+        ("Summarizer Logic", test_summarizer_logic),
+        ("Scholarship Serializer", test_scholarship_serializer),
+        ("Dashboard Cache", test_dashboard_cache),
+        ("Dashboard Streaming", test_dashboard_streaming),
+        ("Streaming Export", test_streaming_export),
+        ("Incremental Export", test_incremental_export),
+        ("Notification Range Queries", test_notification_range_queries),
+        ("SMTP Pool", test_smtp_pool),
+        ("Digest Renderer", test_digest_renderer),
+        ("Delivery Engine", test_delivery_engine),
+        ("Notification Outbox", test_notification_outbox),
+        ("Preference Matching", test_preference_matching),
+        ("Discovery Frontier", test_discovery_frontier),
+        ("Recrawl Policy", test_recrawl_policy),
+        ("Listing Expansion", test_listing_expansion),
+        ("Structured Extraction", test_structured_extraction),
+        ("Page Archive", test_page_archive),
+        ("Database Engine", test_database_engine),
+        ("Batch Writer", test_batch_writer),
+        ("Read Model", test_read_model),
+        ("Expiry", test_expiry),
+        ("Scheduler", test_scheduler),
+        ("Metrics Registry", test_metrics_registry),
+        ("Profiling", test_profiling)
     ]
 
     passed = 0
@@ -0,0 +1,88 @@
+"""
+Background batch writer for scraped records.
+
+The crawl hands records to a bounded queue as each source finishes. A single
+writer thread drains it and commits them WRITE_BATCH_SIZE at a time, or
+whatever has accumulated after WRITE_FLUSH_MS. Fetching and persisting
+overlap. When the database falls behind, the full queue makes the crawl wait
+instead of buffering the whole run in memory.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+
+from config import Config
+
+_STOP = object()
+
+class BatchWriter:
+    """Feeds records to write_batch(list) -> saved count on a dedicated thread"""
+
+    def __init__(self, write_batch, batch_size=None, queue_size=None, flush_interval=None):
+        self.write_batch = write_batch
+        self.batch_size = batch_size or Config.WRITE_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else Config.WRITE_FLUSH_MS / 1000
+        self.queue = queue.Queue(maxsize=queue_size or Config.WRITE_QUEUE_SIZE)
+        self.saved = 0
+        self.failed = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='batch-writer', daemon=True)
+        self._thread.start()
+
+    def put(self, records):
+        """Queue records, blocking while the queue is full"""
+        for record in records:
+            self.queue.put(record)
+
+    async def submit(self, records):
+        """Queue records from the event loop; waits off-loop only when the queue is full"""
+        for record in records:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                await asyncio.to_thread(self.queue.put, record)
+
+    def close(self):
+        """Flush what is queued, stop the thread and return the number saved"""
+        if not self._closed:
+            self._closed = True
+            self.queue.put(_STOP)
+            self._thread.join()
+        return self.saved
+
+    async def aclose(self):
+        return await asyncio.to_thread(self.close)
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = max(0, deadline - time.monotonic()) if batch else None
+            try:
+                record = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                # A partial batch waited long enough
+                self._flush(batch)
+                batch = []
+                continue
+
+            if record is _STOP:
+                self._flush(batch)
+                return
+            batch.append(record)
+            if len(batch) == 1:
+                deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(batch)
+                batch = []
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        try:
+            self.saved += self.write_batch(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"Error writing batch of {len(batch)} records: {e}")